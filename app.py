@@ -6,25 +6,57 @@ from flask import Flask, render_template, request, jsonify, session, send_file,
 from flask_cors import CORS
 import pandas as pd
 import numpy as np
+import hashlib
 import os
-import json
 import uuid
 from datetime import datetime
 from werkzeug.utils import secure_filename
 
 from config import Config
 from data_processor import DataProcessor
+from cleaning_plan import CleaningPlan
+from dataset_cache import DatasetCache
+from dataset_store import create_dataset_store
+from dataset_versions import VersionHistory
 from eda_engine import EDAEngine
+from fast_json import FastJSONProvider
+from column_profiler import ColumnProfiler
+from column_executor import create_column_executor
+from result_cache import ResultCache
+from streaming_eda import StreamingEDA
 from visualization_engine import VisualizationEngine
 from report_generator import ReportGenerator
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 app.config.from_object(Config)
 CORS(app)
 
-# In-memory storage for datasets (in production, use Redis or database)
-datasets_store = {}
+# Per-session dataset storage: memory-budgeted, optionally shared across worker processes
+datasets_store = create_dataset_store(Config)
+
+# Parsed copies of uploaded files, so re-loading the same bytes skips parsing
+dataset_cache = DatasetCache(Config.CACHE_FOLDER, Config.DATASET_CACHE_MAX_BYTES)
+
+# Serialized /api/eda results keyed by dataset fingerprint and engine version
+eda_cache = ResultCache(Config.EDA_CACHE_MAX_BYTES)
+
+# Chart figures (data and layout apart) keyed by dataset fingerprint, chart type and parameters
+chart_cache = ResultCache(Config.CHART_CACHE_MAX_BYTES, Config.CHART_CACHE_SPILL_FOLDER, Config.CHART_CACHE_SPILL_MAX_BYTES)
+
+# Undo / checkout / branch history of cleaned and appended datasets (kept by each worker)
+version_history = VersionHistory(
+    Config.VERSION_HISTORY_MAX_BYTES, Config.VERSION_HISTORY_MAX_VERSIONS, Config.SESSION_TTL_SECONDS,
+    Config.VERSION_HISTORY_SPILL_FOLDER
+)
+
+# Only kept with the in-process store: with the shared one, another worker's
+# changes to a dataset would be overwritten by this worker's stale history
+versioning = Config.DATASET_STORE_BACKEND != 'shared'
+
+# Pool that column profiling fans out over on wide/large tables
+ColumnProfiler.executor = create_column_executor(Config)
 
 
 def allowed_file(filename):
@@ -40,12 +72,82 @@ def get_session_id():
     return session['session_id']
 
 
+def log_ingest(filepath, stats):
+    """Log ingestion throughput and memory for an uploaded file"""
+    app.logger.info(
+        "Ingested %s: %d rows in %d chunk(s), %.3fs (%s rows/sec), peak RSS %s MB, cache %s",
+        os.path.basename(filepath), stats['rows'], stats['chunks'], stats['seconds'],
+        stats['rows_per_sec'], stats['peak_rss_mb'], stats.get('cache')
+    )
+
+
 def get_datasets():
     """Get datasets for current session"""
-    session_id = get_session_id()
-    if session_id not in datasets_store:
-        datasets_store[session_id] = {}
-    return datasets_store[session_id]
+    return datasets_store.session(get_session_id())
+
+
+def dataset_tag(dataset_id):
+    """Cache tag for every result derived from one of this session's datasets"""
+    return f"{get_session_id()}:{dataset_id}"
+
+
+def version_key(dataset_id):
+    """Key of one of this session's datasets in version_history"""
+    return (get_session_id(), dataset_id)
+
+
+def versioning_unavailable():
+    """Error response for the version routes when the history is not kept"""
+    return jsonify({'error': 'Version history is not available with the shared dataset store'}), 400
+
+
+def dataset_version_response(dataset_id, version, df):
+    """Body of the responses that change which version of a dataset is current"""
+    return jsonify({
+        'success': True,
+        'version': version.id if version is not None else None,
+        'info': get_datasets()[dataset_id]['info'],
+        'preview': DataProcessor.get_preview(df)
+    })
+
+
+def chart_response(dataset_id, df, chart_type, params, build):
+    """
+    {"chart": figure} response through chart_cache. build() makes the
+    figure in the light theme, as the JSON of its data traces and of its
+    layout apart (VisualizationEngine split=True); both are cached, keyed
+    by the dataset's content fingerprint, the chart type and the request
+    parameters other than dark_mode, and spliced into the response as
+    they are, so a theme toggle only re-skins the cached layout.
+    """
+    options = {key: value for key, value in params.items() if key not in ('dataset_id', 'dark_mode')}
+    digest = hashlib.sha1(app.json.dumps_bytes(options)).hexdigest()
+    key = f"chart:{ColumnProfiler.fingerprint(df)}-v{VisualizationEngine.VERSION}:{chart_type}:{digest}"
+    
+    data_json, layout_json = chart_cache.get(key + ':data'), chart_cache.get(key + ':layout')
+    if data_json is None or layout_json is None:
+        data_text, layout_text = build()
+        data_json, layout_json = data_text.encode('utf-8'), layout_text.encode('utf-8')
+        chart_cache.put(key + ':data', data_json, tags=[dataset_tag(dataset_id)])
+        chart_cache.put(key + ':layout', layout_json, tags=[dataset_tag(dataset_id)])
+    
+    if params.get('dark_mode', False):
+        layout_json = app.json.dumps_bytes(VisualizationEngine.reskin(app.json.loads(layout_json), dark_mode=True))
+    return app.json.spliced_response(chart=b'{"data":' + data_json + b',"layout":' + layout_json + b'}')
+
+
+def approx_requested():
+    """Whether the client opted into sketch-based approximate statistics (?approx=1)"""
+    return request.args.get('approx', '').lower() in ('1', 'true', 'yes')
+
+
+def bins_arg(value, default=30):
+    """Histogram bins from a request: a bin count or a rule name such as 'fd' (see EDAEngine.BIN_RULES)"""
+    if value is None or value == '':
+        return default
+    if isinstance(value, str) and not value.isdigit():
+        return value.lower()
+    return int(value)
 
 
 # ============== PAGE ROUTES ==============
@@ -125,7 +227,8 @@ def upload_file():
         file.save(filepath)
         
         # Read and store dataset
-        df = DataProcessor.read_file(filepath)
+        df, ingest_stats = dataset_cache.load(filepath, DataProcessor.ingest_file)
+        log_ingest(filepath, ingest_stats)
         dataset_id = str(uuid.uuid4())[:8]
         
         datasets = get_datasets()
@@ -135,7 +238,8 @@ def upload_file():
             'df': df,
             'uploaded_at': datetime.now().isoformat(),
             'info': DataProcessor.get_dataset_info(df),
-            'source_type': DataProcessor.infer_data_source(df)
+            'source_type': DataProcessor.infer_data_source(df),
+            'ingest': ingest_stats
         }
         
         return jsonify({
@@ -143,7 +247,8 @@ def upload_file():
             'dataset_id': dataset_id,
             'name': filename,
             'info': datasets[dataset_id]['info'],
-            'source_type': datasets[dataset_id]['source_type']
+            'source_type': datasets[dataset_id]['source_type'],
+            'ingest': ingest_stats
         })
     
     except Exception as e:
@@ -189,6 +294,45 @@ def get_dataset(dataset_id):
     })
 
 
+@app.route('/api/datasets/<dataset_id>/rows', methods=['GET'])
+def get_dataset_rows(dataset_id):
+    """
+    One window of a dataset's rows, for virtual scrolling.
+    Query: offset, limit (capped at Config.ROWS_PAGE_MAX), sort (column),
+    order ('asc' or 'desc'), columns (comma-separated projection) and
+    binary=1 for column-major data with typed-array numeric columns.
+    """
+    datasets = get_datasets()
+
+    if dataset_id not in datasets:
+        return jsonify({'error': 'Dataset not found'}), 404
+
+    try:
+        offset = int(request.args.get('offset', 0))
+        limit = min(int(request.args.get('limit', Config.ROWS_PAGE_DEFAULT)), Config.ROWS_PAGE_MAX)
+    except ValueError:
+        return jsonify({'error': 'offset and limit must be integers'}), 400
+    order = request.args.get('order', 'asc').lower()
+    if order not in ('asc', 'desc'):
+        return jsonify({'error': "order must be 'asc' or 'desc'"}), 400
+    columns = request.args.get('columns')
+
+    try:
+        window = DataProcessor.get_rows(
+            datasets[dataset_id]['df'],
+            offset=offset,
+            limit=limit,
+            sort=request.args.get('sort') or None,
+            ascending=order == 'asc',
+            columns=columns.split(',') if columns else None,
+            binary=request.args.get('binary', '').lower() in ('1', 'true', 'yes')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify(window)
+
+
 @app.route('/api/datasets/<dataset_id>', methods=['DELETE'])
 def delete_dataset(dataset_id):
     """Delete a dataset"""
@@ -198,6 +342,9 @@ def delete_dataset(dataset_id):
         return jsonify({'error': 'Dataset not found'}), 404
     
     del datasets[dataset_id]
+    version_history.drop(version_key(dataset_id))
+    eda_cache.invalidate(dataset_tag(dataset_id))
+    chart_cache.invalidate(dataset_tag(dataset_id))
     return jsonify({'success': True})
 
 
@@ -212,7 +359,7 @@ def list_sample_datasets():
             if filename.endswith(('.csv', '.xlsx')):
                 filepath = os.path.join(sample_dir, filename)
                 try:
-                    df = DataProcessor.read_file(filepath)
+                    df, _ = dataset_cache.load(filepath, DataProcessor.ingest_file)
                     samples.append({
                         'name': filename,
                         'rows': len(df),
@@ -233,7 +380,8 @@ def load_sample_dataset(filename):
         if not os.path.exists(filepath):
             return jsonify({'error': 'Sample dataset not found'}), 404
         
-        df = DataProcessor.read_file(filepath)
+        df, ingest_stats = dataset_cache.load(filepath, DataProcessor.ingest_file)
+        log_ingest(filepath, ingest_stats)
         dataset_id = str(uuid.uuid4())[:8]
         
         datasets = get_datasets()
@@ -243,14 +391,16 @@ def load_sample_dataset(filename):
             'df': df,
             'uploaded_at': datetime.now().isoformat(),
             'info': DataProcessor.get_dataset_info(df),
-            'source_type': DataProcessor.infer_data_source(df)
+            'source_type': DataProcessor.infer_data_source(df),
+            'ingest': ingest_stats
         }
         
         return jsonify({
             'success': True,
             'dataset_id': dataset_id,
             'name': filename,
-            'info': datasets[dataset_id]['info']
+            'info': datasets[dataset_id]['info'],
+            'ingest': ingest_stats
         })
     
     except Exception as e:
@@ -331,42 +481,177 @@ def merge_datasets():
 
 @app.route('/api/clean', methods=['POST'])
 def clean_dataset():
-    """Clean a dataset"""
+    """Clean a dataset (missing_strategy and remove_duplicates, or a list of steps)"""
     try:
         data = request.json
         
         dataset_id = data.get('dataset_id')
-        missing_strategy = data.get('missing_strategy', 'drop')
-        remove_duplicates = data.get('remove_duplicates', False)
+        
+        # Missing values, duplicates, filters and casts, applied in one pass below
+        plan = CleaningPlan.from_request(data)
         
         datasets = get_datasets()
         
         if dataset_id not in datasets:
             return jsonify({'error': 'Dataset not found'}), 404
         
-        df = datasets[dataset_id]['df'].copy()
+        # A new version sharing unchanged columns; the current one stays as it is for undo
+        record = datasets[dataset_id]
+        current = record['df']
+        df, rows, columns = plan.apply(current)
+        if df is current:
+            return dataset_version_response(dataset_id, version_history.head(version_key(dataset_id)), df)
+        
+        # Cached results are keyed by content, so those of the previous version stay valid for undo
+        info = DataProcessor.get_dataset_info(df)
+        version = None
+        if versioning:
+            version = version_history.commit(
+                version_key(dataset_id), current, record['info'], df, info, plan.summary(), rows=rows, columns=columns
+            )
+        record['df'] = df
+        record['info'] = info
+        
+        return dataset_version_response(dataset_id, version, df)
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/append', methods=['POST'])
+def append_dataset():
+    """Append the rows of one dataset to another with the same columns"""
+    try:
+        data = request.json
         
-        # Handle missing values
-        df = DataProcessor.handle_missing_values(df, missing_strategy)
+        dataset_id = data.get('dataset_id')
+        source_id = data.get('source_id')
         
-        # Remove duplicates
-        if remove_duplicates:
-            df = DataProcessor.remove_duplicates(df)
+        datasets = get_datasets()
         
-        # Update dataset
-        datasets[dataset_id]['df'] = df
-        datasets[dataset_id]['info'] = DataProcessor.get_dataset_info(df)
+        if dataset_id not in datasets or source_id not in datasets:
+            return jsonify({'error': 'One or more datasets not found'}), 404
         
-        return jsonify({
-            'success': True,
-            'info': datasets[dataset_id]['info'],
-            'preview': DataProcessor.get_preview(df)
-        })
+        record = datasets[dataset_id]
+        current = record['df']
+        df = DataProcessor.append_rows(current, datasets[source_id]['df'])
+        
+        # The new version stores only the appended rows, copied so it does not keep the whole frame alive
+        info = DataProcessor.get_dataset_info(df)
+        version = None
+        if versioning:
+            version = version_history.commit(
+                version_key(dataset_id), current, record['info'], df, info,
+                f"append {datasets[source_id]['name']}", appended=df.iloc[len(current):].copy()
+            )
+        record['df'] = df
+        record['info'] = info
+        
+        return dataset_version_response(dataset_id, version, df)
     
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/datasets/<dataset_id>/versions', methods=['GET'])
+def list_versions(dataset_id):
+    """Versions of a dataset since its first change, oldest first, and which one is current"""
+    datasets = get_datasets()
+    
+    if dataset_id not in datasets:
+        return jsonify({'error': 'Dataset not found'}), 404
+    
+    return jsonify(version_history.versions(version_key(dataset_id)))
+
+
+@app.route('/api/datasets/<dataset_id>/undo', methods=['POST'])
+def undo_version(dataset_id):
+    """Go back to the version before the current one"""
+    if not versioning:
+        return versioning_unavailable()
+    
+    datasets = get_datasets()
+    
+    if dataset_id not in datasets:
+        return jsonify({'error': 'Dataset not found'}), 404
+    
+    try:
+        version, df = version_history.undo(version_key(dataset_id))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    datasets[dataset_id]['df'] = df
+    datasets[dataset_id]['info'] = version.info
+    return dataset_version_response(dataset_id, version, df)
+
+
+@app.route('/api/datasets/<dataset_id>/checkout', methods=['POST'])
+def checkout_version(dataset_id):
+    """Make any version of the dataset's history current (rollback or redo)"""
+    if not versioning:
+        return versioning_unavailable()
+    
+    datasets = get_datasets()
+    
+    if dataset_id not in datasets:
+        return jsonify({'error': 'Dataset not found'}), 404
+    
+    version_id = (request.json or {}).get('version')
+    try:
+        version, df = version_history.checkout(version_key(dataset_id), version_id)
+    except KeyError:
+        return jsonify({'error': f'Version not found: {version_id}'}), 404
+    
+    datasets[dataset_id]['df'] = df
+    datasets[dataset_id]['info'] = version.info
+    return dataset_version_response(dataset_id, version, df)
+
+
+@app.route('/api/datasets/<dataset_id>/branch', methods=['POST'])
+def branch_dataset(dataset_id):
+    """New dataset starting from a version of this one (the current version by default)"""
+    if not versioning:
+        return versioning_unavailable()
+    
+    datasets = get_datasets()
+    
+    if dataset_id not in datasets:
+        return jsonify({'error': 'Dataset not found'}), 404
+    
+    body = request.json or {}
+    data = datasets[dataset_id]
+    branch_id = str(uuid.uuid4())[:8]
+    try:
+        version, df = version_history.branch(
+            version_key(dataset_id), version_key(branch_id), data['df'], data['info'], body.get('version')
+        )
+    except KeyError:
+        return jsonify({'error': f"Version not found: {body.get('version')}"}), 404
+    
+    branch_name = body.get('name') or f"{data['name']}@{version.id}"
+    datasets[branch_id] = {
+        'name': branch_name,
+        'path': data['path'],
+        'df': df,
+        'uploaded_at': datetime.now().isoformat(),
+        'info': version.info,
+        'source_type': data.get('source_type', 'Unknown')
+    }
+    
+    return jsonify({
+        'success': True,
+        'dataset_id': branch_id,
+        'name': branch_name,
+        'version': version.id,
+        'info': version.info,
+        'preview': DataProcessor.get_preview(df)
+    })
+
+
 @app.route('/api/eda/<dataset_id>', methods=['GET'])
 def run_eda(dataset_id):
     """Run automated EDA on a dataset"""
@@ -377,17 +662,77 @@ def run_eda(dataset_id):
             return jsonify({'error': 'Dataset not found'}), 404
         
         df = datasets[dataset_id]['df']
-        engine = EDAEngine(df)
+        approx = approx_requested()
+        profile = ColumnProfiler.profile(df, approx=approx)
+        
+        # Same content + same engine version => same result, so the key doubles as the ETag
+        etag = f"{profile.fingerprint}-v{EDAEngine.VERSION}"
+        if profile.approximate:
+            etag += '-approx'
+        
+        if request.if_none_match.contains(etag):
+            # The browser already holds this result; skip building the payload entirely
+            eda_cache.record_not_modified()
+            response = app.response_class(status=304)
+        else:
+            payload = eda_cache.get(etag)
+            if payload is None:
+                engine = EDAEngine(df, approx=approx)
+                
+                result = {
+                    'descriptive_stats': engine.get_descriptive_statistics(),
+                    'missing_values': engine.get_missing_value_analysis(),
+                    'correlations': engine.get_correlation_matrix(),
+                    'outliers': engine.detect_outliers(),
+                    'insights': engine.generate_insights()
+                }
+                error_bounds = engine.get_error_bounds()
+                if error_bounds is not None:
+                    result['approximation'] = error_bounds
+                payload = app.json.dumps_bytes(result)
+                eda_cache.put(etag, payload, tags=[dataset_tag(dataset_id)])
+            response = app.response_class(payload, mimetype='application/json')
+        
+        response.set_etag(etag)
+        # Let the browser keep the payload but revalidate it with If-None-Match
+        response.cache_control.no_cache = True
+        response.cache_control.private = True
+        return response
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/eda/stream/<dataset_id>', methods=['GET'])
+def run_streaming_eda(dataset_id):
+    """
+    Run EDA over one of this session's datasets from its source CSV, chunk
+    by chunk. Uploads are capped at MAX_CONTENT_LENGTH and loaded whole on
+    upload, so this only bounds the analysis' own memory; files too large
+    to load at all are analyzed server-side with the streaming_eda.py CLI.
+    """
+    try:
+        datasets = get_datasets()
         
-        result = {
-            'descriptive_stats': engine.get_descriptive_statistics(),
-            'missing_values': engine.get_missing_value_analysis(),
-            'correlations': engine.get_correlation_matrix(),
-            'outliers': engine.detect_outliers(),
-            'insights': engine.generate_insights()
-        }
+        if dataset_id not in datasets:
+            return jsonify({'error': 'Dataset not found'}), 404
         
-        return jsonify(result)
+        filepath = datasets[dataset_id]['path']
+        if not filepath or not filepath.lower().endswith('.csv'):
+            return jsonify({'error': 'Streaming EDA needs a dataset loaded from a CSV file'}), 400
+        if not os.path.isfile(filepath):
+            return jsonify({'error': 'Source file not found'}), 404
+        
+        # Large files are not re-hashed per request: size and mtime identify the version
+        st = os.stat(filepath)
+        key = f"stream:{dataset_tag(dataset_id)}:{st.st_size}:{st.st_mtime_ns}-v{EDAEngine.VERSION}"
+        
+        payload = eda_cache.get(key)
+        if payload is None:
+            result = StreamingEDA.analyze_file(filepath)
+            payload = app.json.dumps_bytes(result)
+            eda_cache.put(key, payload, tags=[dataset_tag(dataset_id)])
+        return app.response_class(payload, mimetype='application/json')
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -395,7 +740,27 @@ def run_eda(dataset_id):
 
 @app.route('/api/eda/<dataset_id>/distribution/<column>', methods=['GET'])
 def get_distribution(dataset_id, column):
-    """Get distribution data for a column"""
+    """Get distribution data for a column (?bins=<count>, fd, sturges or auto)"""
+    try:
+        datasets = get_datasets()
+        
+        if dataset_id not in datasets:
+            return jsonify({'error': 'Dataset not found'}), 404
+        
+        df = datasets[dataset_id]['df']
+        engine = EDAEngine(df)
+        
+        return jsonify(engine.get_distribution_data(column, bins_arg(request.args.get('bins'))))
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/eda/<dataset_id>/outliers', methods=['GET'])
+def get_outliers(dataset_id):
+    """Get outliers by rule (?method=iqr, zscore, mad or percentile; &indices=1 adds flagged row labels)"""
     try:
         datasets = get_datasets()
         
@@ -405,8 +770,13 @@ def get_distribution(dataset_id, column):
         df = datasets[dataset_id]['df']
         engine = EDAEngine(df)
         
-        return jsonify(engine.get_distribution_data(column))
+        return jsonify(engine.detect_outliers(
+            request.args.get('method', 'iqr'),
+            include_indices=request.args.get('indices', '0').lower() in ('1', 'true')
+        ))
     
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -450,18 +820,18 @@ def create_bar_chart():
             return jsonify({'error': 'Dataset not found'}), 404
         
         df = datasets[dataset_id]['df']
-        dark_mode = data.get('dark_mode', False)
-        
-        chart_json = VisualizationEngine.create_bar_chart(
-            df,
-            x=data.get('x'),
-            y=data.get('y'),
-            title=data.get('title', 'Bar Chart'),
-            color=data.get('color'),
-            dark_mode=dark_mode
-        )
         
-        return jsonify({'chart': json.loads(chart_json)})
+        def build():
+            return VisualizationEngine.create_bar_chart(
+                df,
+                x=data.get('x'),
+                y=data.get('y'),
+                title=data.get('title', 'Bar Chart'),
+                color=data.get('color'),
+                split=True
+            )
+        
+        return chart_response(dataset_id, df, 'bar', data, build)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -479,18 +849,32 @@ def create_line_chart():
             return jsonify({'error': 'Dataset not found'}), 404
         
         df = datasets[dataset_id]['df']
-        dark_mode = data.get('dark_mode', False)
-        
-        chart_json = VisualizationEngine.create_line_chart(
-            df,
-            x=data.get('x'),
-            y=data.get('y'),
-            title=data.get('title', 'Line Chart'),
-            color=data.get('color'),
-            dark_mode=dark_mode
-        )
         
-        return jsonify({'chart': json.loads(chart_json)})
+        # Point budget from the chart's pixel width; x_range is the zoomed-in [low, high]
+        width = data.get('width')
+        x_range = data.get('x_range')
+        try:
+            max_points = int(float(width) * Config.DOWNSAMPLE_POINTS_PER_PIXEL) if width else None
+            if x_range is not None and (not isinstance(x_range, list) or len(x_range) != 2):
+                raise ValueError('x_range must be [low, high]')
+            
+            def build():
+                return VisualizationEngine.create_line_chart(
+                    df,
+                    x=data.get('x'),
+                    y=data.get('y'),
+                    title=data.get('title', 'Line Chart'),
+                    color=data.get('color'),
+                    split=True,
+                    binary=bool(data.get('binary', False)),
+                    max_points=max_points,
+                    x_range=x_range,
+                    method=data.get('downsample')
+                )
+            
+            return chart_response(dataset_id, df, 'line', data, build)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -508,18 +892,20 @@ def create_histogram():
             return jsonify({'error': 'Dataset not found'}), 404
         
         df = datasets[dataset_id]['df']
-        dark_mode = data.get('dark_mode', False)
-        
-        chart_json = VisualizationEngine.create_histogram(
-            df,
-            column=data.get('column'),
-            bins=data.get('bins', 30),
-            title=data.get('title'),
-            dark_mode=dark_mode
-        )
         
-        return jsonify({'chart': json.loads(chart_json)})
+        def build():
+            return VisualizationEngine.create_histogram(
+                df,
+                column=data.get('column'),
+                bins=bins_arg(data.get('bins')),
+                title=data.get('title'),
+                split=True
+            )
+        
+        return chart_response(dataset_id, df, 'histogram', data, build)
     
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -536,16 +922,17 @@ def create_box_plot():
             return jsonify({'error': 'Dataset not found'}), 404
         
         df = datasets[dataset_id]['df']
-        dark_mode = data.get('dark_mode', False)
         
-        chart_json = VisualizationEngine.create_box_plot(
-            df,
-            columns=data.get('columns'),
-            title=data.get('title', 'Box Plot'),
-            dark_mode=dark_mode
-        )
+        def build():
+            return VisualizationEngine.create_box_plot(
+                df,
+                columns=data.get('columns'),
+                title=data.get('title', 'Box Plot'),
+                split=True,
+                binary=bool(data.get('binary', False))
+            )
         
-        return jsonify({'chart': json.loads(chart_json)})
+        return chart_response(dataset_id, df, 'box', data, build)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -563,15 +950,28 @@ def create_heatmap():
             return jsonify({'error': 'Dataset not found'}), 404
         
         df = datasets[dataset_id]['df']
-        dark_mode = data.get('dark_mode', False)
-        
-        chart_json = VisualizationEngine.create_correlation_heatmap(
-            df,
-            title=data.get('title', 'Correlation Matrix'),
-            dark_mode=dark_mode
-        )
         
-        return jsonify({'chart': json.loads(chart_json)})
+        def build():
+            return VisualizationEngine.create_correlation_heatmap(
+                df,
+                title=data.get('title', 'Correlation Matrix'),
+                split=True,
+                order=data.get('order', 'original'),
+                top_k=top_k,
+                x_range=ranges['x_range'],
+                y_range=ranges['y_range']
+            )
+        
+        try:
+            top_k = int(data['top_k']) if data.get('top_k') else None
+            # Zoomed-in column positions [low, high] of a tiled heatmap
+            ranges = {name: data.get(name) for name in ('x_range', 'y_range')}
+            for name, bounds in ranges.items():
+                if bounds is not None and (not isinstance(bounds, list) or len(bounds) != 2):
+                    raise ValueError(f'{name} must be [low, high]')
+            return chart_response(dataset_id, df, 'heatmap', data, build)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -589,19 +989,24 @@ def create_scatter_plot():
             return jsonify({'error': 'Dataset not found'}), 404
         
         df = datasets[dataset_id]['df']
-        dark_mode = data.get('dark_mode', False)
-        
-        chart_json = VisualizationEngine.create_scatter_plot(
-            df,
-            x=data.get('x'),
-            y=data.get('y'),
-            color=data.get('color'),
-            size=data.get('size'),
-            title=data.get('title', 'Scatter Plot'),
-            dark_mode=dark_mode
-        )
         
-        return jsonify({'chart': json.loads(chart_json)})
+        def build():
+            return VisualizationEngine.create_scatter_plot(
+                df,
+                x=data.get('x'),
+                y=data.get('y'),
+                color=data.get('color'),
+                size=data.get('size'),
+                title=data.get('title', 'Scatter Plot'),
+                split=True,
+                binary=bool(data.get('binary', False)),
+                mode=data.get('mode', 'auto')
+            )
+        
+        try:
+            return chart_response(dataset_id, df, 'scatter', data, build)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -619,16 +1024,16 @@ def create_missing_chart():
             return jsonify({'error': 'Dataset not found'}), 404
         
         df = datasets[dataset_id]['df']
-        engine = EDAEngine(df)
-        missing_data = engine.get_missing_value_analysis()
-        dark_mode = data.get('dark_mode', False)
         
-        chart_json = VisualizationEngine.create_missing_value_chart(
-            missing_data,
-            dark_mode=dark_mode
-        )
+        def build():
+            engine = EDAEngine(df)
+            missing_data = engine.get_missing_value_analysis()
+            return VisualizationEngine.create_missing_value_chart(
+                missing_data,
+                split=True
+            )
         
-        return jsonify({'chart': json.loads(chart_json)})
+        return chart_response(dataset_id, df, 'missing', data, build)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -756,7 +1161,7 @@ def get_health_score(dataset_id):
             return jsonify({'error': 'Dataset not found'}), 404
         
         df = datasets[dataset_id]['df']
-        health_score = DataProcessor.calculate_health_score(df)
+        health_score = DataProcessor.calculate_health_score(df, approx=approx_requested())
         
         return jsonify(health_score)
     
@@ -764,6 +1169,22 @@ def get_health_score(dataset_id):
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Get hit/miss counters and sizes of the parsed-file, EDA result and chart caches"""
+    return jsonify({
+        'files': dataset_cache.stats(),
+        'eda': eda_cache.stats(),
+        'charts': chart_cache.stats()
+    })
+
+
+@app.route('/api/store/stats', methods=['GET'])
+def get_store_stats():
+    """Get resident vs. spilled dataset memory statistics"""
+    return jsonify({**datasets_store.stats(), 'versions': version_history.stats()})
+
+
 if __name__ == '__main__':
     print("=" * 50)
     print("🚀 Starting EDA Application")
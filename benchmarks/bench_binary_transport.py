@@ -0,0 +1,87 @@
+"""
+Benchmark: JSON number lists vs typed-array (base64) chart transport.
+
+Builds the scatter, line and box figures for a large table with and
+without binary=True and reports figure build time, payload bytes (raw and
+gzip) and the time to parse the payload back (json.loads, plus base64
+decoding into arrays for the binary payload) as a stand-in for the
+browser's JSON.parse + decodeTypedArrays.
+
+Usage: python benchmarks/bench_binary_transport.py [--rows N]
+"""
+import argparse
+import base64
+import gzip
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visualization_engine import VisualizationEngine  # noqa: E402
+
+
+def measurement_table(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Two correlated measurements over a timeline"""
+    rng = np.random.default_rng(seed)
+    x = rng.normal(50, 12, rows)
+    return pd.DataFrame({
+        'time': pd.date_range('2024-01-01', periods=rows, freq='s'),
+        'x': x,
+        'y': 0.8 * x + rng.normal(0, 5, rows),
+        'reading': rng.gamma(2.0, 30.0, rows)
+    })
+
+
+def decode(value):
+    """Parse-side work the browser does for typed-array specs"""
+    if isinstance(value, dict):
+        if 'bdata' in value:
+            return np.frombuffer(base64.b64decode(value['bdata']), dtype='<' + value['dtype'])
+        return {key: decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    return value
+
+
+def timed(func, repeat: int):
+    """Best wall time of func() over repeat runs, with its last result"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = measurement_table(args.rows)
+    print(f"{args.rows:,} points")
+
+    charts = {
+        'scatter': lambda binary: VisualizationEngine.create_scatter_plot(df, x='x', y='y', binary=binary),
+        'line': lambda binary: VisualizationEngine.create_line_chart(df, x='time', y='reading', binary=binary),
+        'box': lambda binary: VisualizationEngine.create_box_plot(df, columns=['x', 'y', 'reading'], binary=binary)
+    }
+
+    print(f"  {'chart':<9}{'transport':<11}{'build':>9}{'bytes':>14}{'gzip':>13}{'parse':>9}")
+    for name, build in charts.items():
+        for binary in (False, True):
+            build_time, text = timed(lambda: build(binary), args.repeat)
+            payload = text.encode('utf-8')
+            parse_time, _ = timed(lambda: decode(json.loads(payload)), args.repeat)
+            print(f"  {name:<9}{'binary' if binary else 'json':<11}{build_time * 1000:7.0f}ms{len(payload):14,}"
+                  f"{len(gzip.compress(payload, 6)):13,}{parse_time * 1000:7.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
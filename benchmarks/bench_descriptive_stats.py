@@ -0,0 +1,102 @@
+"""
+Benchmark: descriptive statistics on a wide numeric ("sensor") table.
+
+Compares the original per-column implementation of
+EDAEngine.get_descriptive_statistics (several full scans per statistic per
+column) with the profile-backed one, which computes every moment and
+quantile of all numeric columns in a few matrix reductions. Both outputs
+are checked for equality.
+
+Usage: python benchmarks/bench_descriptive_stats.py [--rows N] [--cols N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from column_profiler import ColumnProfiler, DatasetProfile  # noqa: E402
+from eda_engine import EDAEngine  # noqa: E402
+
+
+def legacy_descriptive_statistics(df: pd.DataFrame) -> dict:
+    """Numeric part of get_descriptive_statistics as it was before the profiler"""
+    stats_dict = {}
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    if numeric_cols:
+        df[numeric_cols].describe().to_dict()
+        for col in numeric_cols:
+            stats_dict[col] = {
+                'count': int(df[col].count()),
+                'mean': round(float(df[col].mean()), 4) if not pd.isna(df[col].mean()) else None,
+                'std': round(float(df[col].std()), 4) if not pd.isna(df[col].std()) else None,
+                'min': round(float(df[col].min()), 4) if not pd.isna(df[col].min()) else None,
+                'max': round(float(df[col].max()), 4) if not pd.isna(df[col].max()) else None,
+                'median': round(float(df[col].median()), 4) if not pd.isna(df[col].median()) else None,
+                'skewness': round(float(df[col].skew()), 4) if not pd.isna(df[col].skew()) else None,
+                'kurtosis': round(float(df[col].kurtosis()), 4) if not pd.isna(df[col].kurtosis()) else None,
+                'q1': round(float(df[col].quantile(0.25)), 4),
+                'q3': round(float(df[col].quantile(0.75)), 4),
+                'iqr': round(float(df[col].quantile(0.75) - df[col].quantile(0.25)), 4),
+                'missing': int(df[col].isnull().sum()),
+                'unique': int(df[col].nunique())
+            }
+    return stats_dict
+
+
+def sensor_table(rows: int, cols: int, seed: int = 0) -> pd.DataFrame:
+    """Float and integer sensor columns with scattered missing readings"""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(cols):
+        if i % 4 == 3:
+            data[f'counter_{i}'] = rng.integers(0, 10000, rows)
+        else:
+            column = rng.normal(loc=i, scale=1 + i % 7, size=rows).round(3)
+            column[rng.random(rows) < 0.02] = np.nan
+            data[f'sensor_{i}'] = column
+    return pd.DataFrame(data)
+
+
+def timed(func, repeat: int):
+    """Best wall time of func() over repeat runs, with its last result"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--cols', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = sensor_table(args.rows, args.cols)
+    print(f"{args.rows:,} rows x {args.cols} numeric columns")
+
+    def profiled():
+        # Drop cached profiles so every run pays for the full computation
+        with ColumnProfiler._lock:
+            ColumnProfiler._cache.clear()
+        return EDAEngine(df).get_descriptive_statistics()
+
+    legacy_time, legacy = timed(lambda: legacy_descriptive_statistics(df), args.repeat)
+    matrix_time, _ = timed(lambda: DatasetProfile._numeric_stats(df), args.repeat)
+    profiled_time, current = timed(profiled, args.repeat)
+
+    print(f"  per-column (original):        {legacy_time:8.3f} s")
+    print(f"  matrix statistics only:       {matrix_time:8.3f} s  ({legacy_time / matrix_time:5.1f}x)")
+    print(f"  full profile + statistics:    {profiled_time:8.3f} s  ({legacy_time / profiled_time:5.1f}x)")
+    print(f"  identical output: {legacy == current}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: mean / median / mode / constant imputation of a mixed table.
+
+Compares the original column-by-column branches of
+DataProcessor.handle_missing_values (fill_mode ran mode() twice per
+column and reassigned columns one at a time) with the batched Imputer
+behind the cleaning plan, both on a fresh table and on one whose profile
+is already cached (as it is for an uploaded dataset), where means,
+medians and string value counts are reused. Outputs are checked for
+equality.
+
+Usage: python benchmarks/bench_imputer.py [--rows N] [--cols N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from column_profiler import ColumnProfiler  # noqa: E402
+from data_processor import DataProcessor  # noqa: E402
+
+
+def legacy_handle_missing_values(df: pd.DataFrame, strategy: str, fill_value=None) -> pd.DataFrame:
+    """The imputing branches of handle_missing_values as they were before the batched imputer"""
+    df = df.copy()
+    if strategy == 'fill_mean':
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].mean())
+    elif strategy == 'fill_median':
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].median())
+    elif strategy == 'fill_mode':
+        for col in df.columns:
+            df[col] = df[col].fillna(df[col].mode().iloc[0] if not df[col].mode().empty else None)
+    elif strategy == 'fill_value':
+        df = df.fillna(fill_value)
+    return df
+
+
+def customer_table(rows: int, cols: int, seed: int = 0) -> pd.DataFrame:
+    """Numeric measurements, low-cardinality categories and high-cardinality ids, all with gaps"""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(cols):
+        missing = rng.random(rows) < 0.05
+        if i % 3 == 0:
+            column = rng.normal(loc=i, scale=3, size=rows)
+            column[missing] = np.nan
+        elif i % 3 == 1:
+            column = rng.choice(['north', 'south', 'east', 'west'], rows).astype(object)
+            column[missing] = None
+        else:
+            column = np.char.add('id-', rng.integers(0, rows // 2, rows).astype(str)).astype(object)
+            column[missing] = None
+        data[f'col_{i}'] = column
+    return pd.DataFrame(data)
+
+
+def timed(func, repeat: int):
+    """Best wall time of func() over repeat runs, with its last result"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--cols', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = customer_table(args.rows, args.cols)
+    print(f"{args.rows:,} rows x {args.cols} columns (numeric, categories, ids)")
+
+    def batched(strategy, fill_value=None):
+        # Drop cached profiles so the run works from the data alone
+        with ColumnProfiler._lock:
+            ColumnProfiler._cache.clear()
+        return DataProcessor.handle_missing_values(df, strategy, fill_value)
+
+    print(f"  {'strategy':<13}{'per-column':>12}{'batched':>18}{'profiled':>18}  identical")
+    for strategy, fill_value in (('fill_mean', None), ('fill_median', None), ('fill_mode', None), ('fill_value', 0)):
+        legacy_time, legacy = timed(lambda: legacy_handle_missing_values(df, strategy, fill_value), args.repeat)
+        batched_time, current = timed(lambda: batched(strategy, fill_value), args.repeat)
+        ColumnProfiler.profile(df)
+        profiled_time, _ = timed(lambda: DataProcessor.handle_missing_values(df, strategy, fill_value), args.repeat)
+        print(f"  {strategy:<13}{legacy_time:10.3f} s{batched_time:9.3f} s ({legacy_time / batched_time:4.1f}x)"
+              f"{profiled_time:9.3f} s ({legacy_time / profiled_time:4.1f}x)  {legacy.equals(current)}")
+
+
+if __name__ == '__main__':
+    main()
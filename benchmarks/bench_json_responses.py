@@ -0,0 +1,104 @@
+"""
+Benchmark: building JSON responses for the heatmap, scatter and EDA routes.
+
+Compares the original path (fig.to_json(), json.loads, then jsonify with
+Flask's default provider; EDA results via convert_to_native and json.dumps)
+with FastJSONProvider (chart JSON spliced into the response as-is; EDA
+results encoded directly). Reports build time and payload bytes. The
+chart figure itself is built once and excluded from the timings.
+
+Usage: python benchmarks/bench_json_responses.py [--rows N] [--cols N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from flask import Flask
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_processor import DataProcessor  # noqa: E402
+from eda_engine import EDAEngine  # noqa: E402
+from fast_json import FastJSONProvider, orjson  # noqa: E402
+from visualization_engine import VisualizationEngine  # noqa: E402
+
+
+def wide_table(rows: int, cols: int, seed: int = 0) -> pd.DataFrame:
+    """Correlated numeric columns, a few missing values and a category for colouring"""
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(rows, 1))
+    values = base + rng.normal(scale=2.0, size=(rows, cols))
+    values[rng.random((rows, cols)) < 0.01] = np.nan
+    df = pd.DataFrame(values, columns=[f'feature_{i}' for i in range(cols)])
+    df['segment'] = rng.choice(['north', 'south', 'east', 'west'], rows)
+    return df
+
+
+def timed(func, repeat: int):
+    """Best wall time of func() over repeat runs, with its last result"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--cols', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    df = wide_table(args.rows, args.cols)
+    print(f"{args.rows:,} rows x {args.cols} numeric columns (orjson {'installed' if orjson else 'not installed'})")
+
+    default_app = Flask('default')
+    fast_app = Flask('fast')
+    fast_app.json = FastJSONProvider(fast_app)
+
+    charts = {
+        'heatmap': VisualizationEngine.create_correlation_heatmap(df),
+        'scatter': VisualizationEngine.create_scatter_plot(df, x='feature_0', y='feature_1', color='segment')
+    }
+    engine = EDAEngine(df)
+    eda_result = {
+        'descriptive_stats': engine.get_descriptive_statistics(),
+        'missing_values': engine.get_missing_value_analysis(),
+        'correlations': engine.get_correlation_matrix(),
+        'outliers': engine.detect_outliers(),
+        'insights': engine.generate_insights()
+    }
+
+    cases = []
+    for name, chart_json in charts.items():
+        cases.append((
+            f'/api/chart/{name}',
+            lambda chart_json=chart_json: default_app.json.response({'chart': json.loads(chart_json)}).get_data(),
+            lambda chart_json=chart_json: fast_app.json.spliced_response(chart=chart_json).get_data()
+        ))
+    cases.append((
+        '/api/eda',
+        lambda: json.dumps(DataProcessor.convert_to_native(eda_result), sort_keys=True).encode('utf-8'),
+        lambda: fast_app.json.dumps_bytes(eda_result)
+    ))
+
+    print(f"  {'route':<20}{'original':>12}{'bytes':>12}{'fast':>12}{'bytes':>12}{'speedup':>10}")
+    for route, original, fast in cases:
+        with default_app.app_context():
+            original_time, original_payload = timed(original, args.repeat)
+        with fast_app.app_context():
+            fast_time, fast_payload = timed(fast, args.repeat)
+        same = json.loads(original_payload) == json.loads(fast_payload)
+        print(f"  {route:<20}{original_time * 1000:10.1f}ms{len(original_payload):12,}"
+              f"{fast_time * 1000:10.1f}ms{len(fast_payload):12,}{original_time / fast_time:9.1f}x"
+              f"{'' if same else '  (payloads differ)'}")
+
+
+if __name__ == '__main__':
+    main()
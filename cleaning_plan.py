@@ -0,0 +1,318 @@
+"""
+Cleaning Plan Module
+Cleaning steps recorded up front and applied in one pass over the data
+"""
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from column_profiler import ColumnProfiler
+from imputer import Imputer
+import row_index
+
+
+def column_values(col: pd.Series):
+    """A column's data without copying: the NumPy array, or the extension array for extension dtypes"""
+    return col.to_numpy() if isinstance(col.dtype, np.dtype) else col.array
+
+
+def assemble_frame(base: pd.DataFrame, positions: Optional[np.ndarray], columns: Dict[int, Any]) -> pd.DataFrame:
+    """
+    base narrowed to the rows at positions (None for all) with the columns at
+    the given column positions replaced (arrays over those rows). In one
+    copy, or none for the untouched columns when no rows are dropped; base
+    itself when nothing changes.
+    """
+    if positions is None and not columns:
+        return base
+    if positions is None:
+        arrays = {j: columns[j] if j in columns else column_values(base.iloc[:, j]) for j in range(len(base.columns))}
+        result = pd.DataFrame(arrays, index=base.index, copy=False)
+        result.columns = base.columns
+    else:
+        result = base.take(positions)
+        for j, values in columns.items():
+            result.isetitem(j, values)
+    return result
+
+
+class CleaningPlan:
+    """
+    An ordered list of cleaning steps (missing values, duplicate removal,
+    row filters, type casts) that touches no data until execute(df).
+    Execution does not copy the frame between steps: dropped rows only
+    narrow a list of row positions, rewritten columns are kept apart, and
+    the result is assembled once at the end. Columns no step rewrites are
+    shared with the source when no rows were dropped. Results are those of
+    running the steps one after another.
+    """
+
+    MISSING_STRATEGIES = ('drop', 'fill_mean', 'fill_median', 'fill_mode', 'fill_value',
+                          'forward_fill', 'backward_fill', 'none')
+    FILTER_OPS = ('==', '!=', '<', '<=', '>', '>=', 'in', 'not_in', 'is_null', 'not_null')
+    CAST_TYPES = ('float', 'int', 'str', 'category', 'datetime', 'bool')
+    KEEP = ('first', 'last', False)
+
+    def __init__(self):
+        self.steps = []
+
+    def handle_missing(self, strategy: str = 'drop', fill_value: Any = None) -> 'CleaningPlan':
+        """Drop incomplete rows, or fill missing values by column mean, median, mode, a value or neighbours"""
+        if strategy not in self.MISSING_STRATEGIES:
+            raise ValueError(f"Unknown missing value strategy: {strategy} "
+                             f"(use one of {', '.join(self.MISSING_STRATEGIES)})")
+        if strategy == 'fill_value' and fill_value is None:
+            raise ValueError("fill_value strategy needs a fill_value")
+        self.steps.append({'op': 'missing', 'strategy': strategy, 'fill_value': fill_value})
+        return self
+
+    def remove_duplicates(self, subset: Optional[List[str]] = None, keep='first') -> 'CleaningPlan':
+        """Drop repeated rows (or rows repeating the subset columns), as drop_duplicates"""
+        if keep not in self.KEEP:
+            raise ValueError("keep must be 'first', 'last' or false")
+        self.steps.append({'op': 'remove_duplicates', 'subset': list(subset) if subset else None, 'keep': keep})
+        return self
+
+    def filter(self, column: str, op: str, value: Any = None) -> 'CleaningPlan':
+        """Keep the rows whose column satisfies op value (missing values never compare true)"""
+        if op not in self.FILTER_OPS:
+            raise ValueError(f"Unknown filter operator: {op} (use one of {', '.join(self.FILTER_OPS)})")
+        if op in ('in', 'not_in') and not isinstance(value, (list, tuple)):
+            raise ValueError(f"Filter operator {op} needs a list of values")
+        self.steps.append({'op': 'filter', 'column': column, 'operator': op, 'value': value})
+        return self
+
+    def cast(self, column: str, dtype: str) -> 'CleaningPlan':
+        """Convert a column; values that do not convert to a number or date become missing"""
+        if dtype not in self.CAST_TYPES:
+            raise ValueError(f"Unknown cast type: {dtype} (use one of {', '.join(self.CAST_TYPES)})")
+        self.steps.append({'op': 'cast', 'column': column, 'dtype': dtype})
+        return self
+
+    @classmethod
+    def from_request(cls, data: Dict[str, Any]) -> 'CleaningPlan':
+        """
+        Plan from a /api/clean body: a 'steps' list of {op, ...} objects, or
+        the form fields missing_strategy / remove_duplicates / duplicate_columns
+        """
+        plan = cls()
+        steps = data.get('steps')
+        if steps is None:
+            plan.handle_missing(data.get('missing_strategy', 'drop'), data.get('fill_value'))
+            if data.get('remove_duplicates', False):
+                plan.remove_duplicates(data.get('duplicate_columns') or None)
+            return plan
+
+        if not isinstance(steps, list):
+            raise ValueError("steps must be a list")
+        for step in steps:
+            op = step.get('op') if isinstance(step, dict) else None
+            if op == 'missing':
+                plan.handle_missing(step.get('strategy', 'drop'), step.get('fill_value'))
+            elif op == 'remove_duplicates':
+                plan.remove_duplicates(step.get('subset'), step.get('keep', 'first'))
+            elif op == 'filter':
+                plan.filter(step.get('column'), step.get('operator'), step.get('value'))
+            elif op == 'cast':
+                plan.cast(step.get('column'), step.get('dtype'))
+            else:
+                raise ValueError(f"Unknown cleaning step: {op} (use missing, remove_duplicates, filter or cast)")
+        return plan
+
+    def apply(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[np.ndarray], Dict[int, Any]]:
+        """
+        The cleaned frame plus its delta over df: positions of the rows kept
+        (None for all) and the rewritten columns by column position (arrays
+        over the kept rows), so that assemble_frame(df, *delta) rebuilds it
+        """
+        run = _PlanRun(df)
+        for step in self.steps:
+            if step['op'] == 'missing':
+                run.handle_missing(step['strategy'], step['fill_value'])
+            elif step['op'] == 'remove_duplicates':
+                run.remove_duplicates(step['subset'], step['keep'])
+            elif step['op'] == 'filter':
+                run.filter(step['column'], step['operator'], step['value'])
+            else:
+                run.cast(step['column'], step['dtype'])
+        return run.result(), run.positions, run.arrays()
+
+    def execute(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Apply the steps to df (left unchanged); df itself is returned when no step changes anything"""
+        return self.apply(df)[0]
+
+    def summary(self) -> str:
+        """Short description of the steps, e.g. for a version label"""
+        parts = []
+        for step in self.steps:
+            if step['op'] == 'missing':
+                parts.append(f"missing values: {step['strategy']}")
+            elif step['op'] == 'remove_duplicates':
+                parts.append('remove duplicates' + (f" by {', '.join(map(str, step['subset']))}" if step['subset'] else ''))
+            elif step['op'] == 'filter':
+                value = '' if step['operator'] in ('is_null', 'not_null') else f" {step['value']!r}"
+                parts.append(f"filter {step['column']} {step['operator']}{value}")
+            else:
+                parts.append(f"cast {step['column']} to {step['dtype']}")
+        return '; '.join(parts) or 'no changes'
+
+
+class _PlanRun:
+    """
+    State of one CleaningPlan.execute: the source frame, the positions of
+    the rows still kept (None for all) and the rewritten columns (by
+    column position, holding the kept rows only)
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.base = df
+        self.positions = None
+        self.columns = {}
+
+    def position(self, column) -> int:
+        """Column position of a column name"""
+        if column not in self.base.columns:
+            raise ValueError(f"Unknown column: {column}")
+        loc = self.base.columns.get_loc(column)
+        if not isinstance(loc, int):
+            raise ValueError(f"Column name is not unique: {column}")
+        return loc
+
+    def current(self, j: int) -> pd.Series:
+        """Column j over the kept rows (a copy unless all rows are kept)"""
+        if j in self.columns:
+            return self.columns[j]
+        col = self.base.iloc[:, j]
+        return col if self.positions is None else col.iloc[self.positions]
+
+    def test(self, j: int, predicate) -> np.ndarray:
+        """predicate (Series -> boolean Series) over the kept rows, without copying untouched columns"""
+        if j in self.columns:
+            return predicate(self.columns[j]).to_numpy(dtype=bool)
+        mask = predicate(self.base.iloc[:, j]).to_numpy(dtype=bool)
+        return mask if self.positions is None else mask[self.positions]
+
+    def keep(self, mask: np.ndarray):
+        """Narrow the kept rows to those where mask (over the kept rows) is True"""
+        if mask.all():
+            return
+        self.positions = np.flatnonzero(mask) if self.positions is None else self.positions[mask]
+        self.columns = {j: values.iloc[mask] for j, values in self.columns.items()}
+
+    def handle_missing(self, strategy: str, fill_value: Any):
+        if strategy == 'none':
+            return
+        if strategy == 'drop':
+            mask = np.ones(self.size(), dtype=bool)
+            for j in range(len(self.base.columns)):
+                mask &= self.test(j, pd.Series.notna)
+            self.keep(mask)
+            return
+
+        # Columns with missing values; the profile knows them if nothing has changed yet
+        targets = range(len(self.base.columns))
+        if strategy in ('fill_mean', 'fill_median'):
+            targets = [j for j in targets if self.is_numeric(self.dtype(j))]
+        pristine = self.positions is None and not self.columns
+        profile = ColumnProfiler.cached_profile(self.base) if pristine else None
+        if profile is not None:
+            targets = [j for j in targets if profile.null_counts.iloc[j] > 0]
+        else:
+            targets = [j for j in targets if self.test(j, pd.Series.isna).any()]
+        if not targets:
+            return
+
+        # All of them filled in one batch, keyed by name where names are unique
+        unique = self.base.columns.is_unique
+        labels = [self.base.columns[j] if unique else j for j in targets]
+        frame = pd.DataFrame(
+            {label: column_values(self.current(j)) for label, j in zip(labels, targets)}, index=self.index(), copy=False
+        )
+        if strategy == 'forward_fill':
+            values, filled = dict.fromkeys(labels), frame.ffill()
+        elif strategy == 'backward_fill':
+            values, filled = dict.fromkeys(labels), frame.bfill()
+        else:
+            filled, values = Imputer.impute(frame, strategy, fill_value, profile if unique else None)
+        for label, j in zip(labels, targets):
+            if label in values:
+                self.columns[j] = filled[label]
+
+    def remove_duplicates(self, subset: Optional[List[str]], keep):
+        if subset:
+            keys = pd.DataFrame({i: self.current(self.position(col)) for i, col in enumerate(subset)})
+            self.keep(~row_index.duplicated(row_index.hash_rows(keys), keep=keep))
+            return
+        if self.columns:
+            # Whole-row hashes of rewritten rows need the rows themselves, once
+            hashes = row_index.hash_rows(self.result())
+        else:
+            hashes = ColumnProfiler.row_hashes(self.base)
+            if self.positions is not None:
+                hashes = hashes[self.positions]
+        self.keep(~row_index.duplicated(hashes, keep=keep))
+
+    def filter(self, column: str, op: str, value: Any):
+        j = self.position(column)
+        predicates = {
+            '==': lambda s: s == value,
+            '!=': lambda s: s.notna() & (s != value),
+            '<': lambda s: s < value,
+            '<=': lambda s: s <= value,
+            '>': lambda s: s > value,
+            '>=': lambda s: s >= value,
+            'in': lambda s: s.isin(value),
+            'not_in': lambda s: s.notna() & ~s.isin(value),
+            'is_null': pd.Series.isna,
+            'not_null': pd.Series.notna
+        }
+        try:
+            self.keep(self.test(j, predicates[op]))
+        except TypeError:
+            raise ValueError(f"Cannot compare column {column} with {value!r}")
+
+    def cast(self, column: str, dtype: str):
+        j = self.position(column)
+        values = self.current(j)
+        try:
+            if dtype == 'float':
+                values = pd.to_numeric(values, errors='coerce').astype('float64')
+            elif dtype == 'int':
+                values = pd.to_numeric(values, errors='coerce').round().astype('Int64')
+            elif dtype == 'str':
+                values = values.astype('string')
+            elif dtype == 'category':
+                values = values.astype('category')
+            elif dtype == 'datetime':
+                values = pd.to_datetime(values, errors='coerce')
+            else:
+                values = values.astype('boolean')
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Cannot cast column {column} to {dtype}: {e}")
+        self.columns[j] = values
+
+    @staticmethod
+    def is_numeric(dtype) -> bool:
+        return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+    def dtype(self, j: int):
+        return self.columns[j].dtype if j in self.columns else self.base.dtypes.iloc[j]
+
+    def index(self) -> pd.Index:
+        return self.base.index if self.positions is None else self.base.index[self.positions]
+
+    def size(self) -> int:
+        return len(self.base) if self.positions is None else len(self.positions)
+
+    def arrays(self) -> Dict[int, Any]:
+        return {j: column_values(values) for j, values in self.columns.items()}
+
+    def result(self) -> pd.DataFrame:
+        """The cleaned frame, built in one copy (none at all for untouched columns of untouched rows)"""
+        result = assemble_frame(self.base, self.positions, self.arrays())
+        if not self.columns and result is not self.base:
+            hashes = ColumnProfiler.known_row_hashes(self.base)
+            if hashes is not None:
+                ColumnProfiler.remember_row_hashes(result, hashes[self.positions])
+        return result
@@ -0,0 +1,125 @@
+"""
+Column Executor Module
+Runs column-independent computations on a thread or process pool
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Iterable, List, Tuple, Optional
+
+import pandas as pd
+import numpy as np
+
+
+class ColumnExecutor:
+    """
+    Maps a function over column blocks, returning results in input order
+    whatever the completion order, so output stays deterministic.
+    Modes:
+      'serial'  - in the calling thread
+      'thread'  - thread pool; NumPy reductions and sorts release the GIL
+      'process' - process pool; numeric blocks travel as SharedMatrix
+                  column ranges instead of being pickled
+    Work on Python objects (string value counts) uses map_threads, which
+    runs on threads in both parallel modes.
+    """
+
+    MODES = ('serial', 'thread', 'process')
+
+    def __init__(self, mode: str = 'serial', workers: Optional[int] = None, min_cells: int = 0):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown column executor mode: {mode}")
+        self.mode = mode
+        self.workers = 1 if mode == 'serial' else max(1, workers or os.cpu_count() or 1)
+        self.min_cells = min_cells
+        self._threads = None
+        self._processes = None
+        self._lock = threading.Lock()
+
+    def is_parallel(self, cells: int) -> bool:
+        """Whether a table of this many cells is worth fanning out"""
+        return self.mode != 'serial' and self.workers > 1 and cells >= self.min_cells
+
+    def map(self, func: Callable, items: Iterable) -> List:
+        """func(item) for every item, on the configured pool (func must be picklable in 'process' mode)"""
+        items = list(items)
+        if self.mode == 'process' and len(items) > 1:
+            return list(self._process_pool().map(func, items))
+        return self.map_threads(func, items)
+
+    def map_threads(self, func: Callable, items: Iterable) -> List:
+        """func(item) for every item, on threads unless the executor is serial"""
+        items = list(items)
+        if self.mode == 'serial' or len(items) < 2:
+            return [func(item) for item in items]
+        return list(self._thread_pool().map(func, items))
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='columns')
+            return self._threads
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._processes is None:
+                # forkserver: forking a multi-threaded web server directly is unsafe
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._processes = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._processes
+
+    def shutdown(self):
+        """Stop the pools (they are recreated on next use)"""
+        with self._lock:
+            for pool in (self._threads, self._processes):
+                if pool is not None:
+                    pool.shutdown(wait=True)
+            self._threads = self._processes = None
+
+
+SERIAL = ColumnExecutor('serial')
+
+
+def create_column_executor(config) -> ColumnExecutor:
+    """Build the executor selected by config.COLUMN_EXECUTOR"""
+    return ColumnExecutor(config.COLUMN_EXECUTOR, config.COLUMN_WORKERS or None, config.PARALLEL_MIN_CELLS)
+
+
+class SharedMatrix:
+    """
+    Column-major float64 copy of numeric columns in shared memory (NaN for
+    missing), which worker processes attach to by name without copying.
+    Use as a context manager; the segment is removed on exit.
+    """
+
+    def __init__(self, numeric_df: pd.DataFrame, block_cols: int = 64):
+        self.shape = (len(numeric_df), len(numeric_df.columns))
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, self.shape[0] * self.shape[1] * 8))
+        values = np.ndarray(self.shape, dtype=np.float64, buffer=self._shm.buf, order='F')
+        # Fill a few columns at a time so no second full-size temporary is needed
+        for start in range(0, self.shape[1], block_cols):
+            block = numeric_df.iloc[:, start:start + block_cols]
+            values[:, start:start + block_cols] = block.to_numpy(dtype=np.float64, na_value=np.nan)
+        del values
+
+    @property
+    def spec(self) -> Tuple[str, Tuple[int, int]]:
+        """What a worker needs to attach: segment name and matrix shape"""
+        return self._shm.name, self.shape
+
+    @staticmethod
+    def attach(spec: Tuple[str, Tuple[int, int]]):
+        """(segment, column-major ndarray view) for a spec; close the segment after dropping the view"""
+        name, shape = spec
+        shm = shared_memory.SharedMemory(name=name)
+        return shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf, order='F')
+
+    def __enter__(self) -> 'SharedMatrix':
+        return self
+
+    def __exit__(self, *exc):
+        self._shm.close()
+        self._shm.unlink()
@@ -0,0 +1,590 @@
+"""
+Column Profiler Module
+Computes the per-column statistics shared by dataset info, health score and EDA
+"""
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+import pandas as pd
+import numpy as np
+
+from column_executor import ColumnExecutor, SharedMatrix, SERIAL
+from sketches import Moments, TDigest, HyperLogLog, HeavyHitters
+import row_index
+
+
+def _zero_out_fperr(arg: np.ndarray) -> np.ndarray:
+    """Treat floating point noise as exact zero, as pandas does for skew/kurtosis"""
+    return np.where(np.abs(arg) < 1e-14, 0, arg)
+
+
+def _scalar_power(arg: np.ndarray, exponent: float) -> np.ndarray:
+    """
+    Element-wise power through the C library's pow, one value per column.
+    Vectorized np.power may differ from it in the last bit, and the Series
+    methods these statistics replace work on scalars.
+    """
+    with np.errstate(invalid='ignore'):
+        return np.array([value ** exponent for value in arg], dtype=np.float64)
+
+
+def _shared_block_stats(task) -> Dict[str, np.ndarray]:
+    """Process-pool task: statistics of columns [start, stop) of a SharedMatrix"""
+    spec, start, stop = task
+    shm, values = SharedMatrix.attach(spec)
+    try:
+        return DatasetProfile._matrix_stats(values[:, start:stop])
+    finally:
+        del values
+        shm.close()
+
+
+def content_fingerprint(df: pd.DataFrame, row_hashes: np.ndarray) -> str:
+    """Digest of a frame's column names, dtypes and row hashes"""
+    digest = hashlib.sha256()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(row_hashes.tobytes())
+    return digest.hexdigest()[:32]
+
+
+class DatasetProfile:
+    """
+    Per-column statistics for one DataFrame, computed in one go:
+    null/unique counts, moments and quartiles of numeric columns, value
+    counts and numeric coercibility of string columns, IQR outlier counts
+    and a 64-bit hash per row (for duplicates and the content fingerprint).
+    Column blocks are spread over the given ColumnExecutor; results do not
+    depend on the executor. The profile holds no reference to the DataFrame itself.
+    """
+
+    approximate = False
+
+    # Filled on first use by ColumnProfiler.correlation / correlation_order
+    correlation = None
+    correlation_order = None
+
+    STAT_COLUMNS = ['count', 'mean', 'std', 'min', 'max', 'median', 'skew', 'kurtosis', 'q1', 'q3', 'unique']
+
+    # Cells per float64 block in _numeric_stats (32 MB per working array)
+    STATS_BLOCK_CELLS = 1 << 22
+
+    def __init__(self, df: pd.DataFrame, executor: ColumnExecutor = SERIAL, row_hashes: Optional[np.ndarray] = None):
+        """row_hashes: the frame's row_index.hash_rows, when already known"""
+        self.n_rows = int(len(df))
+        self.n_cols = int(len(df.columns))
+        self.size = int(df.size)
+        if not executor.is_parallel(self.size):
+            executor = SERIAL
+        self.columns = df.columns.tolist()
+        self.numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        self.categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        self.datetime_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
+
+        self.null_counts = df.isnull().sum()
+
+        column_stats = self._numeric_stats(df[self.numeric_cols], executor)
+        self.numeric_stats = column_stats[self.STAT_COLUMNS]
+        self.iqr_outliers = column_stats[['lower', 'upper', 'outliers']].rename(columns={'outliers': 'count'})
+
+        # One value_counts per string column serves unique count, top/freq and coercibility
+        def count_values(col):
+            counts = df[col].value_counts()
+            return counts, self._numeric_convertible(counts)
+
+        counted = executor.map_threads(count_values, self.categorical_cols)
+        self.value_counts = {col: counts for col, (counts, _) in zip(self.categorical_cols, counted)}
+        self.numeric_convertible = {col: convertible for col, (_, convertible) in zip(self.categorical_cols, counted)}
+
+        unique_counts = {}
+        for col in self.columns:
+            if col in self.value_counts:
+                unique_counts[col] = int((self.value_counts[col] > 0).sum())
+            elif col in self.numeric_stats.index:
+                unique_counts[col] = int(self.numeric_stats.at[col, 'unique'])
+            else:
+                unique_counts[col] = int(df[col].nunique())
+        self.unique_counts = pd.Series(unique_counts, dtype='int64')
+
+        self.row_hashes = row_hashes if row_hashes is not None else row_index.hash_rows(df)
+        self.duplicate_count = np.int64(row_index.duplicated(self.row_hashes).sum() if self.n_cols else 0)
+
+        self.fingerprint = content_fingerprint(df, self.row_hashes)
+
+    @classmethod
+    def _numeric_stats(cls, numeric_df: pd.DataFrame, executor: ColumnExecutor = SERIAL) -> pd.DataFrame:
+        """
+        Moments, quartiles, distinct counts and IQR fences/outlier counts of
+        every numeric column, one row per column, computed in column blocks
+        """
+        n_rows, n_cols = numeric_df.shape
+        if not n_cols:
+            empty = pd.DataFrame(columns=cls.STAT_COLUMNS + ['lower', 'upper', 'outliers'], index=numeric_df.columns, dtype='float64')
+            return empty.astype({'outliers': 'int64'})
+
+        # Bound the float64 working set, but give every worker at least one block
+        block_cols = max(1, min(cls.STATS_BLOCK_CELLS // max(n_rows, 1), -(-n_cols // executor.workers)))
+        bounds = [(start, min(start + block_cols, n_cols)) for start in range(0, n_cols, block_cols)]
+
+        if executor.mode == 'process' and len(bounds) > 1:
+            with SharedMatrix(numeric_df) as shared:
+                results = executor.map(_shared_block_stats, [(shared.spec, start, stop) for start, stop in bounds])
+        else:
+            def block_stats(bound):
+                block = numeric_df.iloc[:, bound[0]:bound[1]]
+                # Column-major so every reduction runs down contiguous memory
+                return cls._matrix_stats(np.asfortranarray(block.to_numpy(dtype=np.float64, na_value=np.nan)))
+
+            results = executor.map(block_stats, bounds)
+
+        return pd.concat([
+            pd.DataFrame(result, index=numeric_df.columns[start:stop])
+            for result, (start, stop) in zip(results, bounds)
+        ])
+
+    @staticmethod
+    def _matrix_stats(values: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Column statistics of a (rows x columns) float64 matrix with NaN for
+        missing values, plus 1.5 x IQR fences and the count of values outside
+        them. Follows pandas' nanops formulas (two-pass variance,
+        bias-corrected skew/kurtosis) and numpy's linear quantiles so the
+        results match the Series methods.
+        """
+        n_rows = values.shape[0]
+        mask = np.isnan(values)
+        count = n_rows - mask.sum(axis=0)
+        # Float counts in the moment formulas, as pandas uses (no int64 overflow on big tables)
+        n = count.astype(np.float64)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            filled = np.where(mask, 0.0, values)
+            mean = filled.sum(axis=0) / n
+
+            # One centered matrix serves variance, skew and kurtosis
+            centered = filled - mean
+            np.putmask(centered, mask, 0.0)
+            squared = centered ** 2
+            m2 = squared.sum(axis=0)
+            m3 = (squared * centered).sum(axis=0)
+            m4 = (squared * squared).sum(axis=0)
+            del filled, centered, squared
+
+            std = np.sqrt(np.where(n > 1, m2 / (n - 1), np.nan))
+
+            m2_skew = _zero_out_fperr(m2)
+            skew = (n * _scalar_power(n - 1, 0.5) / (n - 2)) * (_zero_out_fperr(m3) / _scalar_power(m2_skew, 1.5))
+            skew = np.where(m2_skew == 0, 0.0, skew)
+            skew[count < 3] = np.nan
+
+            numerator = _zero_out_fperr(n * (n + 1) * (n - 1) * m4)
+            denominator = _zero_out_fperr((n - 2) * (n - 3) * m2 ** 2)
+            kurtosis = numerator / denominator - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+            kurtosis = np.where(denominator == 0, 0.0, kurtosis)
+            kurtosis[count < 4] = np.nan
+
+        # One sort per column yields min, max, median, quartiles and distinct count (NaNs sort last)
+        ordered = np.sort(values, axis=0)
+        has_values = count > 0
+        last = np.maximum(count - 1, 0)
+
+        def at(positions):
+            if n_rows == 0:
+                return np.full(positions.shape, np.nan)
+            return np.take_along_axis(ordered, positions[np.newaxis, :], axis=0)[0]
+
+        def quantile(q):
+            # numpy's 'linear' method, including its lerp formulation
+            virtual = count * q + (1 + q * -1) - 1
+            previous = np.floor(np.maximum(virtual, 0))
+            gamma = virtual - previous
+            below = at(previous.astype(np.intp))
+            above = at(np.minimum(previous.astype(np.intp) + 1, last))
+            diff = above - below
+            result = np.where(gamma >= 0.5, above - diff * (1 - gamma), below + diff * gamma)
+            return np.where(has_values, result, np.nan)
+
+        middle = last // 2
+        median = np.where(count % 2 == 1, at(middle), (at(middle) + at(np.minimum(middle + 1, last))) / 2)
+
+        q1, q3 = quantile(0.25), quantile(0.75)
+        iqr = q3 - q1
+        lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+        outliers = ((values < lower) | (values > upper)).sum(axis=0)
+
+        changes = ordered[1:] != ordered[:-1]
+        changes &= np.arange(1, n_rows)[:, np.newaxis] < count
+        unique = np.where(has_values, changes.sum(axis=0) + 1, 0)
+
+        return {
+            'count': count,
+            'mean': mean,
+            'std': std,
+            'min': np.where(has_values, at(np.zeros_like(last)), np.nan),
+            'max': np.where(has_values, at(last), np.nan),
+            'median': np.where(has_values, median, np.nan),
+            'skew': skew,
+            'kurtosis': kurtosis,
+            'q1': q1,
+            'q3': q3,
+            'unique': unique,
+            'lower': lower,
+            'upper': upper,
+            'outliers': outliers
+        }
+
+    @staticmethod
+    def _iqr_outliers(numeric_df: pd.DataFrame, numeric_stats: pd.DataFrame) -> pd.DataFrame:
+        """1.5 x IQR fences and the number of values outside them, per numeric column"""
+        iqr = numeric_stats['q3'] - numeric_stats['q1']
+        lower = numeric_stats['q1'] - 1.5 * iqr
+        upper = numeric_stats['q3'] + 1.5 * iqr
+        outside = numeric_df.lt(lower, axis=1) | numeric_df.gt(upper, axis=1)
+        return pd.DataFrame({'lower': lower, 'upper': upper, 'count': outside.sum().astype('int64')}, index=numeric_df.columns)
+
+    @staticmethod
+    def _numeric_convertible(counts: pd.Series) -> int:
+        """Number of non-null values that parse as numbers, from a column's value counts"""
+        if counts.empty:
+            return 0
+        parsed = pd.to_numeric(pd.Series(counts.index.astype(object)), errors='coerce')
+        return int(counts.to_numpy()[parsed.notna().to_numpy()].sum())
+
+    def top_value(self, col: str) -> Optional[Any]:
+        """Most frequent value of a string column (smallest one on ties, like Series.mode)"""
+        counts = self.value_counts[col]
+        if counts.empty or counts.iloc[0] == 0:
+            return None
+        tied = counts.index[counts.to_numpy() == counts.iloc[0]]
+        try:
+            tied = tied.sort_values()
+        except TypeError:
+            pass
+        return tied[0]
+
+    def top_frequency(self, col: str) -> int:
+        """Count of the most frequent value of a string column"""
+        counts = self.value_counts[col]
+        return int(counts.iloc[0]) if len(counts) > 0 else 0
+
+
+class ApproxDatasetProfile(DatasetProfile):
+    """
+    Sketch-based stand-in for DatasetProfile on very large tables.
+    Row chunks feed fixed-size, mergeable sketches, so memory does not grow
+    with the row count: exact null counts and moments, t-digest quartiles,
+    HyperLogLog unique and duplicate counts, Misra-Gries value counts.
+    A second pass counts values outside the (estimated) IQR fences.
+    error_bounds says how far each approximate figure may be off.
+    """
+
+    approximate = True
+
+    CHUNK_ROWS = 100000
+    TDIGEST_COMPRESSION = 1000  # Centroid width (rank error bound) ~0.3% mid-distribution
+    HLL_PRECISION = 14       # 16K registers per column, ~0.8% standard error
+    ROW_HLL_PRECISION = 16   # 64K registers for whole-row duplicates, ~0.4%
+    HEAVY_HITTERS = 256      # Counters per string column
+
+    def __init__(self, df: pd.DataFrame):
+        self._begin(df.dtypes)
+        for chunk in self._chunks(df):
+            self._update(chunk)
+        self._finish()
+
+        # Second pass: exact counts against the estimated fences
+        outliers = self._iqr_outliers(df[self.numeric_cols].iloc[:0], self.numeric_stats)
+        for chunk in self._chunks(df[self.numeric_cols]):
+            outliers['count'] += self._iqr_outliers(chunk, self.numeric_stats)['count']
+        self.iqr_outliers = outliers
+
+    def _begin(self, dtypes: pd.Series):
+        """Column roles and empty sketches for a table with these column dtypes"""
+        empty = pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in dtypes.items()}, columns=dtypes.index)
+        self.n_rows = 0
+        self.n_cols = int(len(dtypes))
+        self.columns = dtypes.index.tolist()
+        self.numeric_cols = empty.select_dtypes(include=[np.number]).columns.tolist()
+        self.categorical_cols = empty.select_dtypes(include=['object', 'category']).columns.tolist()
+        self.datetime_cols = empty.select_dtypes(include=['datetime64']).columns.tolist()
+
+        self._null_counts = np.zeros(self.n_cols, dtype=np.int64)
+        self._moments = Moments(len(self.numeric_cols))
+        self._digests = {col: TDigest(self.TDIGEST_COMPRESSION) for col in self.numeric_cols}
+        self._distinct = {col: HyperLogLog(self.HLL_PRECISION) for col in self.columns}
+        self._hitters = {col: HeavyHitters(self.HEAVY_HITTERS) for col in self.categorical_cols}
+        self._convertible = dict.fromkeys(self.categorical_cols, 0)
+        self._distinct_rows = HyperLogLog(self.ROW_HLL_PRECISION)
+
+        # Same bytes as DatasetProfile hashes, so the fingerprint matches the exact profile's
+        self._digest = hashlib.sha256()
+        self._digest.update(repr([(str(col), str(dtype)) for col, dtype in dtypes.items()]).encode())
+
+    def _update(self, chunk: pd.DataFrame):
+        """Fold one chunk of rows into the sketches"""
+        self.n_rows += len(chunk)
+        self._null_counts += chunk.isnull().sum().to_numpy()
+        if self.numeric_cols:
+            self._update_numeric(
+                np.asfortranarray(chunk[self.numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan))
+            )
+        for col in self.columns:
+            if col not in self._hitters:
+                self._distinct[col].update(chunk[col])
+        for col in self.categorical_cols:
+            counts = chunk[col].value_counts()
+            counts = counts[counts > 0]
+            self._hitters[col].update_counts(counts)
+            # Distinct values are all HyperLogLog needs, and far fewer to hash
+            self._distinct[col].update(pd.Series(counts.index))
+            self._convertible[col] += self._numeric_convertible(counts)
+        if self.n_cols:
+            row_hashes = row_index.hash_rows(chunk)
+            self._distinct_rows.update_hashes(row_hashes)
+            self._digest.update(row_hashes.tobytes())
+
+    def _update_numeric(self, values: np.ndarray):
+        """Fold a (rows x numeric columns) float64 chunk into the moment and quantile sketches"""
+        self._moments.update(values)
+        for i, col in enumerate(self.numeric_cols):
+            self._digests[col].update(values[:, i])
+
+    def _finish(self):
+        """Turn the sketches into DatasetProfile attributes and error bounds"""
+        if not self.n_cols:
+            self._digest.update(np.zeros(self.n_rows, dtype=np.uint64).tobytes())
+        self.fingerprint = self._digest.hexdigest()[:32]
+        self.row_hashes = None
+        self.size = self.n_rows * self.n_cols
+
+        self.null_counts = pd.Series(self._null_counts, index=self.columns, dtype='int64')
+        non_null = self.n_rows - self.null_counts
+        hitters, distinct, digests = self._hitters, self._distinct, self._digests
+
+        # Exact when a string column has no more distinct values than counters
+        unique_counts = {}
+        for col in self.columns:
+            if col in hitters and hitters[col].error == 0:
+                unique_counts[col] = len(hitters[col].counts)
+            else:
+                unique_counts[col] = min(distinct[col].estimate(), int(non_null[col]))
+        self.unique_counts = pd.Series(unique_counts, index=self.columns, dtype='int64')
+
+        stats = self._moments.statistics()
+        stats['median'] = np.array([digests[col].quantile(0.5) for col in self.numeric_cols])
+        stats['q1'] = np.array([digests[col].quantile(0.25) for col in self.numeric_cols])
+        stats['q3'] = np.array([digests[col].quantile(0.75) for col in self.numeric_cols])
+        stats['unique'] = self.unique_counts[self.numeric_cols].to_numpy()
+        self.numeric_stats = pd.DataFrame(
+            {name: stats[name] for name in self.STAT_COLUMNS}, index=pd.Index(self.numeric_cols, dtype=object)
+        )
+
+        self.value_counts = {col: hitters[col].top() for col in self.categorical_cols}
+        self.numeric_convertible = self._convertible
+
+        distinct_rows = self._distinct_rows.estimate() if self.n_cols else self.n_rows
+        self.duplicate_count = np.int64(max(0, self.n_rows - distinct_rows))
+
+        self.error_bounds = {
+            # Deterministic: fraction of rows between the true and reported quartiles
+            'quantile_rank_error': {
+                col: round(max(digests[col].rank_error(q) for q in (0.25, 0.5, 0.75)), 6)
+                for col in self.numeric_cols
+            },
+            # About 95% confidence (two standard errors), relative to the count
+            'unique_relative_error': {
+                col: 0.0 if col in hitters and hitters[col].error == 0 else round(2 * distinct[col].relative_error, 6)
+                for col in self.columns
+            },
+            # Deterministic: reported value counts are at most this much below the true ones
+            'value_count_error': {col: int(hitters[col].error) for col in self.categorical_cols},
+            # About 95% confidence, in rows
+            'duplicate_count_error': int(round(2 * self._distinct_rows.relative_error * distinct_rows))
+        }
+
+    @classmethod
+    def _chunks(cls, df: pd.DataFrame):
+        for start in range(0, len(df), cls.CHUNK_ROWS):
+            yield df.iloc[start:start + cls.CHUNK_ROWS]
+
+
+def pearson_correlation(numeric_df: pd.DataFrame, has_nulls: bool = True, block_cells: int = 1 << 22) -> pd.DataFrame:
+    """
+    Pearson correlation matrix of numeric columns, as DataFrame.corr().
+    Without missing values the co-moments are one matrix product over row
+    blocks (centered on the column means) instead of pandas' per-pair loop;
+    constant columns correlate as NaN, like in pandas.
+    """
+    n_rows, n_cols = numeric_df.shape
+    if has_nulls or n_rows < 2 or n_cols == 0:
+        return numeric_df.corr()
+
+    means = numeric_df.mean().to_numpy(dtype=np.float64)
+    comoments = np.zeros((n_cols, n_cols))
+    step = max(1, block_cells // n_cols)
+    for start in range(0, n_rows, step):
+        block = numeric_df.iloc[start:start + step].to_numpy(dtype=np.float64) - means
+        comoments += block.T @ block
+
+    std = np.sqrt(np.diag(comoments))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = np.clip(comoments / np.outer(std, std), -1.0, 1.0)
+    varying = std > 0
+    corr[~varying, :] = np.nan
+    corr[:, ~varying] = np.nan
+    corr[np.diag_indices(n_cols)] = np.where(varying, 1.0, np.nan)
+    return pd.DataFrame(corr, index=numeric_df.columns, columns=numeric_df.columns)
+
+
+def cluster_order(corr: pd.DataFrame) -> np.ndarray:
+    """
+    Positions of the columns of a correlation matrix in hierarchical
+    clustering order (average linkage on 1 - |r|, undefined pairs as
+    uncorrelated), so strongly correlated columns end up next to each other
+    """
+    from scipy.cluster.hierarchy import leaves_list, linkage
+    from scipy.spatial.distance import squareform
+
+    n_cols = len(corr)
+    if n_cols < 3:
+        return np.arange(n_cols)
+    distance = 1.0 - np.abs(np.nan_to_num(corr.to_numpy(dtype=np.float64), nan=0.0))
+    distance = np.clip((distance + distance.T) / 2, 0.0, None)
+    np.fill_diagonal(distance, 0.0)
+    return leaves_list(linkage(squareform(distance, checks=False), method='average'))
+
+
+class ColumnProfiler:
+    """
+    Profiles DataFrames and caches the result per dataset version.
+    A version is a DataFrame object: cleaning and merging always create new
+    frames, so a profile stays valid for as long as its frame is alive.
+    Row hashes follow a dataset from version to version where rows are only
+    dropped or appended (see remember_row_hashes).
+    """
+
+    MAX_CACHED = 32
+
+    # Replaced at startup by create_column_executor(Config)
+    executor = SERIAL
+
+    _cache = OrderedDict()  # (id(df), approximate) -> (weakref to df, profile)
+    _hashes = OrderedDict()  # id(df) -> (weakref to df, row hashes) of frames not profiled yet
+    _lock = threading.RLock()  # re-entrant: GC may run _discard while the lock is held
+
+    @classmethod
+    def profile(cls, df: pd.DataFrame, approx: bool = False) -> DatasetProfile:
+        """
+        Cached profile of a DataFrame, computed on first use.
+        approx=True allows a sketch-based ApproxDatasetProfile; an exact
+        profile that is already cached is returned instead.
+        """
+        keys = [(id(df), False), (id(df), True)] if approx else [(id(df), False)]
+        with cls._lock:
+            for key in keys:
+                entry = cls._cache.get(key)
+                if entry is not None and entry[0]() is df:
+                    cls._cache.move_to_end(key)
+                    return entry[1]
+
+        key = keys[-1]
+        if approx:
+            profile = ApproxDatasetProfile(df)
+        else:
+            profile = DatasetProfile(df, cls.executor, row_hashes=cls.known_row_hashes(df))
+
+        with cls._lock:
+            cls._hashes.pop(id(df), None)
+            cls._cache[key] = (weakref.ref(df, lambda _ref, key=key: cls._discard(key, _ref)), profile)
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.MAX_CACHED:
+                cls._cache.popitem(last=False)
+        return profile
+
+    @classmethod
+    def cached_profile(cls, df: pd.DataFrame) -> Optional[DatasetProfile]:
+        """The exact profile of a DataFrame if it has been computed already, else None"""
+        with cls._lock:
+            entry = cls._cache.get((id(df), False))
+            if entry is not None and entry[0]() is df:
+                return entry[1]
+        return None
+
+    @classmethod
+    def known_row_hashes(cls, df: pd.DataFrame) -> Optional[np.ndarray]:
+        """Row hashes of a DataFrame if its exact profile or remember_row_hashes has them, else None"""
+        profile = cls.cached_profile(df)
+        if profile is not None:
+            return profile.row_hashes
+        with cls._lock:
+            entry = cls._hashes.get(id(df))
+            if entry is not None and entry[0]() is df:
+                return entry[1]
+        return None
+
+    @classmethod
+    def row_hashes(cls, df: pd.DataFrame) -> np.ndarray:
+        """row_index.hash_rows of a DataFrame, hashed at most once per dataset version"""
+        hashes = cls.known_row_hashes(df)
+        if hashes is None:
+            hashes = row_index.hash_rows(df)
+            cls.remember_row_hashes(df, hashes)
+        return hashes
+
+    @classmethod
+    def fingerprint(cls, df: pd.DataFrame) -> str:
+        """Content fingerprint of a DataFrame, as its exact profile has it, without profiling it"""
+        profile = cls.cached_profile(df)
+        if profile is not None:
+            return profile.fingerprint
+        return content_fingerprint(df, cls.row_hashes(df))
+
+    @classmethod
+    def remember_row_hashes(cls, df: pd.DataFrame, hashes: Optional[np.ndarray]):
+        """
+        Record row hashes worked out for a new frame from its source's (kept
+        rows, appended rows), so neither its profile nor deduplication rehash it
+        """
+        if hashes is None or len(hashes) != len(df):
+            return
+        key = id(df)
+        with cls._lock:
+            cls._hashes[key] = (weakref.ref(df, lambda _ref, key=key: cls._discard_hashes(key, _ref)), hashes)
+            cls._hashes.move_to_end(key)
+            while len(cls._hashes) > cls.MAX_CACHED:
+                cls._hashes.popitem(last=False)
+
+    @classmethod
+    def correlation(cls, df: pd.DataFrame, approx: bool = False) -> pd.DataFrame:
+        """Correlation matrix of the numeric columns, computed once and kept on the cached profile"""
+        profile = cls.profile(df, approx=approx)
+        if profile.correlation is None:
+            has_nulls = bool(profile.null_counts[profile.numeric_cols].any())
+            profile.correlation = pearson_correlation(df[profile.numeric_cols], has_nulls)
+        return profile.correlation
+
+    @classmethod
+    def correlation_order(cls, df: pd.DataFrame, approx: bool = False) -> np.ndarray:
+        """Clustered column order of correlation(df) (see cluster_order), kept on the cached profile"""
+        profile = cls.profile(df, approx=approx)
+        if profile.correlation_order is None:
+            profile.correlation_order = cluster_order(cls.correlation(df, approx=approx))
+        return profile.correlation_order
+
+    @classmethod
+    def _discard(cls, key: tuple, ref: weakref.ref):
+        """Drop a profile once its DataFrame has been garbage collected"""
+        with cls._lock:
+            entry = cls._cache.get(key)
+            if entry is not None and entry[0] is ref:
+                del cls._cache[key]
+
+    @classmethod
+    def _discard_hashes(cls, key: int, ref: weakref.ref):
+        """Drop remembered row hashes once their DataFrame has been garbage collected"""
+        with cls._lock:
+            entry = cls._hashes.get(key)
+            if entry is not None and entry[0] is ref:
+                del cls._hashes[key]
@@ -11,6 +11,9 @@ class Config:
     UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
     EXPORT_FOLDER = os.path.join(BASE_DIR, 'exports')
     SAMPLE_DATA_FOLDER = os.path.join(BASE_DIR, 'sample_data')
+    CACHE_FOLDER = os.path.join(BASE_DIR, 'cache')
+    SPILL_FOLDER = os.path.join(CACHE_FOLDER, 'spill')
+    SHARED_STORE_FOLDER = os.path.join(CACHE_FOLDER, 'shared_store')
     
     # Allowed file extensions
     ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls'}
@@ -18,6 +21,87 @@ class Config:
     # Maximum file size (16MB)
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
     
+    # Chunked CSV ingestion
+    CSV_CHUNK_ROWS = 250000           # Rows parsed per chunk
+    CSV_SNIFF_ROWS = 10000            # Leading rows used to infer column types
+    CATEGORY_MAX_UNIQUE_RATIO = 0.5   # Max unique/non-null ratio for categorical strings
+    
+    # Columnar cache of parsed files (Arrow IPC, keyed by content hash)
+    DATASET_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2GB
+    
+    # Session dataset store backend:
+    #   'memory' - one process; DataFrames beyond the budget are spilled to SPILL_FOLDER
+    #   'shared' - every worker on the host (e.g. gunicorn -w 4) shares SHARED_STORE_FOLDER
+    DATASET_STORE_BACKEND = os.environ.get('EDA_DATASET_STORE', 'memory')
+    DATASET_MEMORY_BUDGET = 1024 * 1024 * 1024  # 1GB resident (per worker)
+    SESSION_TTL_SECONDS = 6 * 60 * 60           # Drop sessions idle for 6 hours
+    
+    # Version history behind undo / checkout / branch (per worker): each version keeps only
+    # its changes; past MAX_VERSIONS a dataset's oldest versions are folded into its root.
+    # Not kept with the 'shared' store backend (the version routes answer 400 there)
+    VERSION_HISTORY_MAX_BYTES = 512 * 1024 * 1024  # 512MB in memory: roots spilled, then histories dropped
+    VERSION_HISTORY_MAX_VERSIONS = 50
+    VERSION_HISTORY_SPILL_FOLDER = os.path.join(CACHE_FOLDER, 'versions')  # roots spilled past MAX_BYTES
+    
+    # Column-parallel profiling (statistics behind info, health score and EDA):
+    #   'serial', 'thread' (NumPy work releases the GIL) or 'process' (shared-memory column blocks)
+    COLUMN_EXECUTOR = os.environ.get('EDA_COLUMN_EXECUTOR', 'thread')
+    COLUMN_WORKERS = int(os.environ.get('EDA_COLUMN_WORKERS', 0))  # 0 = one per CPU
+    PARALLEL_MIN_CELLS = 1000000  # Smaller tables are profiled serially
+    
+    # Paginated row windows (/api/datasets/<id>/rows)
+    ROWS_PAGE_DEFAULT = 100
+    ROWS_PAGE_MAX = 1000
+    ROWS_SORT_ORDERS_CACHED = 4  # Sorted row orders kept per process (8 bytes per row each)
+    
+    # Histograms are binned on the server; rule-based bin counts are capped here
+    HISTOGRAM_MAX_BINS = 200
+    
+    # Box plots are drawn from profiled quartiles; outlier points shown per column
+    BOX_MAX_OUTLIERS = 200
+    
+    # Outlier rules (OutlierEngine): z-score and modified z-score (MAD) cut-offs, percentile range
+    OUTLIER_ZSCORE_THRESHOLD = 3.0
+    OUTLIER_MAD_THRESHOLD = 3.5
+    OUTLIER_PERCENTILES = (1.0, 99.0)
+    OUTLIER_MAX_INDICES = 1000  # Flagged row labels returned per column for drill-down
+    
+    # Column pairs reported as strongly correlated (|r| >= threshold); TOP_K caps the list (0 = all)
+    STRONG_CORRELATION_THRESHOLD = 0.7
+    STRONG_CORRELATION_TOP_K = 0
+    
+    # Correlation heatmaps: cell labels up to HEATMAP_ANNOTATE_MAX columns; wider than
+    # HEATMAP_TILE_SIZE, blocks are averaged down to that many cells per side and the
+    # zoomed-in part is fetched again (column names shown up to HEATMAP_LABEL_MAX)
+    HEATMAP_ANNOTATE_MAX = 30
+    HEATMAP_TILE_SIZE = 100
+    HEATMAP_LABEL_MAX = 60
+    
+    # Line chart downsampling ('lttb' or 'minmax'); target points = chart width x POINTS_PER_PIXEL
+    DOWNSAMPLE_METHOD = 'lttb'
+    DOWNSAMPLE_POINTS_PER_PIXEL = 2
+    DOWNSAMPLE_DEFAULT_POINTS = 2000  # When the chart width is not known
+    
+    # Scatter plots past SCATTER_MAX_POINTS rows switch to SCATTER_LARGE_MODE:
+    # 'density' (points counted on a grid) or 'sample' (WebGL, random subset)
+    SCATTER_MAX_POINTS = 200000
+    SCATTER_LARGE_MODE = 'density'
+    SCATTER_SAMPLE_POINTS = 100000
+    SCATTER_DENSITY_BINS = 200  # Grid cells per axis
+    SCATTER_DENSITY_MAX_CATEGORIES = 10  # Color layers; rarer categories are merged into 'Other'
+    
+    # Binary chart transport (charts requested with binary=true)
+    CHART_BINARY_FLOAT32 = True  # Floats as float32: half the bytes, ~7 significant digits
+    CHART_BINARY_MIN_SIZE = 64   # Shorter arrays stay JSON lists
+    
+    # In-process cache of serialized EDA results
+    EDA_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+    
+    # Chart figure cache; entries evicted from memory spill to disk (0 disables spilling)
+    CHART_CACHE_MAX_BYTES = 128 * 1024 * 1024  # 128MB
+    CHART_CACHE_SPILL_MAX_BYTES = 512 * 1024 * 1024  # 512MB
+    CHART_CACHE_SPILL_FOLDER = os.path.join(CACHE_FOLDER, 'charts')  # one subdirectory per worker process
+    
     # Secret key for sessions
     SECRET_KEY = 'eda-capstone-2026-secret-key'
     
@@ -28,3 +112,4 @@ class Config:
 os.makedirs(Config.UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(Config.EXPORT_FOLDER, exist_ok=True)
 os.makedirs(Config.SAMPLE_DATA_FOLDER, exist_ok=True)
+os.makedirs(Config.CACHE_FOLDER, exist_ok=True)
@@ -4,8 +4,38 @@ Handles file parsing, data cleaning, and dataset merging
 """
 import pandas as pd
 import numpy as np
+from pandas.api.types import union_categoricals
 from typing import Dict, List, Tuple, Optional, Any
 import os
+import sys
+import threading
+import time
+import warnings
+import weakref
+from collections import OrderedDict
+
+from config import Config
+from column_profiler import ColumnProfiler
+from outlier_engine import OutlierEngine
+from cleaning_plan import CleaningPlan
+from fast_json import typed_array
+import row_index
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process in bytes (None if unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is the lifetime peak: bytes on macOS, kilobytes elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
 
 
 class DataProcessor:
@@ -33,53 +63,226 @@ class DataProcessor:
     
     @staticmethod
     def read_file(filepath: str) -> pd.DataFrame:
-        """Read CSV or Excel file into DataFrame"""
+        """Read CSV or Excel file into DataFrame (ingest_file without the stats)"""
+        return DataProcessor.ingest_file(filepath)[0]
+    
+    @staticmethod
+    def ingest_file(filepath: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Read a file into a memory-compact DataFrame
+        CSVs are sniffed on their leading rows and then parsed in chunks;
+        Excel files are read whole and compacted afterwards.
+        Returns the DataFrame and ingestion stats (rows/sec, peak RSS).
+        """
         ext = os.path.splitext(filepath)[1].lower()
+        start = time.perf_counter()
+        rss_samples = [current_rss_bytes()]
         
         if ext == '.csv':
-            return pd.read_csv(filepath)
+            plan = DataProcessor.sniff_csv_dtypes(filepath)
+            chunks = []
+            with pd.read_csv(filepath, dtype=plan['dtype'], chunksize=Config.CSV_CHUNK_ROWS) as reader:
+                for chunk in reader:
+                    chunks.append(DataProcessor._downcast_numeric(chunk))
+                    rss_samples.append(current_rss_bytes())
+            chunk_count = len(chunks)
+            df = DataProcessor._concat_chunks(chunks) if chunks else pd.read_csv(filepath, nrows=0)
+            del chunks
+            for col in plan['date_columns']:
+                df[col] = DataProcessor._parse_dates(df[col])
         elif ext in ['.xlsx', '.xls']:
-            return pd.read_excel(filepath)
+            df = DataProcessor.optimize_dtypes(pd.read_excel(filepath))
+            chunk_count = 1
         else:
             raise ValueError(f"Unsupported file format: {ext}")
+        
+        rss_samples.append(current_rss_bytes())
+        elapsed = time.perf_counter() - start
+        peak_rss = max([r for r in rss_samples if r is not None], default=None)
+        
+        stats = {
+            'rows': int(len(df)),
+            'chunks': chunk_count,
+            'seconds': round(elapsed, 3),
+            'rows_per_sec': int(len(df) / elapsed) if elapsed > 0 else None,
+            'peak_rss_mb': round(peak_rss / 1024 / 1024, 1) if peak_rss else None,
+            'categorical_columns': [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)],
+            'datetime_columns': df.select_dtypes(include=['datetime64', 'datetimetz']).columns.tolist()
+        }
+        return df, stats
+    
+    @staticmethod
+    def sniff_csv_dtypes(filepath: str, sample_rows: int = None) -> Dict[str, Any]:
+        """Infer per-column read dtypes for a CSV from its leading rows"""
+        sample = pd.read_csv(filepath, nrows=sample_rows or Config.CSV_SNIFF_ROWS)
+        
+        dtype = {}
+        date_columns = []
+        for col in sample.columns:
+            if sample[col].dtype != object:
+                continue
+            values = sample[col].dropna()
+            if DataProcessor._looks_like_dates(values):
+                # Dates repeat a lot, so parse each distinct string once after reading
+                dtype[col] = 'category'
+                date_columns.append(col)
+            elif values.nunique() <= len(values) * Config.CATEGORY_MAX_UNIQUE_RATIO:
+                dtype[col] = 'category'
+            else:
+                dtype[col] = object
+        
+        return {'dtype': dtype, 'date_columns': date_columns}
+    
+    @staticmethod
+    def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+        """Downcast numerics, categorize low-cardinality strings and parse date-like columns"""
+        df = DataProcessor._downcast_numeric(df)
+        for col in df.columns:
+            if df[col].dtype != object:
+                continue
+            values = df[col].dropna()
+            if DataProcessor._looks_like_dates(values):
+                parsed = DataProcessor._parse_dates(df[col].astype('category'))
+                if parsed.dtype.kind == 'M':
+                    df[col] = parsed
+                    continue
+            if values.nunique() <= len(values) * Config.CATEGORY_MAX_UNIQUE_RATIO:
+                df[col] = df[col].astype('category')
+        return df
+    
+    @staticmethod
+    def _downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+        """Shrink integer columns to the smallest width and floats to float32 when lossless"""
+        for col in df.columns:
+            kind = df[col].dtype.kind
+            if kind in 'iu':
+                df[col] = pd.to_numeric(df[col], downcast='integer')
+            elif kind == 'f' and df[col].dtype != np.float32:
+                downcast = df[col].astype(np.float32)
+                if np.array_equal(downcast.to_numpy(dtype=np.float64), df[col].to_numpy(), equal_nan=True):
+                    df[col] = downcast
+        return df
+    
+    @staticmethod
+    def _concat_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+        """Concatenate parsed chunks, merging categorical columns' categories"""
+        if len(chunks) == 1:
+            return chunks[0]
+        
+        columns = {}
+        for col in chunks[0].columns:
+            parts = [chunk[col] for chunk in chunks]
+            if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+                columns[col] = pd.Series(union_categoricals(parts), name=col)
+            else:
+                columns[col] = pd.concat(parts, ignore_index=True)
+        return pd.DataFrame(columns)
+    
+    @staticmethod
+    def _looks_like_dates(values: pd.Series) -> bool:
+        """Check whether every sampled value is a numeric date string (e.g. 2023-01-15)"""
+        if values.empty:
+            return False
+        values = pd.Series(values.astype(str).unique())
+        if not values.str.match(r'^\s*\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}').all():
+            return False
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            parsed = pd.to_datetime(values, errors='coerce')
+        return bool(parsed.notna().all())
+    
+    @staticmethod
+    def _parse_dates(col: pd.Series) -> pd.Series:
+        """Parse a categorical date column once per category, keeping it unchanged on failure"""
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            parsed = pd.to_datetime(pd.Series(col.cat.categories.astype(str)), errors='coerce')
+        if parsed.isna().any() or parsed.dtype.kind != 'M':
+            return col
+        
+        codes = col.cat.codes.to_numpy()
+        values = pd.Series(parsed.to_numpy()[codes], index=col.index, name=col.name)
+        return values.where(codes != -1)
     
     @staticmethod
     def get_dataset_info(df: pd.DataFrame) -> Dict[str, Any]:
         """Get comprehensive information about a dataset"""
+        profile = ColumnProfiler.profile(df)
         info = {
-            'rows': int(len(df)),
-            'columns': int(len(df.columns)),
-            'column_names': df.columns.tolist(),
+            'rows': profile.n_rows,
+            'columns': profile.n_cols,
+            'column_names': profile.columns,
             'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()},
-            'missing_values': {k: int(v) for k, v in df.isnull().sum().to_dict().items()},
-            'missing_percentage': {k: float(v) for k, v in (df.isnull().sum() / len(df) * 100).round(2).to_dict().items()},
+            'missing_values': {k: int(v) for k, v in profile.null_counts.to_dict().items()},
+            'missing_percentage': {k: float(v) for k, v in (profile.null_counts / len(df) * 100).round(2).to_dict().items()},
             'memory_usage': float(df.memory_usage(deep=True).sum() / 1024 / 1024),  # MB
-            'duplicates': int(df.duplicated().sum()),
-            'numeric_columns': df.select_dtypes(include=[np.number]).columns.tolist(),
-            'categorical_columns': df.select_dtypes(include=['object', 'category']).columns.tolist(),
-            'datetime_columns': df.select_dtypes(include=['datetime64']).columns.tolist()
+            'duplicates': int(profile.duplicate_count),
+            'numeric_columns': profile.numeric_cols,
+            'categorical_columns': profile.categorical_cols,
+            'datetime_columns': profile.datetime_cols
         }
         return info
     
+    @staticmethod
+    def _native_value(val):
+        """A single cell as a JSON-native value"""
+        if isinstance(val, (np.integer, np.int64, np.int32)):
+            return int(val)
+        elif isinstance(val, (np.floating, np.float64, np.float32)):
+            return float(val)
+        elif isinstance(val, np.bool_):
+            return bool(val)
+        elif isinstance(val, pd.Timestamp):
+            return val.isoformat()
+        elif isinstance(val, pd.Timedelta):
+            return str(val)
+        return val
+    
+    @staticmethod
+    def encode_column(col: pd.Series, na_value: Any = None) -> List[Any]:
+        """
+        A column as a list of JSON-native values, missing values as na_value.
+        Numeric, boolean, datetime and string columns are converted as whole
+        arrays; only mixed object columns fall back to per-cell conversion.
+        """
+        dtype = col.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in 'iub':
+            return col.to_numpy().tolist()
+        
+        mask = col.isna().to_numpy()
+        if isinstance(dtype, np.dtype) and dtype.kind == 'f':
+            values = col.to_numpy().tolist()
+        elif isinstance(dtype, np.dtype) and dtype.kind == 'M':
+            values = col.to_numpy()
+            unit = np.datetime_data(dtype)[0]
+            per_second = {'s': 1, 'ms': 10 ** 3, 'us': 10 ** 6, 'ns': 10 ** 9}.get(unit)
+            if per_second and not (values.view('i8')[~mask] % per_second).any():
+                # Whole seconds: same text as Timestamp.isoformat, without a Timestamp per cell
+                values = np.datetime_as_string(values, unit='s').tolist()
+            else:
+                values = [DataProcessor._native_value(val) for val in col.tolist()]
+        else:
+            values = col.astype(object).to_numpy()
+            if pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty'):
+                values = values.tolist()
+            else:
+                values = [DataProcessor._native_value(val) for val in values]
+        
+        if mask.any():
+            for i in np.flatnonzero(mask).tolist():
+                values[i] = na_value
+        return values
+    
     @staticmethod
     def get_preview(df: pd.DataFrame, rows: int = 10) -> Dict[str, Any]:
         """Get preview data for display"""
-        # Convert DataFrame to native Python types for JSON serialization
-        preview_df = df.head(rows).fillna('')
-        data = []
-        for _, row in preview_df.iterrows():
-            row_dict = {}
-            for col in preview_df.columns:
-                val = row[col]
-                if isinstance(val, (np.integer, np.int64, np.int32)):
-                    row_dict[col] = int(val)
-                elif isinstance(val, (np.floating, np.float64, np.float32)):
-                    row_dict[col] = float(val)
-                elif isinstance(val, np.bool_):
-                    row_dict[col] = bool(val)
-                else:
-                    row_dict[col] = val
-            data.append(row_dict)
+        head = df.head(rows)
+        # Missing values are shown as ''
+        columns = [DataProcessor.encode_column(head.iloc[:, i], '') for i in range(head.shape[1])]
+        if columns:
+            data = [dict(zip(head.columns, row)) for row in zip(*columns)]
+        else:
+            data = [{} for _ in range(len(head))]
         
         return {
             'columns': df.columns.tolist(),
@@ -87,6 +290,106 @@ class DataProcessor:
             'total_rows': int(len(df))
         }
     
+    # Row orders of sorted views: (id(df), column, ascending) -> (weakref to df, row positions)
+    _sort_orders = OrderedDict()
+    _sort_lock = threading.RLock()
+    
+    @classmethod
+    def sort_order(cls, df: pd.DataFrame, column: str, ascending: bool = True) -> np.ndarray:
+        """
+        Row positions of df sorted by one column (stable, missing values last).
+        Cached while the DataFrame is alive, so paging through a sorted view
+        sorts once rather than once per page.
+        """
+        key = (id(df), column, ascending)
+        with cls._sort_lock:
+            entry = cls._sort_orders.get(key)
+            if entry is not None and entry[0]() is df:
+                cls._sort_orders.move_to_end(key)
+                return entry[1]
+        
+        values = df[column].reset_index(drop=True)
+        try:
+            ordered = values.sort_values(ascending=ascending, kind='stable', na_position='last')
+        except TypeError:
+            # Mixed types (e.g. numbers and strings in one object column) sort as text
+            ordered = values.map(str, na_action='ignore').sort_values(ascending=ascending, kind='stable', na_position='last')
+        positions = ordered.index.to_numpy()
+        
+        def discard(ref, key=key):
+            with cls._sort_lock:
+                entry = cls._sort_orders.get(key)
+                if entry is not None and entry[0] is ref:
+                    del cls._sort_orders[key]
+        
+        with cls._sort_lock:
+            cls._sort_orders[key] = (weakref.ref(df, discard), positions)
+            cls._sort_orders.move_to_end(key)
+            while len(cls._sort_orders) > Config.ROWS_SORT_ORDERS_CACHED:
+                cls._sort_orders.popitem(last=False)
+        return positions
+    
+    @staticmethod
+    def get_rows(
+        df: pd.DataFrame,
+        offset: int = 0,
+        limit: int = 100,
+        sort: Optional[str] = None,
+        ascending: bool = True,
+        columns: Optional[List[str]] = None,
+        binary: bool = False
+    ) -> Dict[str, Any]:
+        """
+        One window of rows for paginated display: rows [offset, offset + limit)
+        of the (optionally sorted) table, restricted to the requested columns.
+        Rows are returned as arrays in 'columns' order with null for missing
+        values; 'positions' are the rows' positions in the unsorted table.
+        binary=True returns column-major 'data' instead of 'rows', numeric
+        columns and positions as typed-array specs (NaN for missing values).
+        """
+        if offset < 0 or limit < 1:
+            raise ValueError("offset must be >= 0 and limit >= 1")
+        columns = list(columns) if columns else df.columns.tolist()
+        unknown = [col for col in columns if col not in df.columns]
+        if unknown:
+            raise ValueError(f"Unknown column(s): {', '.join(map(str, unknown))}")
+        if sort is not None and sort not in df.columns:
+            raise ValueError(f"Unknown sort column: {sort}")
+        
+        if sort is not None:
+            positions = DataProcessor.sort_order(df, sort, ascending)[offset:offset + limit]
+        else:
+            positions = np.arange(min(offset, len(df)), min(offset + limit, len(df)))
+        window = df.iloc[positions, df.columns.get_indexer(columns)]
+        
+        result = {
+            'columns': columns,
+            'offset': offset,
+            'limit': limit,
+            'total_rows': int(len(df)),
+            'sort': {'column': sort, 'ascending': ascending} if sort is not None else None
+        }
+        if binary:
+            result['data'] = [DataProcessor._binary_column(window.iloc[:, i]) for i in range(window.shape[1])]
+            result['positions'] = typed_array(positions)
+        else:
+            encoded = [DataProcessor.encode_column(window.iloc[:, i]) for i in range(window.shape[1])]
+            result['rows'] = [list(row) for row in zip(*encoded)] if encoded else [[] for _ in positions]
+            result['positions'] = positions.tolist()
+        return result
+    
+    @staticmethod
+    def _binary_column(col: pd.Series):
+        """Typed-array spec for a numeric column, JSON-native list for anything else"""
+        dtype = col.dtype
+        if isinstance(dtype, np.dtype):
+            if dtype.kind in 'iuf':
+                return typed_array(col.to_numpy())
+        elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            # Nullable Int64/Float64: missing values become NaN
+            return typed_array(col.to_numpy(dtype=np.float64, na_value=np.nan))
+        return DataProcessor.encode_column(col)
+    
     @staticmethod
     def detect_common_columns(datasets: Dict[str, pd.DataFrame]) -> Dict[str, List[str]]:
         """Detect common columns between datasets"""
@@ -123,36 +426,29 @@ class DataProcessor:
         strategy: str = 'drop',
         fill_value: Any = None
     ) -> pd.DataFrame:
-        """Handle missing values in dataset"""
-        df = df.copy()
-        
-        if strategy == 'drop':
-            return df.dropna()
-        elif strategy == 'fill_mean':
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].mean())
-            return df
-        elif strategy == 'fill_median':
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].median())
-            return df
-        elif strategy == 'fill_mode':
-            for col in df.columns:
-                df[col] = df[col].fillna(df[col].mode().iloc[0] if not df[col].mode().empty else None)
-            return df
-        elif strategy == 'fill_value' and fill_value is not None:
-            return df.fillna(fill_value)
-        elif strategy == 'forward_fill':
-            return df.ffill()
-        elif strategy == 'backward_fill':
-            return df.bfill()
-        else:
+        """Handle missing values in dataset (unknown strategies leave it as is)"""
+        if strategy not in CleaningPlan.MISSING_STRATEGIES or (strategy == 'fill_value' and fill_value is None):
             return df
+        return CleaningPlan().handle_missing(strategy, fill_value).execute(df)
+    
+    @staticmethod
+    def remove_duplicates(df: pd.DataFrame, keep: str = 'first', subset: Optional[List[str]] = None) -> pd.DataFrame:
+        """Remove duplicate rows (or rows repeating the subset columns), from the dataset's row hashes"""
+        return CleaningPlan().remove_duplicates(subset, keep).execute(df)
     
     @staticmethod
-    def remove_duplicates(df: pd.DataFrame, keep: str = 'first') -> pd.DataFrame:
-        """Remove duplicate rows"""
-        return df.drop_duplicates(keep=keep)
+    def append_rows(df: pd.DataFrame, rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        Rows of another table (with the same columns) appended to df under a
+        fresh RangeIndex; df's row hashes are extended by the new rows' only
+        """
+        if set(rows.columns) != set(df.columns) or len(rows.columns) != len(df.columns):
+            raise ValueError("Appended rows must have the same columns as the dataset")
+        combined = pd.concat([df, rows[df.columns]], ignore_index=True)
+        hashes = ColumnProfiler.known_row_hashes(df)
+        if hashes is not None:
+            ColumnProfiler.remember_row_hashes(combined, row_index.appended(hashes, df, combined))
+        return combined
     
     @staticmethod
     def infer_data_source(df: pd.DataFrame) -> str:
@@ -176,7 +472,7 @@ class DataProcessor:
             return 'General Dataset'
     
     @staticmethod
-    def calculate_health_score(df: pd.DataFrame) -> Dict[str, Any]:
+    def calculate_health_score(df: pd.DataFrame, approx: bool = False) -> Dict[str, Any]:
         """
         Calculate comprehensive data health score (0-100)
         Uses weighted scoring based on:
@@ -184,6 +480,7 @@ class DataProcessor:
         - Duplicate row count (20% weight)
         - Outlier ratio using IQR (25% weight)
         - Data type consistency (25% weight)
+        approx=True allows sketch-based duplicate and outlier counts for very large tables.
         """
         total_rows = len(df)
         total_cols = len(df.columns)
@@ -196,49 +493,34 @@ class DataProcessor:
                 'components': {}
             }
         
+        profile = ColumnProfiler.profile(df, approx=approx)
+        
         # 1. Missing Values Score (30% weight)
-        missing_percentage = (df.isnull().sum().sum() / (total_rows * total_cols)) * 100
+        missing_percentage = (profile.null_counts.sum() / (total_rows * total_cols)) * 100
         missing_score = max(0, 100 - (missing_percentage * 2))  # Penalize 2 points per 1% missing
         
         # 2. Duplicate Score (20% weight)
-        duplicate_count = df.duplicated().sum()
+        duplicate_count = profile.duplicate_count
         duplicate_percentage = (duplicate_count / total_rows) * 100
         duplicate_score = max(0, 100 - (duplicate_percentage * 2))
         
         # 3. Outlier Score using IQR method (25% weight)
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        outlier_count = 0
-        total_numeric_values = 0
-        
-        for col in numeric_cols:
-            col_data = df[col].dropna()
-            if len(col_data) > 0:
-                Q1 = col_data.quantile(0.25)
-                Q3 = col_data.quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                outliers = ((col_data < lower_bound) | (col_data > upper_bound)).sum()
-                outlier_count += outliers
-                total_numeric_values += len(col_data)
+        outlier_count = OutlierEngine(df, profile).total_count('iqr')
+        total_numeric_values = profile.numeric_stats['count'].sum()
         
         outlier_percentage = (outlier_count / max(1, total_numeric_values)) * 100
         outlier_score = max(0, 100 - (outlier_percentage * 3))  # Penalize 3 points per 1% outliers
         
         # 4. Data Type Consistency Score (25% weight)
         consistency_issues = 0
-        for col in df.columns:
-            # Check if column has mixed types (object columns with potential numbers)
-            if df[col].dtype == 'object':
-                try:
-                    numeric_convertible = pd.to_numeric(df[col], errors='coerce').notna().sum()
-                    non_null_count = df[col].notna().sum()
-                    if non_null_count > 0:
-                        # If more than 50% can be converted to numbers, flag as inconsistent
-                        if numeric_convertible / non_null_count > 0.5 and numeric_convertible < non_null_count:
-                            consistency_issues += 1
-                except:
-                    pass
+        for col in profile.categorical_cols:
+            # Check if column has mixed types (string columns with potential numbers)
+            numeric_convertible = profile.numeric_convertible[col]
+            non_null_count = total_rows - int(profile.null_counts[col])
+            if non_null_count > 0:
+                # If more than 50% can be converted to numbers, flag as inconsistent
+                if numeric_convertible / non_null_count > 0.5 and numeric_convertible < non_null_count:
+                    consistency_issues += 1
         
         consistency_percentage = (consistency_issues / max(1, total_cols)) * 100
         consistency_score = max(0, 100 - (consistency_percentage * 5))
@@ -271,7 +553,7 @@ class DataProcessor:
             category = 'Poor'
             color = 'red'
         
-        return {
+        result = {
             'score': total_score,
             'category': category,
             'color': color,
@@ -304,3 +586,12 @@ class DataProcessor:
                 }
             }
         }
+        
+        if profile.approximate:
+            result['approximate'] = True
+            result['error_bounds'] = {
+                'duplicate_count': profile.error_bounds['duplicate_count_error'],
+                'quantile_rank_error': max(profile.error_bounds['quantile_rank_error'].values(), default=0.0)
+            }
+        
+        return result
@@ -0,0 +1,195 @@
+"""
+Dataset Cache Module
+Content-hash-keyed columnar (Arrow IPC) cache of parsed upload files
+"""
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, Any, Callable, Optional, Tuple
+
+import pandas as pd
+
+from data_processor import current_rss_bytes
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+
+def file_digest(filepath: str, block_size: int = 1024 * 1024) -> str:
+    """SHA-256 hex digest of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_columnar(df: pd.DataFrame, path: str) -> None:
+    """Atomically write a DataFrame as an uncompressed Arrow IPC (Feather v2) file"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        # Uncompressed so readers can memory-map the buffers directly
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_columnar(path: str) -> pd.DataFrame:
+    """Read an Arrow IPC file through a memory map"""
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+
+class DatasetCache:
+    """Size-bounded cache of parsed datasets keyed by the source file's content hash"""
+
+    # Bump when ingestion changes how a file is parsed, so stale entries are never hit
+    READER_VERSION = 1
+
+    EXTENSION = '.arrow'
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = feather is not None
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'errors': 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key_for(self, filepath: str) -> str:
+        """Cache key for a file's current contents"""
+        return f"{file_digest(filepath)}-v{self.READER_VERSION}"
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + self.EXTENSION)
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Return the cached DataFrame for a key, or None on a miss"""
+        path = self._path_for(key)
+        if not self.enabled or not os.path.exists(path):
+            self._count('misses')
+            return None
+
+        try:
+            df = read_columnar(path)
+        except Exception:
+            # Truncated or foreign file: drop it and reparse the source
+            self._count('errors')
+            self._count('misses')
+            self._remove(path)
+            return None
+
+        # Refresh mtime so eviction treats this entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count('hits')
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> bool:
+        """Store a DataFrame under a key, evicting old entries past the size limit"""
+        if not self.enabled:
+            return False
+
+        try:
+            write_columnar(df, self._path_for(key))
+        except Exception:
+            # Mixed-type object columns and other non-Arrow data are simply not cached
+            self._count('errors')
+            return False
+
+        self._count('writes')
+        self._evict()
+        return True
+
+    def load(
+        self,
+        filepath: str,
+        reader: Callable[[str], Tuple[pd.DataFrame, Dict[str, Any]]]
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Load a file through the cache, falling back to reader(filepath) on a miss"""
+        if not self.enabled:
+            df, stats = reader(filepath)
+            stats['cache'] = 'disabled'
+            return df, stats
+
+        start = time.perf_counter()
+        key = self.key_for(filepath)
+        df = self.get(key)
+
+        if df is None:
+            df, stats = reader(filepath)
+            stats['cache'] = 'stored' if self.put(key, df) else 'miss'
+            return df, stats
+
+        elapsed = time.perf_counter() - start
+        rss = current_rss_bytes()
+        return df, {
+            'rows': int(len(df)),
+            'chunks': 0,
+            'seconds': round(elapsed, 3),
+            'rows_per_sec': int(len(df) / elapsed) if elapsed > 0 else None,
+            'peak_rss_mb': round(rss / 1024 / 1024, 1) if rss else None,
+            'categorical_columns': [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)],
+            'datetime_columns': df.select_dtypes(include=['datetime64', 'datetimetz']).columns.tolist(),
+            'cache': 'hit'
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current cache size"""
+        entries = self._entries()
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters['hits'] + counters['misses']
+
+        return {
+            'enabled': self.enabled,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+            'hit_ratio': round(counters['hits'] / lookups, 4) if lookups else None,
+            **counters
+        }
+
+    def _entries(self):
+        """(path, size, mtime) for every cache file"""
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith(self.EXTENSION):
+                continue
+            path = os.path.join(self.cache_dir, filename)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            for path, size, _ in entries:
+                if total <= self.max_bytes:
+                    break
+                if self._remove(path):
+                    total -= size
+                    self._counters['evictions'] += 1
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
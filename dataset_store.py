@@ -0,0 +1,506 @@
+"""
+Dataset Store Module
+Per-session dataset storage with a memory budget, LRU spill-to-disk and session expiry.
+DatasetStore lives inside one process; SharedDatasetStore is visible to every
+worker process on the host.
+"""
+import atexit
+import os
+import pickle
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Dict, Any, Tuple
+
+import pandas as pd
+
+from dataset_cache import feather, write_columnar, read_columnar
+
+
+def write_frame_file(df: pd.DataFrame, directory: str) -> str:
+    """Write a frame to a new file, preferring Arrow IPC and falling back to pickle"""
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.join(directory, uuid.uuid4().hex)
+    if feather is not None:
+        try:
+            write_columnar(df, stem + '.arrow')
+            return stem + '.arrow'
+        except Exception:
+            pass
+    df.to_pickle(stem + '.pkl')
+    return stem + '.pkl'
+
+
+def read_frame_file(path: str) -> pd.DataFrame:
+    """Read a file written by write_frame_file"""
+    return read_columnar(path) if path.endswith('.arrow') else pd.read_pickle(path)
+
+
+def remove_file(path: str):
+    """Delete a file, ignoring files that are already gone or still open elsewhere"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def create_dataset_store(config) -> 'DatasetStore':
+    """Build the dataset store selected by config.DATASET_STORE_BACKEND"""
+    if config.DATASET_STORE_BACKEND == 'shared':
+        return SharedDatasetStore(config.DATASET_MEMORY_BUDGET, config.SHARED_STORE_FOLDER, config.SESSION_TTL_SECONDS)
+    if config.DATASET_STORE_BACKEND == 'memory':
+        return DatasetStore(config.DATASET_MEMORY_BUDGET, config.SPILL_FOLDER, config.SESSION_TTL_SECONDS)
+    raise ValueError(f"Unknown dataset store backend: {config.DATASET_STORE_BACKEND}")
+
+
+class DatasetRecord(MutableMapping):
+    """Metadata for one dataset; the 'df' entry is fetched from the store on access"""
+
+    def __init__(self, store: 'DatasetStore', key: Tuple[str, str], fields: Dict[str, Any]):
+        self._store = store
+        self._key = key
+        self._fields = fields
+
+    def __getitem__(self, name):
+        if name == 'df':
+            return self._store._load_df(self._key)
+        return self._fields[name]
+
+    def __setitem__(self, name, value):
+        if name == 'df':
+            self._store._set_df(self._key, value)
+        else:
+            self._fields[name] = value
+            self._store._save_fields(self._key, self._fields)
+
+    def __delitem__(self, name):
+        if name == 'df':
+            raise KeyError("A dataset record cannot exist without its DataFrame")
+        del self._fields[name]
+        self._store._save_fields(self._key, self._fields)
+
+    def __iter__(self):
+        yield 'df'
+        yield from self._fields
+
+    def __len__(self):
+        return len(self._fields) + 1
+
+
+class SessionDatasets(MutableMapping):
+    """Dict-like view of one session's datasets, keyed by dataset id"""
+
+    def __init__(self, store: 'DatasetStore', session_id: str):
+        self._store = store
+        self._session_id = session_id
+
+    def _records(self) -> Dict[str, DatasetRecord]:
+        return self._store._session_records(self._session_id)
+
+    def __getitem__(self, dataset_id):
+        return self._records()[dataset_id]
+
+    def __setitem__(self, dataset_id, data):
+        self._store.add(self._session_id, dataset_id, dict(data))
+
+    def __delitem__(self, dataset_id):
+        self._store.remove(self._session_id, dataset_id)
+
+    def __iter__(self):
+        return iter(list(self._records()))
+
+    def __len__(self):
+        return len(self._records())
+
+
+class DatasetStore:
+    """
+    Keeps DataFrames resident up to a memory budget.
+    Least recently used frames are spilled to columnar files and reloaded
+    transparently when a record's 'df' is accessed again. Sessions that
+    have not been touched for ttl_seconds are dropped with their spill files.
+    """
+
+    # How often (seconds) expired sessions are looked for
+    SWEEP_INTERVAL = 60
+
+    def __init__(self, memory_budget: int, spill_dir: str, ttl_seconds: int):
+        self.memory_budget = memory_budget
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._sessions = {}          # session_id -> {'records': {id: DatasetRecord}, 'last_access': ts}
+        self._resident = OrderedDict()  # (session_id, dataset_id) -> DataFrame, oldest first
+        self._resident_bytes = {}    # key -> in-memory size of the resident frame
+        self._spill_paths = {}       # key -> spill file holding the current frame
+        self._counters = {'evictions': 0, 'reloads': 0, 'expired_sessions': 0}
+        self._last_sweep = time.time()
+
+        # Spill files are private to this process; clear out leftovers from dead ones
+        os.makedirs(spill_dir, exist_ok=True)
+        self._remove_stale_spill_dirs(spill_dir)
+        self.spill_dir = os.path.join(spill_dir, uuid.uuid4().hex)
+        os.makedirs(self.spill_dir)
+        atexit.register(shutil.rmtree, self.spill_dir, True)
+
+    # ---------- session-level API ----------
+
+    def session(self, session_id: str) -> SessionDatasets:
+        """Dict-like access to a session's datasets (creating the session if needed)"""
+        with self._lock:
+            self._sweep_expired()
+            entry = self._sessions.setdefault(session_id, {'records': {}, 'last_access': time.time()})
+            entry['last_access'] = time.time()
+        return SessionDatasets(self, session_id)
+
+    def add(self, session_id: str, dataset_id: str, data: Dict[str, Any]):
+        """Store a dataset given as a dict of metadata plus its 'df'"""
+        df = data.pop('df')
+        key = (session_id, dataset_id)
+        with self._lock:
+            if dataset_id in self._session_records(session_id):
+                self.remove(session_id, dataset_id)
+            self._sessions[session_id]['records'][dataset_id] = DatasetRecord(self, key, data)
+            self._set_df(key, df)
+
+    def remove(self, session_id: str, dataset_id: str):
+        """Drop a dataset and any spill file it owns"""
+        key = (session_id, dataset_id)
+        with self._lock:
+            del self._session_records(session_id)[dataset_id]
+            self._drop_df(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Resident vs. spilled dataset counts and bytes"""
+        with self._lock:
+            spilled = [key for key in self._spill_paths if key not in self._resident]
+            spilled_bytes = 0
+            for key in spilled:
+                try:
+                    spilled_bytes += os.path.getsize(self._spill_paths[key])
+                except OSError:
+                    pass
+
+            return {
+                'backend': 'memory',
+                'sessions': len(self._sessions),
+                'datasets': sum(len(entry['records']) for entry in self._sessions.values()),
+                'resident_datasets': len(self._resident),
+                'spilled_datasets': len(spilled),
+                'resident_bytes': int(sum(self._resident_bytes.values())),
+                'spilled_bytes': int(spilled_bytes),
+                'memory_budget': self.memory_budget,
+                'session_ttl_seconds': self.ttl_seconds,
+                **self._counters
+            }
+
+    # ---------- DataFrame residency ----------
+
+    def _session_records(self, session_id: str) -> Dict[str, DatasetRecord]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            entry = self._sessions[session_id] = {'records': {}, 'last_access': time.time()}
+        return entry['records']
+
+    def _load_df(self, key) -> pd.DataFrame:
+        with self._lock:
+            if key in self._resident:
+                self._resident.move_to_end(key)
+                return self._resident[key]
+
+            df = read_frame_file(self._spill_paths[key])
+            self._counters['reloads'] += 1
+            # Keep the spill file: if this frame is evicted again it needs no rewrite
+            self._make_resident(key, df)
+            return df
+
+    def _set_df(self, key, df: pd.DataFrame):
+        with self._lock:
+            self._drop_df(key)
+            self._make_resident(key, df)
+
+    def _make_resident(self, key, df: pd.DataFrame):
+        self._resident[key] = df
+        self._resident_bytes[key] = int(df.memory_usage(deep=True).sum())
+        self._enforce_budget(keep=key)
+
+    def _enforce_budget(self, keep):
+        """Spill least recently used frames until resident bytes fit the budget"""
+        while sum(self._resident_bytes.values()) > self.memory_budget:
+            victim = next((key for key in self._resident if key != keep), None)
+            if victim is None:
+                # The frame in use is larger than the budget on its own; keep it
+                break
+            if victim not in self._spill_paths:
+                self._spill_paths[victim] = write_frame_file(self._resident[victim], self.spill_dir)
+            del self._resident[victim]
+            del self._resident_bytes[victim]
+            self._counters['evictions'] += 1
+
+    def _save_fields(self, key, fields: Dict[str, Any]):
+        # Records hold their metadata dict directly; nothing to persist
+        pass
+
+    def _drop_df(self, key):
+        self._resident.pop(key, None)
+        self._resident_bytes.pop(key, None)
+        path = self._spill_paths.pop(key, None)
+        if path:
+            remove_file(path)
+
+    # ---------- expiry ----------
+
+    def _sweep_expired(self):
+        now = time.time()
+        if now - self._last_sweep < self.SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+
+        expired = [sid for sid, entry in self._sessions.items() if now - entry['last_access'] > self.ttl_seconds]
+        for session_id in expired:
+            for dataset_id in list(self._sessions[session_id]['records']):
+                self._drop_df((session_id, dataset_id))
+            del self._sessions[session_id]
+            self._counters['expired_sessions'] += 1
+
+    def _remove_stale_spill_dirs(self, spill_root: str):
+        cutoff = time.time() - self.ttl_seconds
+        for name in os.listdir(spill_root):
+            path = os.path.join(spill_root, name)
+            try:
+                if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                pass
+
+
+class SharedDatasetStore:
+    """
+    Dataset store shared by all worker processes on one host.
+    DataFrames are written once to immutable Arrow IPC files and an SQLite
+    index maps (session, dataset) to the current file plus its metadata, so
+    a request can land on any worker. Each process keeps recently used
+    frames in a local LRU bounded by memory_budget; because files are never
+    rewritten in place, a cached frame stays valid until the index points
+    the dataset at a new file.
+    """
+
+    SWEEP_INTERVAL = 60
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            last_access REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS datasets (
+            session_id TEXT NOT NULL,
+            dataset_id TEXT NOT NULL,
+            meta BLOB NOT NULL,
+            path TEXT NOT NULL,
+            nbytes INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (session_id, dataset_id)
+        );
+    """
+
+    def __init__(self, memory_budget: int, store_dir: str, ttl_seconds: int):
+        self.memory_budget = memory_budget
+        self.ttl_seconds = ttl_seconds
+        self.data_dir = os.path.join(store_dir, 'data')
+        self.index_path = os.path.join(store_dir, 'index.sqlite3')
+        self._lock = threading.RLock()
+        self._frames = OrderedDict()  # data file path -> DataFrame, oldest first
+        self._frame_bytes = {}
+        self._counters = {'evictions': 0, 'reloads': 0, 'expired_sessions': 0}
+        self._last_sweep = 0.0
+
+        os.makedirs(self.data_dir, exist_ok=True)
+        with self._connect() as conn:
+            # WAL lets readers in other workers proceed while one worker writes
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection per operation (sqlite3 connections are per-thread)"""
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ---------- session-level API ----------
+
+    def session(self, session_id: str) -> SessionDatasets:
+        """Dict-like access to a session's datasets (creating the session if needed)"""
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO sessions (session_id, last_access) VALUES (?, ?)',
+                (session_id, time.time())
+            )
+        self._sweep_expired()
+        return SessionDatasets(self, session_id)
+
+    def add(self, session_id: str, dataset_id: str, data: Dict[str, Any]):
+        """Store a dataset given as a dict of metadata plus its 'df'"""
+        df = data.pop('df')
+        path = write_frame_file(df, self.data_dir)
+        with self._connect() as conn:
+            old = conn.execute(
+                'SELECT path FROM datasets WHERE session_id = ? AND dataset_id = ?',
+                (session_id, dataset_id)
+            ).fetchone()
+            conn.execute(
+                'INSERT OR REPLACE INTO datasets VALUES (?, ?, ?, ?, ?, ?)',
+                (session_id, dataset_id, pickle.dumps(data), path, os.path.getsize(path), time.time())
+            )
+        if old:
+            self._forget_file(old[0])
+        self._cache_frame(path, df)
+
+    def remove(self, session_id: str, dataset_id: str):
+        """Drop a dataset and its data file"""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT path FROM datasets WHERE session_id = ? AND dataset_id = ?',
+                (session_id, dataset_id)
+            ).fetchone()
+            if row is None:
+                raise KeyError(dataset_id)
+            conn.execute(
+                'DELETE FROM datasets WHERE session_id = ? AND dataset_id = ?',
+                (session_id, dataset_id)
+            )
+        self._forget_file(row[0])
+
+    def stats(self) -> Dict[str, Any]:
+        """Shared dataset counts and bytes, plus this worker's resident frames"""
+        with self._connect() as conn:
+            sessions = conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+            datasets, stored_bytes = conn.execute('SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM datasets').fetchone()
+
+        with self._lock:
+            return {
+                'backend': 'shared',
+                'sessions': sessions,
+                'datasets': datasets,
+                'stored_bytes': int(stored_bytes),
+                'resident_datasets': len(self._frames),
+                'resident_bytes': int(sum(self._frame_bytes.values())),
+                'memory_budget': self.memory_budget,
+                'session_ttl_seconds': self.ttl_seconds,
+                'worker_pid': os.getpid(),
+                **self._counters
+            }
+
+    # ---------- records and frames ----------
+
+    def _session_records(self, session_id: str) -> Dict[str, DatasetRecord]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT dataset_id, meta FROM datasets WHERE session_id = ? ORDER BY created_at',
+                (session_id,)
+            ).fetchall()
+        return {
+            dataset_id: DatasetRecord(self, (session_id, dataset_id), pickle.loads(meta))
+            for dataset_id, meta in rows
+        }
+
+    def _current_path(self, key) -> str:
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT path FROM datasets WHERE session_id = ? AND dataset_id = ?', key
+            ).fetchone()
+        if row is None:
+            raise KeyError(key[1])
+        return row[0]
+
+    def _load_df(self, key) -> pd.DataFrame:
+        path = self._current_path(key)
+        with self._lock:
+            if path in self._frames:
+                self._frames.move_to_end(path)
+                return self._frames[path]
+
+        try:
+            df = read_frame_file(path)
+        except FileNotFoundError:
+            # Another worker replaced the frame between the lookup and the read
+            path = self._current_path(key)
+            df = read_frame_file(path)
+
+        with self._lock:
+            self._counters['reloads'] += 1
+        self._cache_frame(path, df)
+        return df
+
+    def _set_df(self, key, df: pd.DataFrame):
+        path = write_frame_file(df, self.data_dir)
+        with self._connect() as conn:
+            old = conn.execute(
+                'SELECT path FROM datasets WHERE session_id = ? AND dataset_id = ?', key
+            ).fetchone()
+            conn.execute(
+                'UPDATE datasets SET path = ?, nbytes = ? WHERE session_id = ? AND dataset_id = ?',
+                (path, os.path.getsize(path)) + tuple(key)
+            )
+        if old:
+            self._forget_file(old[0])
+        self._cache_frame(path, df)
+
+    def _save_fields(self, key, fields: Dict[str, Any]):
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE datasets SET meta = ? WHERE session_id = ? AND dataset_id = ?',
+                (pickle.dumps(fields),) + tuple(key)
+            )
+
+    def _cache_frame(self, path: str, df: pd.DataFrame):
+        """Keep a frame in this worker's LRU, evicting the oldest past the budget"""
+        with self._lock:
+            self._frames[path] = df
+            self._frame_bytes[path] = int(df.memory_usage(deep=True).sum())
+            while sum(self._frame_bytes.values()) > self.memory_budget and len(self._frames) > 1:
+                oldest, _ = self._frames.popitem(last=False)
+                del self._frame_bytes[oldest]
+                self._counters['evictions'] += 1
+
+    def _forget_file(self, path: str):
+        with self._lock:
+            self._frames.pop(path, None)
+            self._frame_bytes.pop(path, None)
+        remove_file(path)
+
+    # ---------- expiry ----------
+
+    def _sweep_expired(self):
+        now = time.time()
+        with self._lock:
+            if now - self._last_sweep < self.SWEEP_INTERVAL:
+                return
+            self._last_sweep = now
+
+        cutoff = now - self.ttl_seconds
+        with self._connect() as conn:
+            expired = [row[0] for row in conn.execute(
+                'SELECT session_id FROM sessions WHERE last_access < ?', (cutoff,)
+            )]
+            paths = [row[0] for row in conn.execute(
+                'SELECT path FROM datasets WHERE session_id IN '
+                '(SELECT session_id FROM sessions WHERE last_access < ?)', (cutoff,)
+            )]
+            conn.execute(
+                'DELETE FROM datasets WHERE session_id IN '
+                '(SELECT session_id FROM sessions WHERE last_access < ?)', (cutoff,)
+            )
+            conn.execute('DELETE FROM sessions WHERE last_access < ?', (cutoff,))
+
+        for path in paths:
+            self._forget_file(path)
+        with self._lock:
+            self._counters['expired_sessions'] += len(expired)
@@ -0,0 +1,380 @@
+"""
+Dataset Versions Module
+Copy-on-write version history of datasets, for undo, rollback and branching
+"""
+import atexit
+import os
+import shutil
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from cleaning_plan import assemble_frame
+from column_profiler import ColumnProfiler
+from dataset_store import write_frame_file, read_frame_file, remove_file
+
+
+class DatasetVersion:
+    """
+    One version of a dataset. A root holds its whole frame, in memory or
+    spilled to a file (path); any other version holds only its change over
+    the parent: the rows kept (a bitmap over the parent's rows, None for
+    all) with the rewritten columns (by column position, over the kept
+    rows), or the rows appended. Branches share versions; the only changes
+    ever made to one are spilling a root and folding a version into a root
+    when its history is trimmed.
+    """
+
+    def __init__(
+        self,
+        parent: Optional['DatasetVersion'],
+        label: str,
+        info: Dict[str, Any],
+        fingerprint: str,
+        frame: Optional[pd.DataFrame] = None,
+        rows: Optional[np.ndarray] = None,
+        columns: Optional[Dict[int, Any]] = None,
+        appended: Optional[pd.DataFrame] = None
+    ):
+        self.id = uuid.uuid4().hex[:8]
+        self.parent = parent
+        self.label = label
+        self.info = info
+        self.fingerprint = fingerprint  # content fingerprint of the version's frame
+        self.created_at = datetime.now().isoformat()
+        self.n_rows = int(info['rows'])
+        self.frame = frame
+        self.path = None
+        self.columns = columns or {}
+        self.appended = appended
+        self.rows = None
+        if rows is not None:
+            kept = np.zeros(parent.n_rows, dtype=bool)
+            kept[rows] = True
+            self.rows = np.packbits(kept)
+        self.nbytes = self.held_bytes()
+
+    def held_bytes(self) -> int:
+        """Memory held by this version alone (none for a spilled root)"""
+        if self.frame is not None:
+            return int(self.frame.memory_usage(deep=True).sum())
+        if self.path is not None:
+            return 0
+        size = sum(int(values.nbytes) for values in self.columns.values())
+        if self.rows is not None:
+            size += self.rows.nbytes
+        if self.appended is not None:
+            size += int(self.appended.memory_usage(deep=True).sum())
+        return size
+
+    def positions(self) -> Optional[np.ndarray]:
+        """Positions of the parent's rows this version keeps (None for all)"""
+        if self.rows is None:
+            return None
+        return np.flatnonzero(np.unpackbits(self.rows, count=self.parent.n_rows))
+
+    def apply(self, parent_df: pd.DataFrame) -> pd.DataFrame:
+        """This version's frame from its parent's"""
+        if self.appended is not None:
+            return pd.concat([parent_df, self.appended], ignore_index=True)
+        return assemble_frame(parent_df, self.positions(), self.columns)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'parent': self.parent.id if self.parent is not None else None,
+            'label': self.label,
+            'created_at': self.created_at,
+            'rows': self.n_rows,
+            'columns': self.info['columns'],
+            'changed_columns': [self.info['column_names'][j] for j in sorted(self.columns)],
+            'bytes': self.nbytes
+        }
+
+
+class VersionHistory:
+    """
+    Version trees of this process's datasets, keyed by (session, dataset).
+    A history starts on a dataset's first change, with the frame it had as
+    root. Only changes are stored after that, so unchanged columns are
+    shared by every version, and a version's frame is rebuilt from its
+    nearest root when it is checked out again (frames still in use are
+    reused). Past max_versions a history's oldest versions are folded into
+    a new root. Past max_bytes, roots are spilled to files under spill_dir
+    (least recently used histories first) and read back when a version is
+    rebuilt; if the changes alone are still too big, the least recently
+    used histories are dropped, the current one last, which only takes
+    away their undo.
+    """
+
+    # How often (seconds) histories of expired sessions are looked for
+    SWEEP_INTERVAL = 60
+
+    def __init__(self, max_bytes: int, max_versions: int, ttl_seconds: int, spill_dir: str):
+        self.max_bytes = max_bytes
+        self.max_versions = max(2, max_versions)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()  # key -> {'head': version, 'versions': {id: version}, 'last_access': ts}
+        self._frames = weakref.WeakValueDictionary()  # version id -> frame rebuilt or committed
+        self._counters = {'commits': 0, 'checkouts': 0, 'rebuilds': 0, 'folds': 0, 'spills': 0, 'evictions': 0}
+        self._last_sweep = time.time()
+
+        # Spilled roots are private to this process, as the history is; clear out leftovers
+        # of dead processes (live ones touch their directory every sweep)
+        os.makedirs(spill_dir, exist_ok=True)
+        cutoff = time.time() - ttl_seconds
+        for name in os.listdir(spill_dir):
+            path = os.path.join(spill_dir, name)
+            try:
+                if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                pass
+        self.spill_dir = os.path.join(spill_dir, uuid.uuid4().hex)
+        os.makedirs(self.spill_dir)
+        atexit.register(shutil.rmtree, self.spill_dir, True)
+
+    def commit(
+        self,
+        key: Tuple[str, str],
+        parent_df: pd.DataFrame,
+        parent_info: Dict[str, Any],
+        df: pd.DataFrame,
+        info: Dict[str, Any],
+        label: str,
+        rows: Optional[np.ndarray] = None,
+        columns: Optional[Dict[int, Any]] = None,
+        appended: Optional[pd.DataFrame] = None
+    ) -> DatasetVersion:
+        """
+        Record df as the next version after parent_df, given as the rows of
+        parent_df kept (positions) and columns rewritten, or as rows appended
+        """
+        with self._lock:
+            entry = self._entry(key, parent_df, parent_info)
+            version = DatasetVersion(
+                entry['head'], label, info, ColumnProfiler.fingerprint(df), rows=rows, columns=columns, appended=appended
+            )
+            entry['versions'][version.id] = version
+            entry['head'] = version
+            self._frames[version.id] = df
+            self._counters['commits'] += 1
+            self._fold(entry)
+            self._enforce_budget(keep=key)
+            return version
+
+    def head(self, key: Tuple[str, str]) -> Optional[DatasetVersion]:
+        with self._lock:
+            entry = self._touch(key)
+            return entry['head'] if entry else None
+
+    def versions(self, key: Tuple[str, str]) -> Dict[str, Any]:
+        """The dataset's versions, oldest first, and which one is current"""
+        with self._lock:
+            entry = self._touch(key)
+            if entry is None:
+                return {'head': None, 'versions': []}
+            return {
+                'head': entry['head'].id,
+                'versions': [version.describe() for version in entry['versions'].values()]
+            }
+
+    def checkout(self, key: Tuple[str, str], version_id: str) -> Tuple[DatasetVersion, pd.DataFrame]:
+        """Make a version of the history current again (rollback or redo); returns it with its frame"""
+        with self._lock:
+            entry = self._touch(key)
+            if entry is None or version_id not in entry['versions']:
+                raise KeyError(version_id)
+            version = entry['versions'][version_id]
+            entry['head'] = version
+            self._counters['checkouts'] += 1
+            return version, self.frame(version)
+
+    def undo(self, key: Tuple[str, str]) -> Tuple[DatasetVersion, pd.DataFrame]:
+        """Go back to the parent of the current version"""
+        with self._lock:
+            entry = self._touch(key)
+            if entry is None or entry['head'].parent is None:
+                raise ValueError("Nothing to undo")
+            return self.checkout(key, entry['head'].parent.id)
+
+    def branch(
+        self,
+        key: Tuple[str, str],
+        new_key: Tuple[str, str],
+        df: pd.DataFrame,
+        info: Dict[str, Any],
+        version_id: Optional[str] = None
+    ) -> Tuple[DatasetVersion, pd.DataFrame]:
+        """
+        Start new_key's history at a version of key's (the current one by
+        default; df and info are the current frame, for a dataset without
+        history yet). The two share every version up to the branch point.
+        """
+        with self._lock:
+            entry = self._entry(key, df, info)
+            version = entry['versions'].get(version_id or entry['head'].id)
+            if version is None:
+                raise KeyError(version_id)
+            lineage = []
+            ancestor = version
+            while ancestor is not None:
+                lineage.append(ancestor)
+                ancestor = ancestor.parent
+            self._entries[new_key] = {
+                'head': version,
+                'versions': OrderedDict((v.id, v) for v in reversed(lineage)),
+                'last_access': time.time()
+            }
+            frame = self.frame(version)
+            self._enforce_budget(keep=new_key)
+            return version, frame
+
+    def drop(self, key: Tuple[str, str]):
+        with self._lock:
+            if key in self._entries:
+                self._remove_entry(key)
+
+    def frame(self, version: DatasetVersion) -> pd.DataFrame:
+        """A version's frame: the one still in use if any, else rebuilt from the nearest root"""
+        with self._lock:
+            pending = []
+            current = version
+            while True:
+                df = current.frame if current.frame is not None else self._frames.get(current.id)
+                if df is None and current.path is not None:
+                    df = read_frame_file(current.path)
+                    self._frames[current.id] = df
+                if df is not None:
+                    break
+                pending.append(current)
+                current = current.parent
+            for current in reversed(pending):
+                df = current.apply(df)
+                self._frames[current.id] = df
+                self._counters['rebuilds'] += 1
+            return df
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'histories': len(self._entries),
+                'versions': sum(len(entry['versions']) for entry in self._entries.values()),
+                'bytes': self._total_bytes(),
+                'max_bytes': self.max_bytes,
+                **self._counters
+            }
+
+    # ---------- internals ----------
+
+    def _touch(self, key) -> Optional[Dict[str, Any]]:
+        self._sweep_expired()
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry['last_access'] = time.time()
+            self._entries.move_to_end(key)
+        return entry
+
+    def _entry(self, key, df: pd.DataFrame, info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        key's history, started with df as root when there is none or its head
+        is not df: the dataset was changed some other way since (merge,
+        another worker), so changes recorded over the head would be wrong
+        """
+        entry = self._touch(key)
+        fingerprint = ColumnProfiler.fingerprint(df)
+        if entry is not None and entry['head'].fingerprint == fingerprint:
+            return entry
+        if entry is not None:
+            self._remove_entry(key)
+        root = DatasetVersion(None, 'original', info, fingerprint, frame=df)
+        entry = self._entries[key] = {
+            'head': root,
+            'versions': OrderedDict([(root.id, root)]),
+            'last_access': time.time()
+        }
+        return entry
+
+    def _fold(self, entry: Dict[str, Any]):
+        """Fold the oldest versions of a history into roots until it has at most max_versions"""
+        versions = entry['versions']
+        while len(versions) > self.max_versions:
+            _, oldest = versions.popitem(last=False)
+            for version in versions.values():
+                if version.parent is oldest:
+                    version.frame = self.frame(version)
+                    version.parent, version.rows, version.columns, version.appended = None, None, {}, None
+                    version.nbytes = version.held_bytes()
+            self._release([oldest])
+            self._counters['folds'] += 1
+
+    def _total_bytes(self) -> int:
+        seen, total = set(), 0
+        for entry in self._entries.values():
+            for version in entry['versions'].values():
+                if version.id not in seen:
+                    seen.add(version.id)
+                    total += version.nbytes
+        return total
+
+    def _enforce_budget(self, keep):
+        """Spill roots, then drop histories (keep last), until the history fits in max_bytes"""
+        while self._entries and self._total_bytes() > self.max_bytes:
+            resident = next(
+                ((key, version) for key, entry in self._entries.items()
+                 for version in entry['versions'].values() if version.frame is not None),
+                None
+            )
+            if resident is not None and self._spill(resident[1]):
+                continue
+            if resident is not None:
+                victim = resident[0]
+            else:
+                victim = next((key for key in self._entries if key != keep), keep)
+            self._remove_entry(victim)
+            self._counters['evictions'] += 1
+
+    def _spill(self, version: DatasetVersion) -> bool:
+        """Move a root's frame to a file; it stays reusable while something else holds it"""
+        try:
+            version.path = write_frame_file(version.frame, self.spill_dir)
+        except Exception:
+            return False
+        self._frames[version.id] = version.frame
+        version.frame = None
+        version.nbytes = version.held_bytes()
+        self._counters['spills'] += 1
+        return True
+
+    def _remove_entry(self, key):
+        entry = self._entries.pop(key)
+        self._release(entry['versions'].values())
+
+    def _release(self, versions):
+        """Delete the spill files of versions no history holds any more"""
+        held = {version.id for entry in self._entries.values() for version in entry['versions'].values()}
+        for version in versions:
+            if version.path is not None and version.id not in held:
+                remove_file(version.path)
+                version.path = None
+
+    def _sweep_expired(self):
+        now = time.time()
+        if now - self._last_sweep < self.SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        try:
+            os.utime(self.spill_dir)
+        except OSError:
+            pass
+        expired = [key for key, entry in self._entries.items() if now - entry['last_access'] > self.ttl_seconds]
+        for key in expired:
+            self._remove_entry(key)
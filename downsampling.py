@@ -0,0 +1,126 @@
+"""
+Downsampling Module
+Visually faithful point reduction for line charts and other x-ordered series
+"""
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+METHODS = ('lttb', 'minmax')
+
+
+def as_numeric(values: pd.Series) -> np.ndarray:
+    """x values as float64 for the geometry: datetimes as nanoseconds, anything non-numeric as its position"""
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return values.to_numpy(dtype='datetime64[ns]').view(np.int64).astype(np.float64)
+    if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.arange(len(values), dtype=np.float64)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of the n_out points kept by Largest-Triangle-Three-Buckets
+    (Steinarsson, 2013): the first and last points, plus from each of
+    n_out - 2 equal-count buckets the point forming the largest triangle
+    with the point kept from the previous bucket and the mean of the next.
+    x must be ascending and neither array may contain NaN.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # Shift x so large offsets (epoch nanoseconds) do not eat the precision of the areas
+    x = x - x[0]
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    bounds = np.append(edges, n)
+    # Mean of every bucket (the last "bucket" is the final point), for use as the next-bucket anchor
+    counts = np.diff(bounds)
+    mean_x = np.add.reduceat(x, bounds[:-1]) / counts
+    mean_y = np.add.reduceat(y, bounds[:-1]) / counts
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - mean_x[i + 1]) * (y[start:end] - ay) - (ax - x[start:end]) * (mean_y[i + 1] - ay))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def minmax(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of the minimum and maximum of each of n_out / 2 equal-count
+    buckets, plus the first and last points. Keeps every spike, which LTTB
+    may smooth over, at the cost of a more jagged line.
+    """
+    n = len(y)
+    buckets = n_out // 2
+    if n_out >= n or buckets < 1:
+        return np.arange(n)
+    bucket = np.arange(n) * buckets // n
+    starts = np.searchsorted(bucket, np.arange(buckets))
+
+    def first_where(mask):
+        positions = np.flatnonzero(mask)
+        _, first = np.unique(bucket[positions], return_index=True)
+        return positions[first]
+
+    lows = first_where(y == np.minimum.reduceat(y, starts)[bucket])
+    highs = first_where(y == np.maximum.reduceat(y, starts)[bucket])
+    return np.unique(np.concatenate([[0, n - 1], lows, highs]))
+
+
+def downsample(x: np.ndarray, y: np.ndarray, n_out: int, method: str = 'lttb') -> np.ndarray:
+    """Ascending indices of at most ~n_out points to draw (all of them when there are no more than n_out)"""
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method: {method} (use one of {', '.join(METHODS)})")
+    if len(x) <= n_out:
+        return np.arange(len(x))
+    return lttb(x, y, n_out) if method == 'lttb' else minmax(x, y, n_out)
+
+
+def downsample_frame(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    n_out: int,
+    method: str = 'lttb',
+    group: str = None
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Rows of df to draw y over x with, in columns x, y and group only:
+    sorted by x (when x is numeric or a date), without rows missing x or
+    y, reduced to about n_out points (split across the groups when a group
+    column is given). Returns the rows and the number of points before
+    reduction.
+    """
+    # Only the columns drawn, so wide frames are not copied whole
+    columns = list(dict.fromkeys([x, y] + ([group] if group is not None else [])))
+    data = df[columns].dropna(subset=[x, y])
+    if not pd.api.types.is_numeric_dtype(data[y].dtype):
+        return data, len(data)
+    x_values = as_numeric(data[x])
+    if pd.api.types.is_datetime64_any_dtype(data[x].dtype) or pd.api.types.is_numeric_dtype(data[x].dtype):
+        order = np.argsort(x_values, kind='stable')
+        data, x_values = data.iloc[order], x_values[order]
+    total = len(data)
+    if total <= n_out:
+        return data, total
+
+    y_values = data[y].to_numpy(dtype=np.float64, na_value=np.nan)
+    if group is None:
+        return data.iloc[downsample(x_values, y_values, n_out, method)], total
+
+    codes = pd.factorize(data[group])[0]
+    groups = np.unique(codes)
+    per_group = max(3, n_out // max(1, len(groups)))
+    keep = []
+    for code in groups:
+        rows = np.flatnonzero(codes == code)
+        keep.append(rows[downsample(x_values[rows], y_values[rows], per_group, method)])
+    return data.iloc[np.sort(np.concatenate(keep))], total
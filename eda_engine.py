@@ -4,136 +4,190 @@ Core exploratory data analysis functionality
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
-from scipy import stats
+from typing import Dict, List, Any, Optional, Union
+
+from config import Config
+from column_profiler import ColumnProfiler
+from outlier_engine import OutlierEngine
 
 
 class EDAEngine:
     """Core engine for automated exploratory data analysis"""
     
-    def __init__(self, df: pd.DataFrame):
+    # Bump whenever the shape or content of EDA results changes (invalidates cached results)
+    VERSION = 2
+    
+    # Bin-width rules accepted by get_distribution_data in place of a bin count
+    BIN_RULES = ('fd', 'sturges', 'auto')
+    
+    def __init__(self, df: Optional[pd.DataFrame], approx: bool = False, profile=None):
+        """
+        approx=True allows sketch-based statistics (see ApproxDatasetProfile).
+        A ready-made profile may be passed instead of a DataFrame (df=None),
+        e.g. a StreamingProfile built from a file too large to load.
+        """
         self.df = df
-        self.numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        self.categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        self.profile = profile if profile is not None else ColumnProfiler.profile(df, approx=approx)
+        self.numeric_cols = self.profile.numeric_cols
+        self.categorical_cols = self.profile.categorical_cols
+    
+    @staticmethod
+    def _rounded(value) -> Optional[float]:
+        """Round a statistic to 4 places, mapping NaN to None"""
+        return round(float(value), 4) if not pd.isna(value) else None
+    
+    def get_error_bounds(self) -> Optional[Dict[str, Any]]:
+        """Error bounds of the approximate statistics, or None when they are exact"""
+        return self.profile.error_bounds if self.profile.approximate else None
     
     def get_descriptive_statistics(self) -> Dict[str, Any]:
         """Generate comprehensive descriptive statistics"""
         stats_dict = {}
+        profile = self.profile
         
         # Numeric statistics
-        if self.numeric_cols:
-            numeric_stats = self.df[self.numeric_cols].describe().to_dict()
-            
-            # Add additional statistics
-            for col in self.numeric_cols:
-                if col not in stats_dict:
-                    stats_dict[col] = {}
-                stats_dict[col] = {
-                    'count': int(self.df[col].count()),
-                    'mean': round(float(self.df[col].mean()), 4) if not pd.isna(self.df[col].mean()) else None,
-                    'std': round(float(self.df[col].std()), 4) if not pd.isna(self.df[col].std()) else None,
-                    'min': round(float(self.df[col].min()), 4) if not pd.isna(self.df[col].min()) else None,
-                    'max': round(float(self.df[col].max()), 4) if not pd.isna(self.df[col].max()) else None,
-                    'median': round(float(self.df[col].median()), 4) if not pd.isna(self.df[col].median()) else None,
-                    'skewness': round(float(self.df[col].skew()), 4) if not pd.isna(self.df[col].skew()) else None,
-                    'kurtosis': round(float(self.df[col].kurtosis()), 4) if not pd.isna(self.df[col].kurtosis()) else None,
-                    'q1': round(float(self.df[col].quantile(0.25)), 4),
-                    'q3': round(float(self.df[col].quantile(0.75)), 4),
-                    'iqr': round(float(self.df[col].quantile(0.75) - self.df[col].quantile(0.25)), 4),
-                    'missing': int(self.df[col].isnull().sum()),
-                    'unique': int(self.df[col].nunique())
-                }
+        for col in self.numeric_cols:
+            col_stats = profile.numeric_stats.loc[col]
+            stats_dict[col] = {
+                'count': int(col_stats['count']),
+                'mean': self._rounded(col_stats['mean']),
+                'std': self._rounded(col_stats['std']),
+                'min': self._rounded(col_stats['min']),
+                'max': self._rounded(col_stats['max']),
+                'median': self._rounded(col_stats['median']),
+                'skewness': self._rounded(col_stats['skew']),
+                'kurtosis': self._rounded(col_stats['kurtosis']),
+                'q1': round(float(col_stats['q1']), 4),
+                'q3': round(float(col_stats['q3']), 4),
+                'iqr': round(float(col_stats['q3'] - col_stats['q1']), 4),
+                'missing': int(profile.null_counts[col]),
+                'unique': int(profile.unique_counts[col])
+            }
         
         # Categorical statistics
         for col in self.categorical_cols:
+            top = profile.top_value(col)
             stats_dict[col] = {
-                'count': int(self.df[col].count()),
-                'unique': int(self.df[col].nunique()),
-                'top': str(self.df[col].mode().iloc[0]) if not self.df[col].mode().empty else None,
-                'freq': int(self.df[col].value_counts().iloc[0]) if len(self.df[col].value_counts()) > 0 else 0,
-                'missing': int(self.df[col].isnull().sum())
+                'count': profile.n_rows - int(profile.null_counts[col]),
+                'unique': int(profile.unique_counts[col]),
+                'top': str(top) if top is not None else None,
+                'freq': profile.top_frequency(col),
+                'missing': int(profile.null_counts[col])
             }
         
         return stats_dict
     
     def get_missing_value_analysis(self) -> Dict[str, Any]:
         """Analyze missing values in the dataset"""
-        missing_count = self.df.isnull().sum()
-        missing_percent = (missing_count / len(self.df) * 100).round(2)
+        missing_count = self.profile.null_counts
+        missing_percent = (missing_count / self.profile.n_rows * 100).round(2)
         
         return {
             'total_missing': int(missing_count.sum()),
-            'total_cells': int(self.df.size),
-            'missing_percentage': round(float(missing_count.sum() / self.df.size * 100), 2),
+            'total_cells': self.profile.size,
+            'missing_percentage': round(float(missing_count.sum() / self.profile.size * 100), 2),
             'by_column': {
                 col: {
                     'count': int(missing_count[col]),
                     'percentage': float(missing_percent[col])
                 }
-                for col in self.df.columns
+                for col in self.profile.columns
             },
-            'columns_with_missing': [col for col in self.df.columns if missing_count[col] > 0]
+            'columns_with_missing': [col for col in self.profile.columns if missing_count[col] > 0]
         }
     
-    def get_correlation_matrix(self) -> Dict[str, Any]:
-        """Calculate correlation matrix for numeric columns"""
+    def get_correlation_matrix(self, threshold: float = None, top_k: int = None) -> Dict[str, Any]:
+        """
+        Correlation matrix of the numeric columns, as rows in the order of
+        'columns' (None where undefined), and the pairs with |r| >= threshold
+        (default Config.STRONG_CORRELATION_THRESHOLD): all of them in column
+        order, or with top_k only the k strongest, strongest first
+        """
+        threshold = Config.STRONG_CORRELATION_THRESHOLD if threshold is None else threshold
+        top_k = Config.STRONG_CORRELATION_TOP_K if top_k is None else top_k
         if not self.numeric_cols:
-            return {'matrix': {}, 'columns': []}
+            return {'matrix': [], 'columns': [], 'strong_correlations': [], 'threshold': threshold}
         
-        corr_matrix = self.df[self.numeric_cols].corr().round(4)
+        if self.df is None:
+            # Profiles built without a DataFrame carry their own correlation matrix
+            corr_matrix = self.profile.correlation.round(4)
+        else:
+            corr_matrix = ColumnProfiler.correlation(self.df, approx=self.profile.approximate).round(4)
+        values = corr_matrix.to_numpy(dtype=np.float64)
+        
+        # Strong pairs from the upper triangle, row by row (NaN never passes)
+        rows, cols = np.triu_indices(len(values), k=1)
+        pair_values = values[rows, cols]
+        strong = np.flatnonzero(np.abs(pair_values) >= threshold)
+        if top_k and len(strong) > top_k:
+            strong = strong[np.argsort(-np.abs(pair_values[strong]), kind='stable')[:top_k]]
         
-        # Find strong correlations
-        strong_correlations = []
-        for i, col1 in enumerate(self.numeric_cols):
-            for j, col2 in enumerate(self.numeric_cols):
-                if i < j:
-                    corr_val = corr_matrix.loc[col1, col2]
-                    if abs(corr_val) >= 0.7:
-                        strong_correlations.append({
-                            'column1': col1,
-                            'column2': col2,
-                            'correlation': float(corr_val),
-                            'strength': 'Strong Positive' if corr_val > 0 else 'Strong Negative'
-                        })
+        columns = corr_matrix.columns.tolist()
+        strong_correlations = [
+            {
+                'column1': columns[rows[i]],
+                'column2': columns[cols[i]],
+                'correlation': float(pair_values[i]),
+                'strength': 'Strong Positive' if pair_values[i] > 0 else 'Strong Negative'
+            }
+            for i in strong
+        ]
         
         return {
-            'matrix': corr_matrix.to_dict(),
+            'matrix': np.where(np.isnan(values), None, values).tolist(),
             'columns': self.numeric_cols,
-            'strong_correlations': strong_correlations
+            'strong_correlations': strong_correlations,
+            'threshold': threshold
         }
     
-    def detect_outliers(self, method: str = 'iqr') -> Dict[str, Any]:
-        """Detect outliers in numeric columns"""
-        outliers = {}
-        
-        for col in self.numeric_cols:
-            if method == 'iqr':
-                Q1 = self.df[col].quantile(0.25)
-                Q3 = self.df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                outlier_mask = (self.df[col] < lower_bound) | (self.df[col] > upper_bound)
-            elif method == 'zscore':
-                z_scores = np.abs(stats.zscore(self.df[col].dropna()))
-                outlier_mask = z_scores > 3
-            else:
-                continue
-            
-            outlier_count = int(outlier_mask.sum())
-            outliers[col] = {
-                'count': outlier_count,
-                'percentage': round(float(outlier_count / len(self.df) * 100), 2),
-                'lower_bound': round(float(lower_bound), 4) if method == 'iqr' else None,
-                'upper_bound': round(float(upper_bound), 4) if method == 'iqr' else None
-            }
+    def detect_outliers(self, method: str = 'iqr', include_indices: bool = False) -> Dict[str, Any]:
+        """
+        Detect outliers in numeric columns by one of OutlierEngine.METHODS
+        ('iqr', 'zscore', 'mad', 'percentile'); include_indices adds the
+        index labels of flagged rows
+        """
+        return OutlierEngine(self.df, self.profile).detect(method, include_indices)
+    
+    def histogram_bin_count(self, column: str, bins: Union[int, str] = 30) -> int:
+        """
+        Number of equal-width bins for a numeric column: bins itself when it
+        is an int, else picked by a rule from the profile's count, range and
+        quartiles (no pass over the data), capped at Config.HISTOGRAM_MAX_BINS:
+          'sturges' - log2(n) + 1, for roughly normal data
+          'fd'      - Freedman-Diaconis width 2 * IQR / n^(1/3), robust to outliers
+          'auto'    - the larger of the two (as numpy's 'auto')
+        """
+        if not isinstance(bins, str):
+            if int(bins) < 1:
+                raise ValueError("bins must be a positive integer")
+            return int(bins)
+        if bins not in self.BIN_RULES:
+            raise ValueError(f"Unknown bin rule: {bins} (use a number or one of {', '.join(self.BIN_RULES)})")
         
-        return outliers
+        col_stats = self.profile.numeric_stats.loc[column]
+        n = int(col_stats['count'])
+        if n == 0:
+            return 1
+        sturges = int(np.ceil(np.log2(n))) + 1
+        span = col_stats['max'] - col_stats['min']
+        width = 2 * (col_stats['q3'] - col_stats['q1']) / np.cbrt(n)
+        # FD degenerates when most values are equal (IQR 0); fall back to Sturges then
+        fd = int(np.ceil(span / width)) if width > 0 and np.isfinite(span) else sturges
+        count = {'sturges': sturges, 'fd': fd, 'auto': max(fd, sturges)}[bins]
+        return max(1, min(count, Config.HISTOGRAM_MAX_BINS))
     
-    def get_distribution_data(self, column: str, bins: int = 30) -> Dict[str, Any]:
-        """Get distribution data for a column"""
+    def get_distribution_data(self, column: str, bins: Union[int, str] = 30) -> Dict[str, Any]:
+        """
+        Get distribution data for a column. Numeric columns are binned here
+        (bins: a count or a rule, see histogram_bin_count), so the payload
+        grows with the number of bins, not rows.
+        """
         if column in self.numeric_cols:
-            hist, bin_edges = np.histogram(self.df[column].dropna(), bins=bins)
+            bins = self.histogram_bin_count(column, bins)
+            if self.df is None:
+                hist, bin_edges = self.profile.histograms[column].histogram(bins)
+            else:
+                hist, bin_edges = np.histogram(self.df[column].dropna(), bins=bins)
             return {
                 'type': 'numeric',
                 'histogram': {
@@ -141,13 +195,13 @@ class EDAEngine:
                     'bin_edges': bin_edges.tolist()
                 },
                 'stats': {
-                    'mean': float(self.df[column].mean()),
-                    'median': float(self.df[column].median()),
-                    'std': float(self.df[column].std())
+                    'mean': float(self.profile.numeric_stats.at[column, 'mean']),
+                    'median': float(self.profile.numeric_stats.at[column, 'median']),
+                    'std': float(self.profile.numeric_stats.at[column, 'std'])
                 }
             }
         elif column in self.categorical_cols:
-            value_counts = self.df[column].value_counts().head(20)
+            value_counts = self.profile.value_counts[column].head(20)
             return {
                 'type': 'categorical',
                 'value_counts': {
@@ -159,7 +213,7 @@ class EDAEngine:
     
     def get_group_by_analysis(self, group_col: str, agg_col: str, agg_func: str = 'mean') -> Dict[str, Any]:
         """Perform group-by analysis"""
-        if group_col not in self.df.columns or agg_col not in self.numeric_cols:
+        if self.df is None or group_col not in self.df.columns or agg_col not in self.numeric_cols:
             return {}
         
         agg_funcs = {
@@ -174,7 +228,12 @@ class EDAEngine:
         if agg_func not in agg_funcs:
             agg_func = 'mean'
         
-        grouped = self.df.groupby(group_col)[agg_col].agg(agg_funcs[agg_func]).reset_index()
+        values = self.df[agg_col]
+        if values.dtype.kind == 'f':
+            # Aggregate downcast float32 columns in float64, as they were read
+            values = values.astype('float64')
+        # observed=True: categorical groups without rows are left out
+        grouped = values.groupby(self.df[group_col], observed=True).agg(agg_funcs[agg_func]).reset_index()
         grouped = grouped.sort_values(agg_col, ascending=False).head(20)
         
         return {
@@ -192,13 +251,13 @@ class EDAEngine:
             'type': 'info',
             'icon': 'database',
             'title': 'Dataset Overview',
-            'description': f"The dataset contains {len(self.df):,} rows and {len(self.df.columns)} columns, with {len(self.numeric_cols)} numeric and {len(self.categorical_cols)} categorical features."
+            'description': f"The dataset contains {self.profile.n_rows:,} rows and {self.profile.n_cols} columns, with {len(self.numeric_cols)} numeric and {len(self.categorical_cols)} categorical features."
         })
         
         # Missing values insight
-        missing_total = self.df.isnull().sum().sum()
+        missing_total = self.profile.null_counts.sum()
         if missing_total > 0:
-            missing_pct = round(missing_total / self.df.size * 100, 2)
+            missing_pct = round(missing_total / self.profile.size * 100, 2)
             insights.append({
                 'type': 'warning',
                 'icon': 'alert-triangle',
@@ -238,7 +297,7 @@ class EDAEngine:
         
         # Distribution insights
         for col in self.numeric_cols[:3]:
-            skewness = self.df[col].skew()
+            skewness = self.profile.numeric_stats.at[col, 'skew']
             if abs(skewness) > 1:
                 skew_type = 'positively' if skewness > 0 else 'negatively'
                 insights.append({
@@ -250,8 +309,8 @@ class EDAEngine:
         
         # Unique values insight for categorical
         for col in self.categorical_cols[:2]:
-            unique_count = self.df[col].nunique()
-            if unique_count == len(self.df):
+            unique_count = int(self.profile.unique_counts[col])
+            if unique_count == self.profile.n_rows:
                 insights.append({
                     'type': 'info',
                     'icon': 'key',
@@ -259,7 +318,7 @@ class EDAEngine:
                     'description': f"'{col}' has all unique values. This might be an identifier column."
                 })
             elif unique_count <= 5:
-                top_vals = self.df[col].value_counts().head(3)
+                top_vals = self.profile.value_counts[col].head(3)
                 vals_str = ', '.join([f"{v}: {c}" for v, c in top_vals.items()])
                 insights.append({
                     'type': 'info',
@@ -0,0 +1,123 @@
+"""
+Fast JSON Module
+Flask JSON provider that encodes numpy and pandas values directly
+"""
+import base64
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: the standard library encoder is used instead
+    orjson = None
+
+
+# Element types a typed-array spec may carry (those of JavaScript typed arrays Plotly.js accepts)
+TYPED_ARRAY_DTYPES = ('i1', 'u1', 'i2', 'u2', 'i4', 'u4', 'f4', 'f8')
+
+
+def typed_array(values: np.ndarray, float32: bool = False, min_size: int = 0) -> Optional[dict]:
+    """
+    Numeric array as {'dtype', 'bdata'[, 'shape']}: little-endian bytes in
+    base64, decoded on the client into a JavaScript typed array (see
+    decodeTypedArray in charts.js). Integers keep their width where a typed
+    array allows it (64-bit ones narrow to int32 when they fit); missing
+    values are NaN. float32=True halves float payloads at ~7 significant
+    digits. None for non-numeric or shorter-than-min_size arrays.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind not in 'iuf' or values.size < min_size or values.ndim > 2:
+        return None
+    if values.dtype.kind in 'iu' and values.dtype.itemsize == 8:
+        info = np.iinfo(np.int32)
+        fits = values.size == 0 or (values.min() >= info.min and values.max() <= info.max)
+        values = values.astype(np.int32) if fits else values.astype(np.float64)
+    elif values.dtype.kind == 'f':
+        values = values.astype(np.float32 if float32 or values.dtype.itemsize <= 4 else np.float64, copy=False)
+    dtype = values.dtype.newbyteorder('<')
+    spec = {
+        'dtype': dtype.str[1:],
+        'bdata': base64.b64encode(np.ascontiguousarray(values, dtype=dtype).tobytes()).decode('ascii')
+    }
+    if values.ndim == 2:
+        spec['shape'] = list(values.shape)
+    return spec
+
+
+def encode_default(obj: Any) -> Any:
+    """
+    JSON-compatible stand-in for values the encoder has no native support for:
+    numpy scalars and arrays, pandas Series/Index/DataFrame, NaT and NA
+    (missing values become null). Anything else gets Flask's handling.
+    """
+    if isinstance(obj, np.ndarray):
+        # orjson only takes contiguous arrays of native numeric/bool dtypes itself
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, (pd.Series, pd.Index)):
+        values = obj.to_numpy()
+        return values if values.dtype.kind in 'iufb' else obj.tolist()
+    if isinstance(obj, pd.DataFrame):
+        # Same shape as DataFrame.to_dict(): {column: {index: value}}
+        return {str(col): dict(zip(map(str, obj.index), obj[col].tolist())) for col in obj.columns}
+    if isinstance(obj, pd.Timedelta):
+        return str(obj)
+    return DefaultJSONProvider.default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    jsonify/app.json backed by orjson when it is installed: numpy arrays are
+    written straight from their buffers and NaN/inf become null. Keys are
+    sorted and non-string keys stringified, as with the default provider.
+    Without orjson this behaves like the default provider plus numpy/pandas
+    support.
+    """
+
+    default = staticmethod(encode_default)
+
+    def dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        """Serialize to UTF-8 bytes, skipping the str round trip where possible"""
+        if orjson is None:
+            dump_args = {'indent': 2} if indent else {'separators': (',', ':')}
+            return super().dumps(obj, **dump_args).encode('utf-8')
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def _indented(self) -> bool:
+        """Whether responses are pretty-printed (same rule as the default provider)"""
+        return (self.compact is None and self._app.debug) or self.compact is False
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj, self._indented()) + b'\n', mimetype=self.mimetype)
+
+    def spliced_response(self, **encoded: Any):
+        """
+        Response for an object whose members are already JSON text, e.g.
+        spliced_response(chart=fig.to_json()) for {"chart": <figure>}.
+        The text is spliced in as-is instead of being parsed and re-serialized.
+        """
+        members = b','.join(self.dumps_bytes(key) + b':' + (text.encode('utf-8') if isinstance(text, str) else text)
+                            for key, text in encoded.items())
+        return self._app.response_class(b'{' + members + b'}\n', mimetype=self.mimetype)
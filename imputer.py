@@ -0,0 +1,118 @@
+"""
+Imputer Module
+Fill values for the missing cells of many columns, worked out and applied in one batch
+"""
+from typing import Dict, Any, Optional, Tuple
+
+import pandas as pd
+
+from column_profiler import DatasetProfile
+
+
+class Imputer:
+    """
+    Mean, median, mode or constant imputation of a frame's columns.
+    Means and medians of numeric columns come from one float64 reduction
+    over all of them (filling a float32 column makes it float64); with a
+    profile of the same rows, float64 means and medians and string value
+    counts are taken from it instead of being recomputed.
+    The fill values are applied with a single fillna.
+    """
+
+    STRATEGIES = ('fill_mean', 'fill_median', 'fill_mode', 'fill_value')
+
+    @classmethod
+    def fill_values(
+        cls,
+        df: pd.DataFrame,
+        strategy: str,
+        fill_value: Any = None,
+        profile: Optional[DatasetProfile] = None
+    ) -> Dict[Any, Any]:
+        """
+        Fill value per column, as the strategy would compute it column by
+        column (Series.mean / median / mode().iloc[0]). Columns without one
+        (non-numeric for mean and median, nothing but missing values) are left out.
+        """
+        if strategy not in cls.STRATEGIES:
+            raise ValueError(f"Unknown imputation strategy: {strategy} (use one of {', '.join(cls.STRATEGIES)})")
+        if strategy == 'fill_value':
+            return dict.fromkeys(df.columns, fill_value)
+        if strategy == 'fill_mode':
+            values = {}
+            for col in df.columns:
+                mode = cls._mode(df[col], profile.value_counts.get(col) if profile is not None else None)
+                if mode is not None:
+                    values[col] = mode
+            return values
+
+        stat = 'mean' if strategy == 'fill_mean' else 'median'
+        numeric = [
+            col for col, dtype in df.dtypes.items()
+            if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+        ]
+        values = {}
+        if profile is not None:
+            for col in numeric:
+                if df[col].dtype == 'float64' and col in profile.numeric_stats.index:
+                    values[col] = profile.numeric_stats.at[col, stat]
+        rest = [col for col in numeric if col not in values]
+        if rest:
+            # In float64 whatever the storage width, so downcast columns get the same statistic
+            values.update(getattr(df[rest].astype('float64'), stat)().to_dict())
+        return {col: value for col, value in values.items() if not pd.isna(value)}
+
+    @classmethod
+    def impute(
+        cls,
+        df: pd.DataFrame,
+        strategy: str,
+        fill_value: Any = None,
+        profile: Optional[DatasetProfile] = None
+    ) -> Tuple[pd.DataFrame, Dict[Any, Any]]:
+        """
+        The columns of df that get a fill value, imputed, and the fill values.
+        One fillna over all of them: with the dict of values, or with the
+        constant itself (filled block by block) for fill_value.
+        """
+        values = cls.fill_values(df, strategy, fill_value, profile)
+        if strategy != 'fill_value':
+            df = df[list(values)]
+        if strategy in ('fill_mean', 'fill_median'):
+            df = cls._widen_floats(df)
+        df = cls._with_categories(df, values)
+        if strategy == 'fill_value':
+            return df.fillna(fill_value), values
+        return df.fillna(values), values
+
+    @staticmethod
+    def _widen_floats(df: pd.DataFrame) -> pd.DataFrame:
+        """df with float32 (or narrower) columns as float64, to hold a float64 mean or median exactly"""
+        narrow = {col: 'float64' for col, dtype in df.dtypes.items() if dtype.kind == 'f' and dtype.itemsize < 8}
+        return df.astype(narrow) if narrow else df
+
+    @staticmethod
+    def _with_categories(df: pd.DataFrame, values: Dict[Any, Any]) -> pd.DataFrame:
+        """df with each categorical column's fill value added to its categories, where it is new"""
+        new = [
+            col for col, value in values.items()
+            if isinstance(df[col].dtype, pd.CategoricalDtype) and not pd.isna(value)
+            and value not in df[col].cat.categories
+        ]
+        if not new:
+            return df
+        df = df.copy(deep=False)
+        for col in new:
+            df[col] = df[col].cat.add_categories([values[col]])
+        return df
+
+    @staticmethod
+    def _mode(col: pd.Series, counts: Optional[pd.Series] = None) -> Any:
+        """Series.mode().iloc[0] (the smallest most frequent value), from value counts when given"""
+        if counts is None:
+            counts = col.value_counts()
+        if counts.empty or counts.max() == 0:
+            return None
+        tied = counts.index[counts == counts.max()]
+        # Series.mode orders tied values the same way on the values themselves
+        return tied[0] if len(tied) == 1 else pd.Series(tied).mode().iloc[0]
@@ -0,0 +1,138 @@
+"""
+Outlier Engine Module
+Rule-based outlier detection over all numeric columns at once
+"""
+from typing import Dict, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from column_profiler import DatasetProfile
+
+
+class OutlierEngine:
+    """
+    Outlier fences for every numeric column from one rule, and the values
+    outside them counted (and optionally located) in column blocks:
+      'iqr'        - Tukey fences Q1 - 1.5 IQR / Q3 + 1.5 IQR (the profile's, counts included)
+      'zscore'     - mean +/- OUTLIER_ZSCORE_THRESHOLD population standard deviations
+      'mad'        - modified z-score |0.6745 (x - median) / MAD| > OUTLIER_MAD_THRESHOLD
+      'percentile' - outside the OUTLIER_PERCENTILES range
+    Mean, standard deviation, median and quartiles are the profile's, i.e.
+    the same figures the descriptive statistics report.
+    """
+
+    METHODS = ('iqr', 'zscore', 'mad', 'percentile')
+
+    def __init__(self, df: Optional[pd.DataFrame], profile: DatasetProfile):
+        """df may be None for profiles built without one; only 'iqr' counts are available then"""
+        self.df = df
+        self.profile = profile
+        self.numeric_cols = profile.numeric_cols
+
+    def _blocks(self):
+        """Numeric columns as float64 matrices of at most STATS_BLOCK_CELLS cells, with their positions"""
+        n_rows = max(1, self.profile.n_rows)
+        step = max(1, DatasetProfile.STATS_BLOCK_CELLS // n_rows)
+        for start in range(0, len(self.numeric_cols), step):
+            cols = self.numeric_cols[start:start + step]
+            yield start, self.df[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def _column_quantiles(self, quantiles) -> np.ndarray:
+        """Per-column quantiles (linear interpolation, as pandas), one row per quantile"""
+        result = np.full((len(quantiles), len(self.numeric_cols)), np.nan)
+        for start, values in self._blocks():
+            with np.errstate(invalid='ignore'):
+                if values.shape[0]:
+                    result[:, start:start + values.shape[1]] = np.nanquantile(values, quantiles, axis=0)
+        return result
+
+    def bounds(self, method: str = 'iqr') -> pd.DataFrame:
+        """Lower and upper fence per numeric column (NaN where a rule is undefined)"""
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown outlier method: {method} (use one of {', '.join(self.METHODS)})")
+        stats = self.profile.numeric_stats
+        if method == 'iqr':
+            return self.profile.iqr_outliers[['lower', 'upper']]
+
+        if method == 'zscore':
+            count = stats['count'].to_numpy(dtype=np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # Population standard deviation, as scipy.stats.zscore
+                std = stats['std'].to_numpy(dtype=np.float64) * np.sqrt((count - 1) / count)
+            center, spread = stats['mean'].to_numpy(dtype=np.float64), Config.OUTLIER_ZSCORE_THRESHOLD * std
+        elif method == 'mad':
+            if self.df is None:
+                raise ValueError("Without the data only 'iqr' outlier counts are available")
+            center = stats['median'].to_numpy(dtype=np.float64)
+            mad = np.full(len(self.numeric_cols), np.nan)
+            for start, values in self._blocks():
+                with np.errstate(invalid='ignore'):
+                    if values.shape[0]:
+                        mad[start:start + values.shape[1]] = np.nanmedian(
+                            np.abs(values - center[start:start + values.shape[1]]), axis=0
+                        )
+            # No spread around the median: the rule is undefined, nothing is flagged
+            spread = np.where(mad > 0, Config.OUTLIER_MAD_THRESHOLD * mad / 0.6745, np.nan)
+        else:
+            if self.df is None:
+                raise ValueError("Without the data only 'iqr' outlier counts are available")
+            low, high = (p / 100 for p in Config.OUTLIER_PERCENTILES)
+            lower, upper = self._column_quantiles([low, high])
+            return pd.DataFrame({'lower': lower, 'upper': upper}, index=stats.index)
+
+        return pd.DataFrame({'lower': center - spread, 'upper': center + spread}, index=stats.index)
+
+    def detect(self, method: str = 'iqr', include_indices: bool = False) -> Dict[str, Any]:
+        """
+        Per numeric column: outlier count and percentage of rows, the
+        fences, and with include_indices the index labels of up to
+        Config.OUTLIER_MAX_INDICES flagged rows (for drill-down)
+        """
+        fences = self.bounds(method)
+        n_rows = self.profile.n_rows
+        if method == 'iqr' and not include_indices:
+            counts = self.profile.iqr_outliers['count'].to_numpy()
+            indices = None
+        elif self.df is None:
+            raise ValueError("Without the data only 'iqr' outlier counts are available")
+        else:
+            counts, indices = self._flag(fences, include_indices)
+
+        outliers = {}
+        for i, col in enumerate(self.numeric_cols):
+            lower, upper = fences.iat[i, 0], fences.iat[i, 1]
+            outliers[col] = {
+                'count': int(counts[i]),
+                'percentage': round(float(counts[i] / n_rows * 100), 2) if n_rows else 0.0,
+                'lower_bound': round(float(lower), 4) if not pd.isna(lower) else None,
+                'upper_bound': round(float(upper), 4) if not pd.isna(upper) else None
+            }
+            if indices is not None:
+                outliers[col]['indices'] = indices[i]
+        return outliers
+
+    def total_count(self, method: str = 'iqr') -> int:
+        """Outlying values over all numeric columns"""
+        if method == 'iqr':
+            return int(self.profile.iqr_outliers['count'].sum())
+        counts, _ = self._flag(self.bounds(method), False)
+        return int(counts.sum())
+
+    def _flag(self, fences: pd.DataFrame, include_indices: bool):
+        """Values outside the fences (NaN fences flag nothing): counts per column, and flagged row labels"""
+        lower = fences['lower'].to_numpy(dtype=np.float64)
+        upper = fences['upper'].to_numpy(dtype=np.float64)
+        counts = np.zeros(len(self.numeric_cols), dtype=np.int64)
+        indices = [] if include_indices else None
+        for start, values in self._blocks():
+            end = start + values.shape[1]
+            with np.errstate(invalid='ignore'):
+                mask = (values < lower[start:end]) | (values > upper[start:end])
+            counts[start:end] = mask.sum(axis=0)
+            if include_indices:
+                for j in range(mask.shape[1]):
+                    rows = np.flatnonzero(mask[:, j])[:Config.OUTLIER_MAX_INDICES]
+                    indices.append(self.df.index[rows].tolist())
+        return counts, indices
@@ -0,0 +1,199 @@
+"""
+Result Cache Module
+Bounded in-process cache of serialized API payloads
+"""
+import atexit
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+
+class ResultCache:
+    """
+    LRU cache of response payloads (bytes) bounded by total size.
+    Keys embed whatever identifies the result (dataset fingerprint, engine
+    version, parameters), so a changed dataset simply stops hitting its old
+    entries; tags let callers drop those stale entries eagerly.
+    With a spill_dir, entries evicted from memory are written there (up to
+    spill_max_bytes, least recently used files removed first) and moved
+    back into memory when hit again. Each cache spills into its own
+    subdirectory of spill_dir, removed at exit, so worker processes sharing
+    spill_dir never touch each other's files; subdirectories left unchanged
+    for STALE_SPILL_SECONDS (by processes that died) are removed on start.
+    """
+
+    EXTENSION = '.payload'
+
+    # Age (seconds) past which another process's spill files count as leftovers
+    STALE_SPILL_SECONDS = 24 * 60 * 60
+
+    def __init__(self, max_bytes: int, spill_dir: Optional[str] = None, spill_max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (payload, tags)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0, 'not_modified': 0,
+                          'spills': 0, 'spill_hits': 0}
+
+        self.spill_dir = spill_dir if spill_dir and spill_max_bytes > 0 else None
+        self.spill_max_bytes = spill_max_bytes
+        self._spilled = OrderedDict()  # key -> (path, size, tags)
+        self._spilled_bytes = 0
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self._remove_stale_spills(self.spill_dir)
+            self.spill_dir = os.path.join(self.spill_dir, uuid.uuid4().hex)
+            os.makedirs(self.spill_dir)
+            atexit.register(shutil.rmtree, self.spill_dir, True)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached payload for a key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return entry[0]
+            spilled = self._spilled.pop(key, None)
+            if spilled is None:
+                self._counters['misses'] += 1
+                return None
+            self._spilled_bytes -= spilled[1]
+
+        path, _, tags = spilled
+        try:
+            with open(path, 'rb') as f:
+                payload = f.read()
+        except OSError:
+            with self._lock:
+                self._counters['misses'] += 1
+            return None
+        self._remove(path)
+        with self._lock:
+            self._counters['hits'] += 1
+            self._counters['spill_hits'] += 1
+        self.put(key, payload, tags)
+        return payload
+
+    def put(self, key: str, payload: bytes, tags: Iterable[str] = ()):
+        """Store a payload, evicting least recently used entries past max_bytes"""
+        if len(payload) > self.max_bytes:
+            return
+        evicted = []
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[0])
+            stale = self._spilled.pop(key, None)
+            if stale is not None:
+                self._spilled_bytes -= stale[1]
+            self._entries[key] = (payload, frozenset(tags))
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes:
+                evicted_key, (evicted_payload, evicted_tags) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted_payload)
+                self._counters['evictions'] += 1
+                evicted.append((evicted_key, evicted_payload, evicted_tags))
+        if stale is not None:
+            self._remove(stale[0])
+        if self.spill_dir:
+            self._spill(evicted)
+
+    def invalidate(self, tag: str) -> int:
+        """Drop every entry carrying a tag, in memory or spilled; returns how many were removed"""
+        with self._lock:
+            stale = [key for key, (_, tags) in self._entries.items() if tag in tags]
+            for key in stale:
+                payload, _ = self._entries.pop(key)
+                self._bytes -= len(payload)
+            stale_files = [key for key, (_, _, tags) in self._spilled.items() if tag in tags]
+            paths = []
+            for key in stale_files:
+                path, size, _ = self._spilled.pop(key)
+                self._spilled_bytes -= size
+                paths.append(path)
+            self._counters['invalidations'] += len(stale) + len(stale_files)
+        for path in paths:
+            self._remove(path)
+        return len(stale) + len(stale_files)
+
+    def record_not_modified(self):
+        """Count a request answered with 304 from its ETag alone"""
+        with self._lock:
+            self._counters['not_modified'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio and cached bytes"""
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'spilled_entries': len(self._spilled),
+                'spilled_bytes': self._spilled_bytes,
+                'spill_max_bytes': self.spill_max_bytes if self.spill_dir else 0,
+                'hit_ratio': round(self._counters['hits'] / lookups, 4) if lookups else None,
+                **self._counters
+            }
+
+    def _spill(self, evicted: List[Tuple[str, bytes, frozenset]]):
+        """Write entries evicted from memory to the spill directory, trimming it to spill_max_bytes"""
+        for key, payload, tags in evicted:
+            if len(payload) > self.spill_max_bytes:
+                continue
+            path = os.path.join(self.spill_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + self.EXTENSION)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except OSError:
+                self._remove(tmp_path)
+                continue
+
+            removed = []
+            with self._lock:
+                if key in self._entries:
+                    # Stored again while being written out; the file is already stale
+                    removed.append(path)
+                else:
+                    old = self._spilled.pop(key, None)
+                    if old is not None:
+                        self._spilled_bytes -= old[1]
+                    self._spilled[key] = (path, len(payload), tags)
+                    self._spilled_bytes += len(payload)
+                    self._counters['spills'] += 1
+                    while self._spilled_bytes > self.spill_max_bytes:
+                        _, (old_path, size, _) = self._spilled.popitem(last=False)
+                        self._spilled_bytes -= size
+                        removed.append(old_path)
+            for old_path in removed:
+                self._remove(old_path)
+
+    def _remove_stale_spills(self, spill_root: str):
+        cutoff = time.time() - self.STALE_SPILL_SECONDS
+        for name in os.listdir(spill_root):
+            path = os.path.join(spill_root, name)
+            try:
+                if os.path.getmtime(path) >= cutoff:
+                    continue
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                elif name.endswith(self.EXTENSION):
+                    self._remove(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,100 @@
+"""
+Row Index Module
+64-bit row hashes behind duplicate counts, duplicate removal and appends
+"""
+import numbers
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def hash_rows(df: pd.DataFrame, subset: Optional[List[str]] = None) -> np.ndarray:
+    """
+    One uint64 hash per row over all columns (or the subset), independent of
+    the index. Rows that compare equal hash equal, and only those, as
+    DataFrame.duplicated sees them: negative zeros are hashed as zeros, and
+    values of object columns that are not strings are hashed with their type
+    (hash_pandas_object hashes 1, '1' and True alike).
+    """
+    frame = df if subset is None else df[subset]
+    if not len(frame.columns):
+        return np.zeros(len(frame), dtype=np.uint64)
+    replaced = {}
+    for j, dtype in enumerate(frame.dtypes):
+        col = frame.iloc[:, j]
+        if pd.api.types.is_float_dtype(dtype) and _has_negative_zero(col):
+            replaced[j] = col + 0.0
+        elif dtype == object or isinstance(dtype, pd.CategoricalDtype):
+            tagged = _type_tagged(col)
+            if tagged is not None:
+                replaced[j] = tagged
+    if replaced:
+        frame = frame.copy(deep=False)
+        for j, values in replaced.items():
+            frame.isetitem(j, values)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def _has_negative_zero(col: pd.Series) -> bool:
+    # Plain float columns as a view; nullable Float64 needs its missing values filled in
+    values = col.to_numpy() if isinstance(col.dtype, np.dtype) else col.to_numpy(dtype=np.float64, na_value=np.nan)
+    return bool(np.signbit(values[values == 0]).any())
+
+
+def _type_tagged(col: pd.Series) -> Optional[pd.Series]:
+    """
+    An object or categorical column with its values other than strings and
+    NaN as tagged strings, None when there are none. Equal numbers (1, 1.0,
+    True) get the same tag; nothing else equals a string.
+    """
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        categories = col.cat.categories
+        if categories.dtype != object or pd.api.types.infer_dtype(categories) == 'string':
+            return None
+        tagged = pd.Index([_tag(value) for value in categories], dtype=object)
+        return pd.Series(pd.Categorical.from_codes(col.cat.codes, tagged), index=col.index)
+    values = col.to_numpy()
+    if pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty'):
+        # Only missing values other than NaN (None, NaT) need a tag among strings
+        missing = pd.isna(values)
+        if all(type(value) is float for value in values[missing]):
+            return None
+        values = values.copy()
+        values[missing] = [_missing_tag(value) for value in values[missing]]
+        return pd.Series(values, index=col.index, dtype=object)
+    return pd.Series([_tag(value) for value in values], index=col.index, dtype=object)
+
+
+def _tag(value):
+    if isinstance(value, str):
+        return value
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return _missing_tag(value)
+    if isinstance(value, numbers.Real):
+        if float(value).is_integer():
+            return f"\0number:{int(value)}"
+        if isinstance(value, (float, np.floating)):
+            return f"\0number:{float(value)!r}"
+    return f"\0{type(value).__name__}:{value!r}"
+
+
+def _missing_tag(value):
+    # DataFrame.duplicated tells missing values apart by type; NaN stays NaN
+    return value if type(value) is float else f"\0{type(value).__name__}"
+
+
+def duplicated(hashes: np.ndarray, keep='first') -> np.ndarray:
+    """Boolean mask of repeated rows, as DataFrame.duplicated(keep=...) on the hashed rows"""
+    return pd.Series(hashes, copy=False).duplicated(keep=keep).to_numpy()
+
+
+def appended(hashes: np.ndarray, df: pd.DataFrame, combined: pd.DataFrame) -> Optional[np.ndarray]:
+    """
+    Row hashes of combined, df with rows appended, from df's hashes and the
+    new rows alone. None when appending changed a column's dtype (say int
+    to float, or merged categories), which changes the old rows' hashes too.
+    """
+    if not df.dtypes.equals(combined.dtypes) or len(hashes) != len(df):
+        return None
+    return np.concatenate([hashes, hash_rows(combined.iloc[len(df):])])
@@ -0,0 +1,397 @@
+"""
+Sketches Module
+Fixed-size, mergeable summaries for approximate statistics over large tables
+"""
+from typing import Dict, Any
+
+import pandas as pd
+import numpy as np
+
+
+class Moments:
+    """
+    Count, mean, central moment sums (M2-M4), min and max of a set of
+    columns. Chunks are summarized exactly and combined with Pebay's
+    pairwise update formulas, so merging is order independent.
+    """
+
+    def __init__(self, n_cols: int):
+        self.count = np.zeros(n_cols)
+        self.mean = np.zeros(n_cols)
+        self.m2 = np.zeros(n_cols)
+        self.m3 = np.zeros(n_cols)
+        self.m4 = np.zeros(n_cols)
+        self.min = np.full(n_cols, np.inf)
+        self.max = np.full(n_cols, -np.inf)
+
+    def update(self, values: np.ndarray):
+        """Add a (rows x columns) float64 chunk with NaN for missing values"""
+        mask = np.isnan(values)
+        chunk = Moments(values.shape[1])
+        chunk.count = (values.shape[0] - mask.sum(axis=0)).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            filled = np.where(mask, 0.0, values)
+            chunk.mean = np.where(chunk.count > 0, filled.sum(axis=0) / chunk.count, 0.0)
+            centered = filled - chunk.mean
+            np.putmask(centered, mask, 0.0)
+        squared = centered ** 2
+        chunk.m2 = squared.sum(axis=0)
+        chunk.m3 = (squared * centered).sum(axis=0)
+        chunk.m4 = (squared * squared).sum(axis=0)
+        chunk.min = np.fmin.reduce(values, axis=0, initial=np.inf)
+        chunk.max = np.fmax.reduce(values, axis=0, initial=-np.inf)
+        self.merge(chunk)
+
+    def merge(self, other: 'Moments'):
+        """Fold another summary of the same columns into this one"""
+        na, nb = self.count, other.count
+        n = na + nb
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = other.mean - self.mean
+            delta_n = np.where(n > 0, delta / n, 0.0)
+            term = delta * delta_n * na * nb
+
+            mean = self.mean + delta_n * nb
+            m2 = self.m2 + other.m2 + term
+            m3 = (self.m3 + other.m3 + term * delta_n * (na - nb)
+                  + 3 * delta_n * (na * other.m2 - nb * self.m2))
+            m4 = (self.m4 + other.m4 + term * delta_n ** 2 * (na * na - na * nb + nb * nb)
+                  + 6 * delta_n ** 2 * (na * na * other.m2 + nb * nb * self.m2)
+                  + 4 * delta_n * (na * other.m3 - nb * self.m3))
+
+        # An empty side contributes nothing (and must not inject NaN)
+        self.mean = np.where(nb == 0, self.mean, np.where(na == 0, other.mean, mean))
+        self.m2 = np.where(nb == 0, self.m2, np.where(na == 0, other.m2, m2))
+        self.m3 = np.where(nb == 0, self.m3, np.where(na == 0, other.m3, m3))
+        self.m4 = np.where(nb == 0, self.m4, np.where(na == 0, other.m4, m4))
+        self.count = n
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+
+    def statistics(self) -> Dict[str, np.ndarray]:
+        """Sample std, bias-corrected skew and excess kurtosis (pandas definitions)"""
+        n = self.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(np.where(n > 1, self.m2 / (n - 1), np.nan))
+            skew = n * np.sqrt(n - 1) / (n - 2) * self.m3 / self.m2 ** 1.5
+            skew = np.where(np.abs(self.m2) < 1e-14, 0.0, skew)
+            denominator = (n - 2) * (n - 3) * self.m2 ** 2
+            kurtosis = n * (n + 1) * (n - 1) * self.m4 / denominator - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+            kurtosis = np.where(np.abs(denominator) < 1e-14, 0.0, kurtosis)
+        has_values = n > 0
+        return {
+            'count': n.astype(np.int64),
+            'mean': np.where(has_values, self.mean, np.nan),
+            'std': std,
+            'min': np.where(has_values, self.min, np.nan),
+            'max': np.where(has_values, self.max, np.nan),
+            'skew': np.where(n >= 3, skew, np.nan),
+            'kurtosis': np.where(n >= 4, kurtosis, np.nan)
+        }
+
+
+class CoMoments:
+    """
+    Pairwise-complete co-moments of a set of columns, for the correlation
+    matrix DataFrame.corr() would give. For every column pair it keeps the
+    count of rows where both are present, both means over those rows and the
+    centered (co)variance sums; each chunk is summarized with masked matrix
+    products and merged with Chan's update, so merging is order independent.
+    """
+
+    def __init__(self, n_cols: int):
+        shape = (n_cols, n_cols)
+        self.count = np.zeros(shape)
+        self.mean_x = np.zeros(shape)   # [i, j]: mean of column i where i and j are present
+        self.sxx = np.zeros(shape)      # [i, j]: sum of squares of column i around mean_x
+        self.sxy = np.zeros(shape)      # [i, j]: co-moment of columns i and j
+
+    def update(self, values: np.ndarray):
+        """Add a (rows x columns) float64 chunk with NaN for missing values"""
+        present = ~np.isnan(values)
+        weights = present.astype(np.float64)
+        # Shift by the chunk means so the sums below do not cancel catastrophically
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shift = np.where(present.any(axis=0), np.nanmean(np.where(present, values, np.nan), axis=0), 0.0)
+        shifted = np.where(present, values - shift, 0.0)
+
+        chunk = CoMoments(values.shape[1])
+        chunk.count = weights.T @ weights
+        sums = shifted.T @ weights            # [i, j]: sum of column i where j is present too
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(chunk.count > 0, sums / chunk.count, 0.0)
+        chunk.mean_x = means + shift[:, np.newaxis]
+        chunk.sxx = (shifted ** 2).T @ weights - sums * means
+        chunk.sxy = shifted.T @ shifted - sums * means.T
+        self.merge(chunk)
+
+    def merge(self, other: 'CoMoments'):
+        """Fold another summary of the same columns into this one"""
+        na, nb = self.count, other.count
+        n = na + nb
+        with np.errstate(invalid='ignore', divide='ignore'):
+            factor = np.where(n > 0, na * nb / n, 0.0)
+            weight_b = np.where(n > 0, nb / n, 0.0)
+        delta_x = other.mean_x - self.mean_x
+        delta_y = delta_x.T
+        self.sxy = self.sxy + other.sxy + delta_x * delta_y * factor
+        self.sxx = self.sxx + other.sxx + delta_x ** 2 * factor
+        self.mean_x = self.mean_x + delta_x * weight_b
+        self.count = n
+
+    def correlation(self) -> np.ndarray:
+        """Pearson correlation over pairwise-complete rows (NaN where undefined)"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.sxy / np.sqrt(self.sxx * self.sxx.T)
+
+
+class StreamingHistogram:
+    """
+    Equal-width histogram with a fixed number of bins over a range that
+    doubles (merging neighbouring bins) whenever a value falls outside it.
+    """
+
+    def __init__(self, bins: int = 1024):
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.start = None
+        self.width = None
+
+    def update(self, values: np.ndarray):
+        """Add raw values (NaN is ignored)"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if not values.size:
+            return
+        low, high = float(values.min()), float(values.max())
+        if self.start is None:
+            self.start = low
+            self.width = (high - low) / self.bins if high > low else 1.0
+        while low < self.start or high >= self.start + self.width * self.bins:
+            self._double(low < self.start)
+        index = np.minimum(((values - self.start) / self.width).astype(np.int64), self.bins - 1)
+        self.counts += np.bincount(index, minlength=self.bins)
+
+    def _double(self, extend_left: bool):
+        half = self.counts.reshape(-1, 2).sum(axis=1)
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+        if extend_left:
+            self.counts[self.bins // 2:] = half
+            self.start -= self.width * self.bins
+        else:
+            self.counts[:self.bins // 2] = half
+        self.width *= 2
+
+    def histogram(self, bins: int = 30):
+        """(counts, bin_edges) with at most `bins` bins spanning the occupied range"""
+        occupied = np.flatnonzero(self.counts)
+        if self.start is None or not occupied.size:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        first, last = occupied[0], occupied[-1] + 1
+        group = -(-(last - first) // bins)
+        starts = np.arange(first, last, group)
+        counts = np.add.reduceat(self.counts[first:last], starts - first)
+        edges = self.start + self.width * np.append(starts, min(starts[-1] + group, last))
+        return counts, edges
+
+
+class TDigest:
+    """
+    Merging t-digest for quantiles. Sorted points are grouped into centroids
+    by the k1 scale function, which keeps centroids small near the tails;
+    the number of centroids stays around compression / 2 whatever the input size.
+    """
+
+    def __init__(self, compression: int = 200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values: np.ndarray):
+        """Add raw values (NaN is ignored)"""
+        values = np.asarray(values, dtype=np.float64)
+        values = np.sort(values[~np.isnan(values)])
+        if values.size:
+            self.min = min(self.min, float(values[0]))
+            self.max = max(self.max, float(values[-1]))
+            self._compress(values, np.ones(values.size))
+
+    def merge(self, other: 'TDigest'):
+        """Fold another digest into this one"""
+        if other.weights.size:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress(other.means, other.weights)
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        """Merge sorted (mean, weight) points into the centroids and re-cluster"""
+        positions = np.searchsorted(means, self.means)
+        means = np.insert(means, positions, self.means)
+        weights = np.insert(weights, positions, self.weights)
+
+        # Points whose left-edge quantile falls in the same unit of k-space share a centroid
+        total = weights.sum()
+        left = (np.cumsum(weights) - weights) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * left - 1, -1, 1))
+        bucket = np.floor(k + self.compression / 4).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimated q-quantile (NaN when empty). Interpolates between centroid
+        means placed at the 0-based index of their middle value, framed by
+        min and max; exact, like numpy's linear method, while centroids are single points.
+        """
+        if not self.weights.size:
+            return np.nan
+        cumulative = np.cumsum(self.weights)
+        last = cumulative[-1] - 1
+        index = np.concatenate([[0.0], cumulative - self.weights / 2 - 0.5, [last]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q * last, index, values))
+
+    def rank(self, x: float, inclusive: bool = False) -> float:
+        """
+        Estimated number of values below x (at or below x when inclusive).
+        A centroid whose mean equals x counts as entirely tied with it, which
+        keeps discrete columns (many identical values) exact at their values.
+        """
+        if not self.weights.size or x < self.min or (x == self.min and not inclusive):
+            return 0.0
+        total = float(self.weights.sum())
+        if x > self.max or (x == self.max and inclusive):
+            return total
+        cumulative = np.cumsum(self.weights)
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        starts = np.concatenate([[0.0], cumulative - self.weights, [total]])
+        ends = np.concatenate([[0.0], cumulative, [total]])
+        middles = np.concatenate([[0.0], cumulative - self.weights / 2, [total]])
+
+        if inclusive:
+            index = int(np.searchsorted(values, x, side='right')) - 1
+            if values[index] == x:
+                return float(ends[index])
+        else:
+            index = int(np.searchsorted(values, x, side='left'))
+            if values[index] == x:
+                return float(starts[index])
+            index -= 1
+        # Between two knots: interpolate their middle ranks
+        span = values[index + 1] - values[index]
+        return float(middles[index] + (middles[index + 1] - middles[index]) * (x - values[index]) / span)
+
+    def rank_error(self, q: float) -> float:
+        """Bound on the rank error (fraction of values) of quantile(q): the width of the centroid it falls in"""
+        if not self.weights.size:
+            return 0.0
+        cumulative = np.cumsum(self.weights)
+        index = min(int(np.searchsorted(cumulative, q * cumulative[-1])), cumulative.size - 1)
+        return float(self.weights[index] / cumulative[-1]) if self.weights[index] > 1 else 0.0
+
+
+class HyperLogLog:
+    """Distinct-value counter over 64-bit hashes: 2**precision one-byte registers"""
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @staticmethod
+    def hash_values(values: pd.Series) -> np.ndarray:
+        """Stable 64-bit hashes of the non-null values of a Series"""
+        return pd.util.hash_pandas_object(values.dropna(), index=False).to_numpy()
+
+    def update(self, values: pd.Series):
+        """Add the non-null values of a Series"""
+        self.update_hashes(self.hash_values(values))
+
+    def update_hashes(self, hashes: np.ndarray):
+        """Add precomputed 64-bit hashes"""
+        if not hashes.size:
+            return
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+        # Position of the leftmost 1-bit in the remaining 64 - p bits (exact: they fit in a float64 mantissa)
+        _, exponent = np.frexp(rest.astype(np.float64))
+        rank = np.where(rest == 0, 64 - p + 1, 64 - p - exponent + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: 'HyperLogLog'):
+        """Fold another counter with the same precision into this one"""
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        """Estimated number of distinct values"""
+        m = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int((self.registers == 0).sum())
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            raw = m * np.log(m / zeros)
+        return int(round(raw))
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of estimate() relative to the true count"""
+        return 1.04 / np.sqrt(self.registers.size)
+
+
+class HeavyHitters:
+    """
+    Misra-Gries frequent-items summary with at most `capacity` counters.
+    Counts are lower bounds: each is at most `error` below the true count,
+    and error never exceeds total / (capacity + 1). Columns with no more
+    than `capacity` distinct values are counted exactly.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype='int64')
+        self.error = 0
+        self.total = 0
+
+    def update(self, values: pd.Series):
+        """Add the non-null values of a Series"""
+        self.update_counts(values.value_counts())
+
+    def update_counts(self, counts: pd.Series):
+        """Add exact value counts (e.g. one chunk's value_counts())"""
+        counts = counts[counts > 0]
+        self._combine(counts, int(counts.sum()), 0)
+
+    def merge(self, other: 'HeavyHitters'):
+        """Fold another summary into this one"""
+        self._combine(other.counts, other.total, other.error)
+
+    def _combine(self, counts: pd.Series, total: int, error: int):
+        counts = counts.copy()
+        counts.index = counts.index.astype(object)
+        combined = self.counts.add(counts, fill_value=0).astype('int64')
+        combined = combined.sort_values(ascending=False, kind='mergesort')
+        self.total += total
+        self.error += error
+        if len(combined) > self.capacity:
+            # Subtract the (capacity + 1)-th largest count from every counter and keep the positives
+            cut = int(combined.iloc[self.capacity])
+            combined = combined.iloc[:self.capacity] - cut
+            combined = combined[combined > 0]
+            self.error += cut
+        self.counts = combined
+
+    def top(self, n: int = None) -> pd.Series:
+        """Most frequent values with their (lower-bound) counts, largest first"""
+        return self.counts if n is None else self.counts.head(n)
+
+    def summary(self) -> Dict[str, Any]:
+        return {'tracked': int(len(self.counts)), 'total': int(self.total), 'max_error': int(self.error)}
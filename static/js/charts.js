@@ -60,6 +60,49 @@ function getChartLayout(title = '', darkMode = false) {
     };
 }
 
+// ============== BINARY ARRAYS ==============
+// Typed-array specs ({dtype, bdata[, shape]}) sent by the server for large
+// numeric arrays: base64 of little-endian values
+const typedArrayTypes = {
+    i1: Int8Array, u1: Uint8Array,
+    i2: Int16Array, u2: Uint16Array,
+    i4: Int32Array, u4: Uint32Array,
+    f4: Float32Array, f8: Float64Array
+};
+
+function isTypedArraySpec(value) {
+    return value !== null && typeof value === 'object' && typeof value.bdata === 'string' && value.dtype in typedArrayTypes;
+}
+
+function decodeTypedArray(spec) {
+    const binary = atob(spec.bdata);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    const values = new typedArrayTypes[spec.dtype](bytes.buffer);
+    if (!spec.shape) return values;
+
+    // 2-D (e.g. customdata): one typed-array view per row
+    const [rows, cols] = spec.shape;
+    return Array.from({ length: rows }, (_, r) => values.subarray(r * cols, (r + 1) * cols));
+}
+
+// Replace every typed-array spec inside a figure's traces (or any object) in place
+function decodeTypedArrays(value) {
+    if (Array.isArray(value)) {
+        value.forEach((item, i) => {
+            value[i] = isTypedArraySpec(item) ? decodeTypedArray(item) : decodeTypedArrays(item);
+        });
+    } else if (value !== null && typeof value === 'object' && !ArrayBuffer.isView(value)) {
+        Object.keys(value).forEach(key => {
+            const item = value[key];
+            value[key] = isTypedArraySpec(item) ? decodeTypedArray(item) : decodeTypedArrays(item);
+        });
+    }
+    return value;
+}
+
 // ============== CHART RENDERING ==============
 function renderPlotlyChart(containerId, chartData) {
     const container = document.getElementById(containerId);
@@ -88,7 +131,72 @@ function renderPlotlyChart(containerId, chartData) {
         }
     };
 
-    Plotly.newPlot(container, chartData.data, finalLayout, config);
+    Plotly.newPlot(container, decodeTypedArrays(chartData.data), finalLayout, config);
+}
+
+// ============== ZOOM RESAMPLING ==============
+// For charts the server reduced (layout.meta.downsample for line charts,
+// layout.meta.tiles for tiled heatmaps): on zoom, ask again for just the
+// visible range so it is drawn at full resolution (or reduced on its own);
+// on reset, go back to the overview.
+function zoomedRange(update, axis) {
+    if (`${axis}.range[0]` in update && `${axis}.range[1]` in update) {
+        return [update[`${axis}.range[0]`], update[`${axis}.range[1]`]];
+    }
+    if (Array.isArray(update[`${axis}.range`])) return update[`${axis}.range`];
+    if (update[`${axis}.autorange`]) return null;
+    return undefined;
+}
+
+function enableZoomResampling(containerId, endpoint, request) {
+    const container = document.getElementById(containerId);
+    if (!container || !container.on) return;
+
+    const currentRange = (axis) => {
+        const layout = container.layout?.[axis] || {};
+        return layout.autorange || !Array.isArray(layout.range) ? null : layout.range;
+    };
+
+    let ticket = 0;
+    container.removeAllListeners?.('plotly_relayout');
+    container.on('plotly_relayout', async (update) => {
+        const meta = container.layout?.meta || {};
+        if (!meta.downsample && !meta.tiles) return;
+        const xRange = zoomedRange(update, 'xaxis');
+        const yRange = meta.tiles ? zoomedRange(update, 'yaxis') : undefined;
+        if (xRange === undefined && yRange === undefined) return;
+
+        const body = {
+            ...request,
+            dark_mode: window.EDA.darkMode,
+            width: container.clientWidth,
+            x_range: xRange === undefined ? currentRange('xaxis') : xRange
+        };
+        if (meta.tiles) {
+            body.y_range = yRange === undefined ? currentRange('yaxis') : yRange;
+        }
+
+        const current = ++ticket;
+        try {
+            const result = await apiPost(endpoint, body);
+            // A newer zoom has been requested meanwhile
+            if (current !== ticket || !result.chart) return;
+            const layout = { ...container.layout, meta: result.chart.layout?.meta };
+            if (meta.tiles) {
+                // Column names label the axes only once few enough are in view
+                ['xaxis', 'yaxis'].forEach(axis => {
+                    layout[axis] = {
+                        ...container.layout[axis],
+                        tickvals: result.chart.layout?.[axis]?.tickvals,
+                        ticktext: result.chart.layout?.[axis]?.ticktext
+                    };
+                });
+            }
+            Plotly.react(container, decodeTypedArrays(result.chart.data), layout);
+        } catch (error) {
+            console.error('Failed to resample chart:', error);
+        }
+    });
 }
 
 // ============== UPDATE CHARTS THEME ==============
@@ -135,17 +243,21 @@ async function createBarChart(containerId, datasetId, x, y, title = 'Bar Chart',
 async function createLineChart(containerId, datasetId, x, y, title = 'Line Chart', color = null) {
     showLoading();
     try {
-        const result = await apiPost('/api/chart/line', {
+        const request = {
             dataset_id: datasetId,
             x: x,
             y: y,
             title: title,
             color: color,
-            dark_mode: window.EDA.darkMode
-        });
+            dark_mode: window.EDA.darkMode,
+            binary: true
+        };
+        const container = document.getElementById(containerId);
+        const result = await apiPost('/api/chart/line', { ...request, width: container?.clientWidth || null });
 
         if (result.chart) {
             renderPlotlyChart(containerId, result.chart);
+            enableZoomResampling(containerId, '/api/chart/line', request);
         }
     } catch (error) {
         console.error('Failed to create line chart:', error);
@@ -182,7 +294,8 @@ async function createBoxPlot(containerId, datasetId, columns = null, title = 'Bo
             dataset_id: datasetId,
             columns: columns,
             title: title,
-            dark_mode: window.EDA.darkMode
+            dark_mode: window.EDA.darkMode,
+            binary: true
         });
 
         if (result.chart) {
@@ -195,17 +308,21 @@ async function createBoxPlot(containerId, datasetId, columns = null, title = 'Bo
 }
 
 // ============== CREATE HEATMAP ==============
-async function createHeatmap(containerId, datasetId, title = 'Correlation Matrix') {
+async function createHeatmap(containerId, datasetId, title = 'Correlation Matrix', order = 'original', topK = null) {
     showLoading();
     try {
-        const result = await apiPost('/api/chart/heatmap', {
+        const request = {
             dataset_id: datasetId,
             title: title,
+            order: order,
+            top_k: topK,
             dark_mode: window.EDA.darkMode
-        });
+        };
+        const result = await apiPost('/api/chart/heatmap', request);
 
         if (result.chart) {
             renderPlotlyChart(containerId, result.chart);
+            enableZoomResampling(containerId, '/api/chart/heatmap', request);
         }
     } catch (error) {
         console.error('Failed to create heatmap:', error);
@@ -224,7 +341,8 @@ async function createScatterPlot(containerId, datasetId, x, y, color = null, siz
             color: color,
             size: size,
             title: title,
-            dark_mode: window.EDA.darkMode
+            dark_mode: window.EDA.darkMode,
+            binary: true
         });
 
         if (result.chart) {
@@ -345,6 +463,8 @@ function createLocalLineChart(containerId, x, y, title = 'Chart') {
 
 // ============== EXPORTS ==============
 window.renderPlotlyChart = renderPlotlyChart;
+window.decodeTypedArray = decodeTypedArray;
+window.decodeTypedArrays = decodeTypedArrays;
 window.updateChartsTheme = updateChartsTheme;
 window.createBarChart = createBarChart;
 window.createLineChart = createLineChart;
@@ -357,3 +477,4 @@ window.createLocalBarChart = createLocalBarChart;
 window.createLocalPieChart = createLocalPieChart;
 window.createLocalLineChart = createLocalLineChart;
 window.chartTheme = chartTheme;
+window.enableZoomResampling = enableZoomResampling;
@@ -366,6 +366,174 @@ function renderDataTable(containerId, columns, data, options = {}) {
     container.innerHTML = html;
 }
 
+// ============== VIRTUAL TABLE ==============
+/**
+ * Scrollable table over the paginated rows endpoint (/api/datasets/<id>/rows).
+ * Only the rows in view are fetched and rendered; fetched pages are kept so
+ * scrolling back does not refetch. Clicking a header sorts on the server.
+ */
+function renderVirtualTable(containerId, endpoint, options = {}) {
+    const container = document.getElementById(containerId);
+    if (!container) return;
+
+    const pageSize = options.pageSize || 100;
+    const maxPages = options.maxPages || 50;
+    const overscan = 10;
+    // Browsers cap element heights; beyond this the scrollbar maps proportionally onto rows
+    const maxSpacerHeight = 8000000;
+
+    const state = {
+        columns: options.columns || [],
+        totalRows: options.totalRows || 0,
+        rowHeight: 41,
+        sort: null,
+        ascending: true,
+        pages: new Map(),
+        pending: new Set(),
+        generation: 0
+    };
+
+    container.innerHTML = `
+        <div class="table-container virtual-table" style="height: ${options.maxHeight || '400px'}; overflow: auto;">
+            <table class="data-table">
+                <thead><tr></tr></thead>
+                <tbody></tbody>
+            </table>
+        </div>
+        <p class="text-muted mt-2 virtual-table-status" style="font-size: 0.875rem;"></p>
+    `;
+    const viewport = container.querySelector('.virtual-table');
+    const headRow = container.querySelector('thead tr');
+    const body = container.querySelector('tbody');
+    const status = container.querySelector('.virtual-table-status');
+
+    function renderHeader() {
+        headRow.innerHTML = '<th>#</th>' + state.columns.map(col => {
+            const arrow = state.sort === col ? (state.ascending ? ' &#9650;' : ' &#9660;') : '';
+            return `<th class="sortable" data-column="${escapeHtml(col)}">${escapeHtml(col)}${arrow}</th>`;
+        }).join('');
+        headRow.querySelectorAll('th.sortable').forEach(th => {
+            th.addEventListener('click', () => sortBy(th.dataset.column));
+        });
+    }
+
+    function sortBy(column) {
+        state.ascending = state.sort === column ? !state.ascending : true;
+        state.sort = column;
+        state.pages.clear();
+        state.pending.clear();
+        state.generation++;
+        viewport.scrollTop = 0;
+        renderHeader();
+        render();
+    }
+
+    function rowUrl(page) {
+        const params = new URLSearchParams({ offset: page * pageSize, limit: pageSize, binary: 1 });
+        if (state.sort !== null) {
+            params.set('sort', state.sort);
+            params.set('order', state.ascending ? 'asc' : 'desc');
+        }
+        return `${endpoint}?${params}`;
+    }
+
+    async function fetchPage(page) {
+        if (state.pages.has(page) || state.pending.has(page)) return;
+        const generation = state.generation;
+        state.pending.add(page);
+        try {
+            const data = columnarToRows(await apiGet(rowUrl(page)));
+            if (generation !== state.generation) return;
+            state.totalRows = data.total_rows;
+            state.pages.set(page, data);
+            while (state.pages.size > maxPages) {
+                state.pages.delete(state.pages.keys().next().value);
+            }
+            render();
+        } catch (error) {
+            console.error('Failed to load rows:', error);
+        } finally {
+            if (generation === state.generation) state.pending.delete(page);
+        }
+    }
+
+    // binary=1 windows are column-major with typed-array numeric columns (NaN = missing)
+    function columnarToRows(data) {
+        if (!data.data) return data;
+        const columns = data.data.map(column => (column && column.bdata !== undefined) ? decodeTypedArray(column) : column);
+        const positions = data.positions.bdata !== undefined ? decodeTypedArray(data.positions) : data.positions;
+        data.positions = positions;
+        data.rows = Array.from(positions, (_, i) => columns.map(column => {
+            const value = column[i];
+            return typeof value === 'number' && Number.isNaN(value) ? null : value;
+        }));
+        return data;
+    }
+
+    function render() {
+        const total = state.totalRows;
+        const rowHeight = state.rowHeight;
+        const fullHeight = total * rowHeight;
+        const spacerHeight = Math.min(fullHeight, maxSpacerHeight);
+        const visible = Math.ceil(viewport.clientHeight / rowHeight) + 1;
+        const scrollTop = viewport.scrollTop;
+
+        let first;
+        if (fullHeight <= maxSpacerHeight) {
+            first = Math.floor(scrollTop / rowHeight);
+        } else {
+            const scrollable = Math.max(1, spacerHeight - viewport.clientHeight);
+            first = Math.floor(scrollTop / scrollable * Math.max(0, total - visible));
+        }
+        const start = Math.max(0, first - overscan);
+        const end = Math.min(total, first + visible + overscan);
+
+        let rowsHtml = '';
+        for (let index = start; index < end; index++) {
+            const page = state.pages.get(Math.floor(index / pageSize));
+            if (!page) {
+                fetchPage(Math.floor(index / pageSize));
+                rowsHtml += `<tr><td class="text-muted">${index + 1}</td>${state.columns.map(() => '<td class="text-muted">&hellip;</td>').join('')}</tr>`;
+                continue;
+            }
+            const row = page.rows[index - page.offset];
+            if (!row) continue;
+            rowsHtml += `<tr><td class="text-muted">${page.positions[index - page.offset] + 1}</td>` + row.map(value =>
+                `<td>${value !== null && value !== undefined ? escapeHtml(value) : '<span class="text-muted">null</span>'}</td>`
+            ).join('') + '</tr>';
+        }
+
+        // Padding rows stand in for everything above and below the rendered window
+        const rendered = end - start;
+        const topPad = fullHeight <= maxSpacerHeight ? start * rowHeight : Math.max(0, scrollTop - (first - start) * rowHeight);
+        const bottomPad = Math.max(0, spacerHeight - topPad - rendered * rowHeight);
+        body.innerHTML = `<tr class="virtual-table-pad" style="height: ${topPad}px"></tr>${rowsHtml}<tr class="virtual-table-pad" style="height: ${bottomPad}px"></tr>`;
+
+        const sample = body.querySelector('tr:not(.virtual-table-pad)');
+        if (sample && Math.abs(sample.offsetHeight - state.rowHeight) > 1) {
+            state.rowHeight = sample.offsetHeight;
+            render();
+            return;
+        }
+
+        status.textContent = total
+            ? `Rows ${formatNumber(Math.min(first + 1, total))}-${formatNumber(Math.min(first + visible, total))} of ${formatNumber(total)}`
+            : 'No rows';
+    }
+
+    let frame = null;
+    viewport.addEventListener('scroll', () => {
+        if (frame !== null) return;
+        frame = requestAnimationFrame(() => {
+            frame = null;
+            render();
+        });
+    });
+
+    renderHeader();
+    render();
+}
+
 // ============== FORMATTING ==============
 function formatNumber(num) {
     if (num === null || num === undefined) return 'N/A';
@@ -389,6 +557,16 @@ function formatPercentage(value) {
 }
 
 // ============== UTILITIES ==============
+// Text for innerHTML, element content or a quoted attribute
+function escapeHtml(value) {
+    return String(value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
+
 function debounce(func, wait) {
     let timeout;
     return function executedFunction(...args) {
@@ -458,7 +636,9 @@ window.apiDelete = apiDelete;
 window.apiUpload = apiUpload;
 window.initFileUpload = initFileUpload;
 window.renderDataTable = renderDataTable;
+window.renderVirtualTable = renderVirtualTable;
 window.formatNumber = formatNumber;
+window.escapeHtml = escapeHtml;
 window.formatBytes = formatBytes;
 window.formatPercentage = formatPercentage;
 window.loadDatasets = loadDatasets;
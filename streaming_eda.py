@@ -0,0 +1,143 @@
+"""
+Streaming EDA Module
+Exploratory analysis of CSV files too large to load, one chunk at a time
+"""
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+import pandas as pd
+import numpy as np
+
+from config import Config
+from column_profiler import ApproxDatasetProfile
+from data_processor import DataProcessor, current_rss_bytes
+from eda_engine import EDAEngine
+from sketches import CoMoments, StreamingHistogram
+
+
+class StreamingProfile(ApproxDatasetProfile):
+    """
+    ApproxDatasetProfile fed from an iterator of DataFrame chunks, which is
+    read exactly once. On top of the sketches it keeps pairwise co-moments
+    (correlation matrix) and a range-doubling histogram per numeric column.
+    Column roles come from the first chunk; numeric columns that turn up as
+    text in later chunks are coerced, unparseable values counting as missing.
+    IQR outlier counts are estimated from the t-digest instead of a second pass.
+    """
+
+    HISTOGRAM_BINS = 1024
+
+    def __init__(self, chunks: Iterable[pd.DataFrame]):
+        chunks = iter(chunks)
+        first = next(chunks)
+        self._begin(first.dtypes)
+        self._comoments = CoMoments(len(self.numeric_cols))
+        self.histograms = {col: StreamingHistogram(self.HISTOGRAM_BINS) for col in self.numeric_cols}
+        self.chunk_count = 0
+
+        for chunk in itertools.chain([first], chunks):
+            self._update(self._conform(chunk))
+            self.chunk_count += 1
+        self._finish()
+
+        numeric_stats = self.numeric_stats
+        iqr = numeric_stats['q3'] - numeric_stats['q1']
+        lower = numeric_stats['q1'] - 1.5 * iqr
+        upper = numeric_stats['q3'] + 1.5 * iqr
+        counts = [
+            self._digests[col].rank(lower[col]) + self._digests[col].count - self._digests[col].rank(upper[col], inclusive=True)
+            for col in self.numeric_cols
+        ]
+        self.iqr_outliers = pd.DataFrame(
+            {'lower': lower, 'upper': upper, 'count': np.round(np.array(counts, dtype=np.float64)).astype('int64')},
+            index=numeric_stats.index
+        )
+        self.correlation = pd.DataFrame(
+            self._comoments.correlation(), index=self.numeric_cols, columns=self.numeric_cols
+        )
+
+    def _conform(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Give a chunk the column roles of the first one"""
+        for col in self.numeric_cols:
+            if chunk[col].dtype.kind not in 'iufb':
+                chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+        return chunk
+
+    def _update_numeric(self, values: np.ndarray):
+        super()._update_numeric(values)
+        self._comoments.update(values)
+        for i, col in enumerate(self.numeric_cols):
+            self.histograms[col].update(values[:, i])
+
+
+class StreamingEDA:
+    """Runs the automated EDA over a CSV file without loading it; memory depends on columns, not rows"""
+
+    @staticmethod
+    def csv_chunks(filepath: str, chunk_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Parse a CSV in chunks with one dtype plan (sniffed from its leading rows) for all of them"""
+        plan = DataProcessor.sniff_csv_dtypes(filepath)
+        with pd.read_csv(filepath, dtype=plan['dtype'], chunksize=chunk_rows or Config.CSV_CHUNK_ROWS) as reader:
+            empty = True
+            for chunk in reader:
+                empty = False
+                for col in plan['date_columns']:
+                    chunk[col] = DataProcessor._parse_dates(chunk[col])
+                yield chunk
+        if empty:
+            # Header-only file: one empty chunk still defines the columns
+            yield pd.read_csv(filepath, nrows=0)
+
+    @staticmethod
+    def analyze_file(filepath: str, chunk_rows: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Same result shape as /api/eda, plus a histogram per numeric column
+        ('distributions'), the error bounds of the sketches ('approximation')
+        and throughput figures ('streaming')
+        """
+        ext = os.path.splitext(filepath)[1].lower()
+        if ext != '.csv':
+            raise ValueError(f"Streaming EDA supports CSV files only, not {ext}")
+
+        start = time.perf_counter()
+        rss_samples = [current_rss_bytes()]
+
+        def sampled(chunks):
+            for chunk in chunks:
+                yield chunk
+                rss_samples.append(current_rss_bytes())
+
+        profile = StreamingProfile(sampled(StreamingEDA.csv_chunks(filepath, chunk_rows)))
+        engine = EDAEngine(None, profile=profile)
+
+        result = {
+            'descriptive_stats': engine.get_descriptive_statistics(),
+            'missing_values': engine.get_missing_value_analysis(),
+            'correlations': engine.get_correlation_matrix(),
+            'outliers': engine.detect_outliers(),
+            'insights': engine.generate_insights(),
+            'distributions': {col: engine.get_distribution_data(col) for col in profile.numeric_cols},
+            'approximation': engine.get_error_bounds()
+        }
+
+        elapsed = time.perf_counter() - start
+        rss = max([r for r in rss_samples if r is not None], default=None)
+        result['streaming'] = {
+            'rows': profile.n_rows,
+            'chunks': profile.chunk_count,
+            'seconds': round(elapsed, 3),
+            'rows_per_sec': int(profile.n_rows / elapsed) if elapsed > 0 else None,
+            'peak_rss_mb': round(rss / 1024 / 1024, 1) if rss else None
+        }
+        return result
+
+
+if __name__ == '__main__':
+    # python streaming_eda.py big.csv > eda.json
+    if len(sys.argv) != 2:
+        sys.exit('usage: python streaming_eda.py <file.csv>')
+    json.dump(DataProcessor.convert_to_native(StreamingEDA.analyze_file(sys.argv[1])), sys.stdout, indent=2)
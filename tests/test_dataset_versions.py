@@ -0,0 +1,61 @@
+"""Tests for the copy-on-write dataset version history"""
+import gc
+
+import numpy as np
+import pandas as pd
+
+from dataset_versions import VersionHistory
+
+
+def info_of(df: pd.DataFrame) -> dict:
+    return {'rows': len(df), 'columns': len(df.columns), 'column_names': df.columns.tolist()}
+
+
+def test_same_shape_change_elsewhere_starts_new_root(tmp_path):
+    history = VersionHistory(1 << 30, 10, 3600, str(tmp_path))
+    key = ('session', 'dataset')
+    original = pd.DataFrame({'a': [1.0, np.nan, 3.0]})
+    cleaned = pd.DataFrame({'a': [1.0, 2.0, 3.0]})
+    history.commit(key, original, info_of(original), cleaned, info_of(cleaned), 'clean', columns={0: cleaned['a'].to_numpy()})
+
+    # Same rows and columns, different content: not a change over the head
+    edited = pd.DataFrame({'a': [7.0, 8.0, 9.0]})
+    doubled = edited * 2
+    history.commit(key, edited, info_of(edited), doubled, info_of(doubled), 'double', columns={0: doubled['a'].to_numpy()})
+
+    version, df = history.undo(key)
+    assert version.parent is None
+    assert df['a'].tolist() == [7.0, 8.0, 9.0]
+
+
+def test_single_history_over_budget_spills_its_root(tmp_path):
+    original = pd.DataFrame({'a': np.arange(10000, dtype='float64'), 'b': np.arange(10000, dtype='float64')})
+    history = VersionHistory(50000, 10, 3600, str(tmp_path))
+    key = ('session', 'dataset')
+    kept = np.arange(0, 10000, 2)
+    cleaned = original.iloc[kept].reset_index(drop=True)
+    history.commit(key, original, info_of(original), cleaned, info_of(cleaned), 'filter', rows=kept)
+
+    root = history.versions(key)['versions'][0]
+    assert history.stats()['bytes'] <= 50000
+    assert history.stats()['spills'] == 1
+    assert root['bytes'] == 0
+
+    # Rebuilt from the spilled file once nothing else holds the original frame
+    del original
+    gc.collect()
+    version, df = history.undo(key)
+    assert version.parent is None
+    assert df['a'].tolist() == list(np.arange(10000, dtype='float64'))
+
+
+def test_single_history_whose_changes_exceed_budget_is_dropped(tmp_path):
+    original = pd.DataFrame({'a': np.zeros(10000)})
+    history = VersionHistory(1000, 10, 3600, str(tmp_path))
+    key = ('session', 'dataset')
+    filled = pd.DataFrame({'a': np.ones(10000)})
+    history.commit(key, original, info_of(original), filled, info_of(filled), 'fill', columns={0: filled['a'].to_numpy()})
+
+    assert history.stats()['histories'] == 0
+    assert history.stats()['bytes'] == 0
+    assert list(tmp_path.rglob('*.*')) == []
@@ -0,0 +1,39 @@
+"""Tests for missing-value imputation through the cleaning plan"""
+import numpy as np
+import pandas as pd
+
+from cleaning_plan import CleaningPlan
+from data_processor import DataProcessor
+
+
+def categorical_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'region': pd.Categorical(['north', 'south', None, 'north']),
+        'amount': [1.0, None, 3.0, 4.0]
+    })
+
+
+def test_fill_value_adds_new_category():
+    df = categorical_frame()
+    for fill_value in ('Unknown', 0):
+        result = DataProcessor.handle_missing_values(df, 'fill_value', fill_value)
+        assert result['region'].tolist() == ['north', 'south', fill_value, 'north']
+        assert fill_value in result['region'].cat.categories
+    # The source frame keeps its categories and its missing values
+    assert df['region'].cat.categories.tolist() == ['north', 'south']
+    assert df['region'].isna().sum() == 1
+
+
+def test_fill_value_on_categorical_through_plan():
+    # The /api/clean form fields
+    plan = CleaningPlan.from_request({'missing_strategy': 'fill_value', 'fill_value': 'Unknown'})
+    result, _, _ = plan.apply(categorical_frame())
+    assert result['region'].tolist() == ['north', 'south', 'Unknown', 'north']
+    assert result['amount'].tolist() == [1.0, 'Unknown', 3.0, 4.0]
+
+
+def test_fill_mean_of_float32_column_in_float64():
+    df = pd.DataFrame({'score': np.array([82.5, 82.25, np.nan, 82.5], dtype=np.float32)})
+    result = DataProcessor.handle_missing_values(df, 'fill_mean')
+    assert result['score'].dtype == 'float64'
+    assert result['score'].tolist() == [82.5, 82.25, 247.25 / 3, 82.5]
@@ -0,0 +1,15 @@
+"""Tests for the outlier rules"""
+import pandas as pd
+
+from column_profiler import ColumnProfiler
+from data_processor import DataProcessor
+from outlier_engine import OutlierEngine
+
+
+def test_empty_frame_has_zero_percentages():
+    df = pd.DataFrame({'amount': pd.Series([], dtype='float64'), 'count': pd.Series([], dtype='int64')})
+    for method in OutlierEngine.METHODS:
+        outliers = OutlierEngine(df, ColumnProfiler.profile(df)).detect(method)
+        assert [column['percentage'] for column in outliers.values()] == [0.0, 0.0]
+        assert [column['count'] for column in outliers.values()] == [0, 0]
+    assert DataProcessor.calculate_health_score(df)['score'] == 0
@@ -0,0 +1,19 @@
+"""Tests for row hashing behind duplicate counts and removal"""
+import numpy as np
+import pandas as pd
+
+import row_index
+from data_processor import DataProcessor
+
+
+def test_mixed_object_values_deduplicate_like_drop_duplicates():
+    df = pd.DataFrame({'value': pd.Series([1, '1', 1.0, True, 1], dtype=object)})
+    result = DataProcessor.remove_duplicates(df)
+    assert result['value'].tolist() == [1, '1']
+    assert result.equals(df.drop_duplicates())
+
+
+def test_missing_values_of_different_kinds_are_not_duplicates():
+    df = pd.DataFrame({'value': pd.Series(['a', None, np.nan, None, pd.NaT, 'a'], dtype=object)})
+    hashes = row_index.hash_rows(df)
+    assert row_index.duplicated(hashes).tolist() == df.duplicated().tolist()
@@ -0,0 +1,12 @@
+"""Tests for chart construction helpers"""
+import pandas as pd
+
+from visualization_engine import VisualizationEngine
+
+
+def test_category_zoom_selects_categories_not_row_positions():
+    df = pd.DataFrame({'x': ['a', 'b', 'a', 'c', 'b', 'd'], 'y': [1, 2, 3, 4, 5, 6], 'g': ['p', 'q', 'q', 'p', 'p', 'q']})
+    # Categories a, b, c, d: positions 1-2 are b and c, wherever their rows are
+    assert VisualizationEngine._in_x_range(df, 'x', [1, 2])['y'].tolist() == [2, 4, 5]
+    # One trace per group: p brings a, c, b and q then adds d
+    assert VisualizationEngine._in_x_range(df, 'x', [2, 3], group='g')['y'].tolist() == [2, 5, 6]
@@ -7,13 +7,24 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Union
 import json
+import warnings
+from plotly.io.json import to_json_plotly
+
+from config import Config
+from column_profiler import ColumnProfiler
+from downsampling import as_numeric, downsample_frame
+from eda_engine import EDAEngine
+from fast_json import typed_array
 
 
 class VisualizationEngine:
     """Generate Plotly visualizations for EDA"""
     
+    # Bump when chart output changes, so cached figures are not reused
+    VERSION = 1
+    
     # Color palette matching the UI theme
     COLORS = {
         'primary': '#3B5998',
@@ -76,6 +87,75 @@ class VisualizationEngine:
             }
         }
     
+    @classmethod
+    def get_theme(cls, dark_mode: bool = False) -> Dict:
+        """The colours get_layout applies, on their own"""
+        colors = cls.DARK_COLORS if dark_mode else cls.LIGHT_COLORS
+        
+        return {
+            'title': {'font': {'color': colors['text']}},
+            'paper_bgcolor': colors['paper'],
+            'plot_bgcolor': colors['bg'],
+            'font': {'color': colors['text']},
+            'xaxis': {'gridcolor': colors['grid'], 'zerolinecolor': colors['grid']},
+            'yaxis': {'gridcolor': colors['grid'], 'zerolinecolor': colors['grid']},
+            'legend': {'font': {'color': colors['text']}}
+        }
+    
+    @classmethod
+    def reskin(cls, layout: Dict, dark_mode: bool = False) -> Dict:
+        """Re-theme a figure's layout (parsed JSON) in place, as if it had been built with dark_mode"""
+        def merge(target: Dict, theme: Dict):
+            for key, value in theme.items():
+                if isinstance(value, dict):
+                    if not isinstance(target.get(key), dict):
+                        target[key] = {}
+                    merge(target[key], value)
+                else:
+                    target[key] = value
+        
+        merge(layout, cls.get_theme(dark_mode))
+        return layout
+    
+    @classmethod
+    def to_json(cls, fig: go.Figure, binary: bool = False, split: bool = False) -> Union[str, Tuple[str, str]]:
+        """
+        Figure JSON. binary=True ships the traces' numeric arrays as
+        base64 typed-array specs ({'dtype', 'bdata'}, see typed_array)
+        instead of JSON number lists. split=True returns the JSON of the
+        data traces and of the layout apart, for callers that cache them
+        separately (the figure is {"data": ..., "layout": ...} of the two).
+        """
+        if not binary and not split:
+            return fig.to_json()
+        figure = fig.to_plotly_json()
+        specs = []
+        if binary:
+            figure['data'] = [cls._binary_arrays(trace, specs) for trace in figure['data']]
+        if split:
+            data_text, layout_text = to_json_plotly(figure['data']), to_json_plotly(figure['layout'])
+        else:
+            data_text, layout_text = to_json_plotly(figure), None
+        # Plotly escapes '/' for embedding in HTML; undo it inside base64, where it is frequent
+        for spec in specs:
+            if '/' in spec['bdata']:
+                escaped = spec['bdata'].replace('/', '\\u002f')
+                data_text = data_text.replace(f'"bdata":"{escaped}"', f'"bdata":"{spec["bdata"]}"', 1)
+        return (data_text, layout_text) if split else data_text
+    
+    @classmethod
+    def _binary_arrays(cls, value, specs: List[dict]):
+        """Replace numeric arrays inside a trace with typed-array specs (collected in specs)"""
+        if isinstance(value, dict):
+            return {key: cls._binary_arrays(item, specs) for key, item in value.items()}
+        if isinstance(value, (np.ndarray, pd.Series)):
+            spec = typed_array(value, float32=Config.CHART_BINARY_FLOAT32, min_size=Config.CHART_BINARY_MIN_SIZE)
+            if spec is None:
+                return value
+            specs.append(spec)
+            return spec
+        return value
+    
     @classmethod
     def create_bar_chart(
         cls,
@@ -84,8 +164,9 @@ class VisualizationEngine:
         y: str,
         title: str = "Bar Chart",
         color: str = None,
-        dark_mode: bool = False
-    ) -> str:
+        dark_mode: bool = False,
+        split: bool = False
+    ) -> Union[str, Tuple[str, str]]:
         """Create a bar chart"""
         fig = px.bar(
             df,
@@ -96,7 +177,7 @@ class VisualizationEngine:
             title=title
         )
         fig.update_layout(**cls.get_layout(title, dark_mode))
-        return fig.to_json()
+        return cls.to_json(fig, split=split)
     
     @classmethod
     def create_line_chart(
@@ -106,11 +187,29 @@ class VisualizationEngine:
         y: str,
         title: str = "Line Chart",
         color: str = None,
-        dark_mode: bool = False
-    ) -> str:
-        """Create a line chart"""
+        dark_mode: bool = False,
+        binary: bool = False,
+        max_points: int = None,
+        x_range: List = None,
+        method: str = None,
+        split: bool = False
+    ) -> Union[str, Tuple[str, str]]:
+        """
+        Create a line chart. Series longer than max_points (default
+        Config.DOWNSAMPLE_DEFAULT_POINTS) are reduced on the server with
+        downsampling.downsample_frame, and layout.meta.downsample records
+        it so the page can ask again for the zoomed-in x_range [low, high],
+        which is then reduced on its own, i.e. at full resolution when few
+        enough points are in view.
+        """
+        max_points = max(3, int(max_points or Config.DOWNSAMPLE_DEFAULT_POINTS))
+        method = method or Config.DOWNSAMPLE_METHOD
+        data = df if x_range is None else cls._in_x_range(df, x, x_range, group=color)
+        plot_df, total = downsample_frame(data, x, y, max_points, method, group=color)
+        resampled = total > max_points or x_range is not None
+        
         fig = px.line(
-            df,
+            plot_df if resampled else df,
             x=x,
             y=y,
             color=color,
@@ -119,31 +218,90 @@ class VisualizationEngine:
             markers=True
         )
         fig.update_layout(**cls.get_layout(title, dark_mode))
-        return fig.to_json()
+        if resampled:
+            fig.update_layout(meta={'downsample': {
+                'method': method,
+                'points': len(plot_df),
+                'total': total,
+                'x_range': x_range
+            }})
+        return cls.to_json(fig, binary, split)
+    
+    @staticmethod
+    def _in_x_range(df: pd.DataFrame, x: str, x_range: List, group: str = None) -> pd.DataFrame:
+        """
+        Rows whose x lies in [low, high] (bounds as sent by Plotly: numbers,
+        date strings for date axes, category positions for category axes)
+        """
+        low, high = x_range
+        values = df[x]
+        if pd.api.types.is_datetime64_any_dtype(values.dtype):
+            low, high = pd.Timestamp(low), pd.Timestamp(high)
+            if values.dt.tz is not None:
+                low, high = low.tz_localize(values.dt.tz), high.tz_localize(values.dt.tz)
+        elif pd.api.types.is_numeric_dtype(values.dtype):
+            low, high = float(low), float(high)
+        else:
+            # Plotly numbers categories in order of first appearance, trace by trace
+            # (one trace per group, in order of first appearance)
+            if group is None:
+                positions = pd.factorize(values)[0]
+            else:
+                order = np.argsort(pd.factorize(df[group])[0], kind='stable')
+                positions = np.empty(len(df), dtype=np.int64)
+                positions[order] = pd.factorize(values.iloc[order])[0]
+            return df[(positions >= 0) & (positions >= float(low)) & (positions <= float(high))]
+        return df[values.between(low, high)]
+    
+    @classmethod
+    def _histogram_bars(cls, histogram: Dict[str, List], name: str, color: str) -> go.Bar:
+        """Bar trace drawing pre-computed bins (counts and edges), one bar per bin"""
+        edges = np.asarray(histogram['bin_edges'], dtype=np.float64)
+        return go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=histogram['counts'],
+            width=np.diff(edges),
+            customdata=np.column_stack([edges[:-1], edges[1:]]),
+            hovertemplate='%{customdata[0]:.4g} to %{customdata[1]:.4g}<br>count=%{y}<extra></extra>',
+            name=name,
+            marker_color=color
+        )
     
     @classmethod
     def create_histogram(
         cls,
         df: pd.DataFrame,
         column: str,
-        bins: int = 30,
+        bins: Union[int, str] = 30,
         title: str = None,
-        dark_mode: bool = False
-    ) -> str:
-        """Create a histogram"""
+        dark_mode: bool = False,
+        split: bool = False
+    ) -> Union[str, Tuple[str, str]]:
+        """
+        Create a histogram. Numeric columns are binned on the server (bins: a
+        count or 'fd' / 'sturges' / 'auto'), so the figure carries one value
+        per bin rather than the raw column.
+        """
         if title is None:
             title = f"Distribution of {column}"
         
-        fig = px.histogram(
-            df,
-            x=column,
-            nbins=bins,
-            color_discrete_sequence=[cls.COLORS['primary']],
-            title=title
-        )
+        distribution = EDAEngine(df).get_distribution_data(column, bins)
+        if distribution.get('type') != 'numeric':
+            # Dates and categories are counted by Plotly
+            fig = px.histogram(
+                df,
+                x=column,
+                nbins=bins if isinstance(bins, int) else None,
+                color_discrete_sequence=[cls.COLORS['primary']],
+                title=title
+            )
+            fig.update_layout(**cls.get_layout(title, dark_mode))
+            return cls.to_json(fig, split=split)
+        
+        fig = go.Figure(cls._histogram_bars(distribution['histogram'], column, cls.COLORS['primary']))
         
         # Add mean line
-        mean_val = df[column].mean()
+        mean_val = distribution['stats']['mean']
         fig.add_vline(
             x=mean_val,
             line_dash="dash",
@@ -152,7 +310,35 @@ class VisualizationEngine:
         )
         
         fig.update_layout(**cls.get_layout(title, dark_mode))
-        return fig.to_json()
+        fig.update_layout(bargap=0, xaxis_title=column, yaxis_title='count')
+        return cls.to_json(fig, split=split)
+    
+    @classmethod
+    def _box_summary(cls, values: pd.Series, col_stats: pd.Series, fences: pd.Series, max_outliers: int) -> Dict[str, Any]:
+        """
+        Tukey box for one column from its profiled quartiles and IQR fences:
+        whiskers at the most extreme values inside the fences and up to
+        max_outliers of the values outside them, evenly spaced in sorted
+        order so the most extreme ones are always kept
+        """
+        summary = {
+            'q1': col_stats['q1'], 'median': col_stats['median'], 'q3': col_stats['q3'],
+            'lowerfence': col_stats['min'], 'upperfence': col_stats['max'],
+            'outliers': np.empty(0), 'outlier_count': int(fences['count'])
+        }
+        if summary['outlier_count'] == 0:
+            return summary
+        
+        values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        outside = (values < fences['lower']) | (values > fences['upper'])
+        inside = values[~outside & ~np.isnan(values)]
+        if inside.size:
+            summary['lowerfence'], summary['upperfence'] = inside.min(), inside.max()
+        outliers = np.sort(values[outside])
+        if outliers.size > max_outliers:
+            outliers = outliers[np.linspace(0, outliers.size - 1, max_outliers).round().astype(np.int64)]
+        summary['outliers'] = outliers
+        return summary
     
     @classmethod
     def create_box_plot(
@@ -160,45 +346,178 @@ class VisualizationEngine:
         df: pd.DataFrame,
         columns: List[str] = None,
         title: str = "Box Plot",
-        dark_mode: bool = False
-    ) -> str:
-        """Create a box plot"""
+        dark_mode: bool = False,
+        binary: bool = False,
+        split: bool = False
+    ) -> Union[str, Tuple[str, str]]:
+        """
+        Create a box plot. Boxes are drawn from the cached profile's quartiles
+        and fences rather than raw columns, with at most
+        Config.BOX_MAX_OUTLIERS outlier points per column, so the figure
+        size does not grow with the number of rows.
+        """
+        profile = ColumnProfiler.profile(df)
         if columns is None:
-            columns = df.select_dtypes(include=[np.number]).columns.tolist()[:10]
+            columns = profile.numeric_cols[:10]
+        columns = [col for col in columns if col in profile.numeric_cols]
         
         fig = go.Figure()
         
         for i, col in enumerate(columns):
+            col_stats = profile.numeric_stats.loc[col]
+            if col_stats['count'] == 0:
+                continue
+            box = cls._box_summary(df[col], col_stats, profile.iqr_outliers.loc[col], Config.BOX_MAX_OUTLIERS)
+            color = cls.COLORS['palette'][i % len(cls.COLORS['palette'])]
             fig.add_trace(go.Box(
-                y=df[col],
+                x=[col],
                 name=col,
-                marker_color=cls.COLORS['palette'][i % len(cls.COLORS['palette'])]
+                q1=[box['q1']],
+                median=[box['median']],
+                q3=[box['q3']],
+                lowerfence=[box['lowerfence']],
+                upperfence=[box['upperfence']],
+                marker_color=color,
+                legendgroup=col
             ))
+            if box['outlier_count']:
+                shown = len(box['outliers'])
+                fig.add_trace(go.Scatter(
+                    x=[col] * shown,
+                    y=box['outliers'],
+                    mode='markers',
+                    name=col,
+                    legendgroup=col,
+                    showlegend=False,
+                    marker=dict(color=color, size=5, opacity=0.7),
+                    hovertemplate=(
+                        f"{col}: %{{y}}<br>outlier ({box['outlier_count']:,} in total"
+                        + (f", {shown:,} shown" if shown < box['outlier_count'] else '') + ")<extra></extra>"
+                    )
+                ))
         
         fig.update_layout(**cls.get_layout(title, dark_mode))
-        return fig.to_json()
+        return cls.to_json(fig, binary, split)
+    
+    # Correlation heatmap column orders
+    HEATMAP_ORDERS = ('original', 'cluster')
     
     @classmethod
     def create_correlation_heatmap(
         cls,
         df: pd.DataFrame,
         title: str = "Correlation Matrix",
-        dark_mode: bool = False
-    ) -> str:
-        """Create a correlation heatmap"""
-        numeric_df = df.select_dtypes(include=[np.number])
-        corr_matrix = numeric_df.corr()
+        dark_mode: bool = False,
+        order: str = 'original',
+        top_k: int = None,
+        x_range: List = None,
+        y_range: List = None,
+        split: bool = False
+    ) -> Union[str, Tuple[str, str]]:
+        """
+        Create a correlation heatmap from the correlation matrix shared with
+        the EDA results (ColumnProfiler.correlation). order='cluster' puts
+        correlated columns next to each other; top_k keeps the k columns
+        most strongly correlated with any other. Cells are labelled up to
+        Config.HEATMAP_ANNOTATE_MAX columns. Wider than
+        Config.HEATMAP_TILE_SIZE, the matrix is tiled (see _heatmap_tile):
+        x_range / y_range select the column positions in view.
+        """
+        if order not in cls.HEATMAP_ORDERS:
+            raise ValueError(f"Unknown heatmap order: {order} (use one of {', '.join(cls.HEATMAP_ORDERS)})")
+        corr_matrix = ColumnProfiler.correlation(df)
+        positions = ColumnProfiler.correlation_order(df) if order == 'cluster' else np.arange(len(corr_matrix))
+        if top_k is not None and 0 < top_k < len(positions):
+            strength = np.abs(np.nan_to_num(corr_matrix.to_numpy(dtype=np.float64), nan=0.0))
+            np.fill_diagonal(strength, 0.0)
+            strongest = np.argsort(-strength.max(axis=1), kind='stable')[:top_k]
+            positions = positions[np.isin(positions, strongest)]
+        if len(positions) != len(corr_matrix) or order != 'original':
+            corr_matrix = corr_matrix.iloc[positions, positions]
+        
+        if len(corr_matrix) > Config.HEATMAP_TILE_SIZE:
+            heatmap, axes = cls._heatmap_tile(corr_matrix, x_range, y_range, Config.HEATMAP_TILE_SIZE)
+            fig = go.Figure(heatmap)
+            fig.update_layout(**cls.get_layout(title, dark_mode))
+            fig.update_layout(yaxis_autorange='reversed', **axes)
+            fig.update_layout(meta={'tiles': {
+                'columns': len(corr_matrix),
+                'x_range': x_range,
+                'y_range': y_range
+            }})
+            return cls.to_json(fig, split=split)
         
         fig = px.imshow(
             corr_matrix,
-            text_auto='.2f',
+            text_auto='.2f' if len(corr_matrix) <= Config.HEATMAP_ANNOTATE_MAX else False,
             aspect='auto',
             color_continuous_scale='RdBu_r',
             title=title
         )
         
         fig.update_layout(**cls.get_layout(title, dark_mode))
-        return fig.to_json()
+        return cls.to_json(fig, split=split)
+    
+    @classmethod
+    def _heatmap_tile(
+        cls,
+        corr_matrix: pd.DataFrame,
+        x_range: Optional[List],
+        y_range: Optional[List],
+        tile_size: int
+    ) -> Tuple[go.Heatmap, Dict]:
+        """
+        The part of a large correlation matrix in view (whole matrix without
+        ranges) as a heatmap of at most tile_size x tile_size cells on axes
+        of column positions, with the axis layout to go with it: blocks of
+        cells are averaged until it fits, so zooming in far enough shows
+        every cell, and column names once Config.HEATMAP_LABEL_MAX fit.
+        """
+        n_cols = len(corr_matrix)
+        
+        def span(bounds):
+            if bounds is None:
+                return 0, n_cols
+            low, high = sorted(float(bound) for bound in bounds)
+            start = int(np.clip(np.floor(low + 0.5), 0, n_cols - 1))
+            return start, int(np.clip(np.floor(high + 0.5), start, n_cols - 1)) + 1
+        
+        (col_start, col_end), (row_start, row_end) = span(x_range), span(y_range)
+        block = corr_matrix.to_numpy(dtype=np.float64)[row_start:row_end, col_start:col_end]
+        step = int(np.ceil(max(block.shape) / tile_size))
+        names = corr_matrix.columns.astype(str)
+        
+        if step > 1:
+            rows, cols = -(-block.shape[0] // step), -(-block.shape[1] // step)
+            padded = np.full((rows * step, cols * step), np.nan)
+            padded[:block.shape[0], :block.shape[1]] = block
+            with warnings.catch_warnings():
+                # All-NaN blocks (constant columns) stay NaN
+                warnings.simplefilter('ignore', RuntimeWarning)
+                z = np.nanmean(padded.reshape(rows, step, cols, step), axis=(1, 3))
+            heatmap = go.Heatmap(
+                z=np.round(z, 3), x0=col_start + (step - 1) / 2, dx=step, y0=row_start + (step - 1) / 2, dy=step,
+                zmin=-1, zmax=1, colorscale='RdBu_r', hoverongaps=False,
+                hovertemplate=f'columns %{{x:.0f}} / %{{y:.0f}} (mean of {step} x {step})<br>r = %{{z:.2f}}<extra></extra>'
+            )
+            return heatmap, {}
+        
+        x_names, y_names = names[col_start:col_end], names[row_start:row_end]
+        heatmap = go.Heatmap(
+            z=np.round(block, 4), x=np.arange(col_start, col_end), y=np.arange(row_start, row_end),
+            zmin=-1, zmax=1, colorscale='RdBu_r', hoverongaps=False,
+            text=[[f'{x_name} / {y_name}' for x_name in x_names] for y_name in y_names],
+            hovertemplate='%{text}<br>r = %{z:.2f}<extra></extra>'
+        )
+        axes = {}
+        if len(x_names) <= Config.HEATMAP_LABEL_MAX:
+            axes['xaxis'] = {'tickvals': np.arange(col_start, col_end), 'ticktext': list(x_names)}
+        if len(y_names) <= Config.HEATMAP_LABEL_MAX:
+            axes['yaxis'] = {'tickvals': np.arange(row_start, row_end), 'ticktext': list(y_names)}
+        return heatmap, axes
+    
+    # Scatter rendering modes; 'auto' picks 'points' or Config.SCATTER_LARGE_MODE by point count
+    SCATTER_MODES = ('auto', 'points', 'sample', 'density')
     
     @classmethod
     def create_scatter_plot(
@@ -209,24 +528,133 @@ class VisualizationEngine:
         color: str = None,
         size: str = None,
         title: str = "Scatter Plot",
-        dark_mode: bool = False
-    ) -> str:
-        """Create a scatter plot"""
-        fig = px.scatter(
-            df,
-            x=x,
-            y=y,
-            color=color,
-            size=size,
-            color_discrete_sequence=cls.COLORS['palette'],
-            title=title
-        )
+        dark_mode: bool = False,
+        binary: bool = False,
+        mode: str = 'auto',
+        split: bool = False
+    ) -> Union[str, Tuple[str, str]]:
+        """
+        Create a scatter plot. Above Config.SCATTER_MAX_POINTS rows, 'auto'
+        switches to Config.SCATTER_LARGE_MODE: 'sample' draws a random
+        subset of Config.SCATTER_SAMPLE_POINTS with WebGL, 'density' bins
+        the points into a grid (see _density_traces). Both keep the color
+        column and record what was drawn in layout.meta.scatter.
+        """
+        if mode not in cls.SCATTER_MODES:
+            raise ValueError(f"Unknown scatter mode: {mode} (use one of {', '.join(cls.SCATTER_MODES)})")
+        if mode == 'auto':
+            mode = 'points' if len(df) <= Config.SCATTER_MAX_POINTS else Config.SCATTER_LARGE_MODE
+        if mode == 'density' and not all(cls._is_axis_numeric(df[col]) for col in (x, y)):
+            mode = 'sample'
         
-        # Add trendline
-        fig.update_traces(marker=dict(opacity=0.7))
+        if mode == 'density':
+            data = df.dropna(subset=[x, y])
+            fig = go.Figure(cls._density_traces(data, x, y, color, Config.SCATTER_DENSITY_BINS))
+            fig.update_layout(xaxis_title=x, yaxis_title=y, legend_title_text=color or '')
+        else:
+            data = df
+            if mode == 'sample' and len(df) > Config.SCATTER_SAMPLE_POINTS:
+                rng = np.random.default_rng(0)
+                data = df.iloc[np.sort(rng.choice(len(df), Config.SCATTER_SAMPLE_POINTS, replace=False))]
+            fig = px.scatter(
+                data,
+                x=x,
+                y=y,
+                color=color,
+                size=size,
+                color_discrete_sequence=cls.COLORS['palette'],
+                title=title,
+                render_mode='webgl' if mode == 'sample' else 'auto'
+            )
+            
+            # Add trendline
+            fig.update_traces(marker=dict(opacity=0.7))
         
         fig.update_layout(**cls.get_layout(title, dark_mode))
-        return fig.to_json()
+        if mode != 'points':
+            fig.update_layout(meta={'scatter': {'mode': mode, 'points': len(data), 'total': len(df)}})
+        return cls.to_json(fig, binary, split)
+    
+    @staticmethod
+    def _is_axis_numeric(values: pd.Series) -> bool:
+        """Whether a column can be binned on a continuous axis"""
+        return (pd.api.types.is_datetime64_any_dtype(values.dtype) or
+                (pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype)))
+    
+    @classmethod
+    def _density_traces(cls, data: pd.DataFrame, x: str, y: str, color: Optional[str], bins: int) -> List[go.Heatmap]:
+        """
+        Heatmaps of the points counted on a bins x bins grid: log-scaled
+        counts without a color column, the mean of a numeric color column,
+        or one translucent layer per category (the most frequent
+        Config.SCATTER_DENSITY_MAX_CATEGORIES, the rest as 'Other').
+        Empty cells are left blank.
+        """
+        axes = []
+        for col in (x, y):
+            values = as_numeric(data[col])
+            low, high = (values.min(), values.max()) if len(values) else (0.0, 1.0)
+            span = (high - low) or 1.0
+            cell = np.minimum(((values - low) / span * bins).astype(np.int64), bins - 1)
+            centers = low + (np.arange(bins) + 0.5) * span / bins
+            if pd.api.types.is_datetime64_any_dtype(data[col].dtype):
+                centers = pd.to_datetime(centers.astype(np.int64))
+            axes.append((cell, centers))
+        (x_cell, x_centers), (y_cell, y_centers) = axes
+        cells = y_cell * bins + x_cell
+        
+        def grid(weights=None):
+            return np.bincount(cells, weights=weights, minlength=bins * bins).reshape(bins, bins).astype(np.float64)
+        
+        hover = f"{x}: %{{x}}<br>{y}: %{{y}}<br>points: %{{customdata}}"
+        counts = grid()
+        empty = counts == 0
+        
+        if color is None or cls._is_axis_numeric(data[color]):
+            if color is None:
+                z = np.where(empty, np.nan, np.log10(np.maximum(counts, 1)))
+                ticks = 10 ** np.arange(int(np.nanmax(z, initial=0)) + 1)
+                colorbar = {'title': 'points', 'tickvals': np.log10(ticks), 'ticktext': [f'{t:,}' for t in ticks]}
+            else:
+                values = data[color].to_numpy(dtype=np.float64, na_value=np.nan)
+                known = ~np.isnan(values)
+                sums = np.bincount(cells[known], weights=values[known], minlength=bins * bins).reshape(bins, bins)
+                known_counts = np.bincount(cells[known], minlength=bins * bins).reshape(bins, bins)
+                z = np.where(known_counts == 0, np.nan, sums / np.maximum(known_counts, 1))
+                colorbar = {'title': f'mean {color}'}
+                hover += f"<br>mean {color}: %{{z:.4g}}"
+            return [go.Heatmap(
+                x=x_centers, y=y_centers, z=z, customdata=counts.astype(np.min_scalar_type(int(counts.max()))),
+                colorscale='Viridis', colorbar=colorbar, hoverongaps=False,
+                hovertemplate=hover + '<extra></extra>'
+            )]
+        
+        codes, categories = pd.factorize(data[color])
+        frequency = np.bincount(codes[codes >= 0], minlength=len(categories))
+        top = np.argsort(-frequency, kind='stable')[:Config.SCATTER_DENSITY_MAX_CATEGORIES]
+        names = [str(categories[code]) for code in top]
+        # Layer of every point: its category's rank among the top ones, else 'Other' (missing color included)
+        rank = np.full(len(categories) + 1, len(top), dtype=np.int64)
+        rank[top] = np.arange(len(top))
+        layer_of = rank[codes]
+        if (layer_of == len(top)).any():
+            names.append('Other')
+        layers = np.bincount(layer_of * bins * bins + cells, minlength=len(names) * bins * bins).reshape(-1, bins, bins)
+        
+        scale = np.log1p(counts.max()) or 1.0
+        palette = cls.COLORS['palette']
+        traces = []
+        for i, (name, layer) in enumerate(zip(names, layers)):
+            hex_color = palette[i % len(palette)].lstrip('#')
+            rgb = ','.join(str(int(hex_color[j:j + 2], 16)) for j in (0, 2, 4))
+            traces.append(go.Heatmap(
+                x=x_centers, y=y_centers, z=np.where(layer == 0, np.nan, np.round(np.log1p(layer) / scale, 3)),
+                customdata=layer.astype(np.min_scalar_type(layer.max())), zmin=0, zmax=1,
+                colorscale=[[0, f'rgba({rgb},0.25)'], [1, f'rgba({rgb},1)']],
+                showscale=False, hoverongaps=False, name=name, legendgroup=name, showlegend=True,
+                hovertemplate=hover + f'<extra>{name}</extra>'
+            ))
+        return traces
     
     @classmethod
     def create_pie_chart(
@@ -255,8 +683,9 @@ class VisualizationEngine:
         cls,
         missing_data: Dict[str, Any],
         title: str = "Missing Values by Column",
-        dark_mode: bool = False
-    ) -> str:
+        dark_mode: bool = False,
+        split: bool = False
+    ) -> Union[str, Tuple[str, str]]:
         """Create a bar chart showing missing values"""
         columns = list(missing_data['by_column'].keys())
         percentages = [missing_data['by_column'][col]['percentage'] for col in columns]
@@ -287,16 +716,17 @@ class VisualizationEngine:
         
         fig.update_layout(**cls.get_layout(title, dark_mode))
         fig.update_layout(yaxis_title="Missing %", xaxis_tickangle=-45)
-        return fig.to_json()
+        return cls.to_json(fig, split=split)
     
     @classmethod
     def create_distribution_grid(
         cls,
         df: pd.DataFrame,
         columns: List[str] = None,
-        dark_mode: bool = False
+        dark_mode: bool = False,
+        bins: Union[int, str] = 'auto'
     ) -> str:
-        """Create a grid of distribution plots"""
+        """Create a grid of distribution plots (binned on the server, see create_histogram)"""
         numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
         if columns:
             numeric_cols = [c for c in columns if c in numeric_cols]
@@ -309,24 +739,19 @@ class VisualizationEngine:
         
         rows = (len(numeric_cols) + 1) // 2
         fig = make_subplots(rows=rows, cols=2, subplot_titles=numeric_cols)
+        engine = EDAEngine(df)
         
         for i, col in enumerate(numeric_cols):
             row = i // 2 + 1
             col_idx = i % 2 + 1
             
-            fig.add_trace(
-                go.Histogram(
-                    x=df[col],
-                    name=col,
-                    marker_color=cls.COLORS['palette'][i],
-                    showlegend=False
-                ),
-                row=row,
-                col=col_idx
-            )
+            bars = cls._histogram_bars(engine.get_distribution_data(col, bins)['histogram'], col, cls.COLORS['palette'][i])
+            bars.showlegend = False
+            fig.add_trace(bars, row=row, col=col_idx)
         
         layout = cls.get_layout("Distribution Overview", dark_mode)
         layout['height'] = 200 * rows
+        layout['bargap'] = 0
         fig.update_layout(**layout)
         return fig.to_json()
     